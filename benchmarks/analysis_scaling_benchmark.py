@@ -0,0 +1,302 @@
+"""
+Benchmark de escala do pipeline de análise sobre datasets sintéticos.
+
+Para cada tamanho (1k, 10k, 100k e 1M repositórios por padrão) gera um CSV
+com `benchmarks/synthetic_dataset.py` e cronometra cada etapa:
+- carregadores: `read_repositories`, `prepare_dataset`, `load_prepared_dataset`
+  (frio e com cache em disco), `load_metric_cube` e o `figure_inputs` de cada script;
+- estatísticas: `spearman_matrix`, `bootstrap_median_ci`, `median_ci_by_group`,
+  `MetricCube.build` e as funções `print_*` dos scripts;
+- figuras: cada `plot_rq*`, renderizada em memória (nada é gravado em reports/).
+
+Os tempos são comparados com uma baseline gravada; etapas mais lentas que a
+baseline além do limite (`--threshold`, padrão 25%) são marcadas como
+regressão e o processo termina com código 1. A coluna "escala" estima o
+expoente de crescimento (1 ≈ linear) entre o menor e o maior tamanho.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.analysis_scaling_benchmark --save-baseline
+    python -m benchmarks.analysis_scaling_benchmark --sizes 1k 10k 100k --threshold 0.3
+"""
+import argparse
+import contextlib
+import gc
+import importlib
+import inspect
+import io
+import json
+import math
+import pkgutil
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+import src.analysis as analysis_package
+from benchmarks.synthetic_dataset import PRESETS, write_synthetic_csv
+from src.analysis import prepared_dataset, run_analysis
+from src.analysis.dataset_io import read_repositories
+from src.analysis.generate_rq06_extra import STATISTICS_COLUMNS
+from src.analysis.stats_engine import bootstrap_median_ci, median_ci_by_group, spearman_matrix
+from src.utils.metric_cube import MetricCube
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "analysis_scaling.json"
+DEFAULT_THRESHOLD = 0.25
+# Below this, differences are timer noise rather than regressions
+MIN_REGRESSION_SECONDS = 0.05
+
+Timings = Dict[str, Optional[float]]
+
+
+def discover_reports() -> List[Tuple[str, str]]:
+    """``(module, function)`` pairs for every ``print_*`` statistics report in the ``generate_*`` scripts."""
+    reports = []
+    for module_info in sorted(pkgutil.iter_modules(analysis_package.__path__), key=lambda info: info.name):
+        if not module_info.name.startswith("generate_"):
+            continue
+        module = importlib.import_module(f"{analysis_package.__name__}.{module_info.name}")
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if name.startswith("print_") and function.__module__ == module.__name__:
+                reports.append((module.__name__, name))
+    return reports
+
+
+def _short(module_name: str) -> str:
+    return module_name.rsplit(".", 1)[-1]
+
+
+def _reset_caches() -> None:
+    prepared_dataset._memo.clear()
+    prepared_dataset._cube_memo.clear()
+    prepared_dataset._digest_memo.clear()
+    run_analysis._inputs.clear()
+    gc.collect()
+
+
+@contextlib.contextmanager
+def _figures_in_memory():
+    """Render and encode figures as usual, but into a buffer instead of ``reports/figures``."""
+    original_savefig = Figure.savefig
+
+    def savefig_to_buffer(figure, fname, *args, **kwargs):
+        kwargs.setdefault("format", Path(str(fname)).suffix.lstrip(".") or "png")
+        return original_savefig(figure, io.BytesIO(), *args, **kwargs)
+
+    Figure.savefig = savefig_to_buffer
+    try:
+        yield
+    finally:
+        Figure.savefig = original_savefig
+
+
+def run_size(csv_path: Path, cache_dir: Path, skip: set, failures: Dict[str, str]) -> Timings:
+    """
+    Time every step on one dataset; steps in ``skip`` are recorded as ``None``.
+
+    A step that raises is recorded as ``None`` too, with its error in ``failures``.
+    """
+    timings: Timings = {}
+
+    def timed(step: str, function: Callable[[], Any]) -> Any:
+        timings[step] = None
+        if step in skip:
+            return None
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = function()
+        except Exception as error:
+            failures[step] = f"{type(error).__name__}: {error}"
+            plt.close("all")
+            return None
+        timings[step] = time.perf_counter() - started
+        return result
+
+    _reset_caches()
+    raw = timed("loader: dataset_io.read_repositories", lambda: read_repositories(csv_path))
+    if raw is not None:
+        timed("loader: prepared_dataset.prepare_dataset", lambda: prepared_dataset.prepare_dataset(raw))
+    del raw
+    timed("loader: load_prepared_dataset (frio)",
+          lambda: prepared_dataset.load_prepared_dataset(csv_path, cache_dir))
+    prepared_dataset._memo.clear()
+    prepared = timed("loader: load_prepared_dataset (cache em disco)",
+                     lambda: prepared_dataset.load_prepared_dataset(csv_path, cache_dir))
+    df = (prepared or prepared_dataset.load_prepared_dataset(csv_path, cache_dir))[0]
+    timed("loader: load_metric_cube", lambda: prepared_dataset.load_metric_cube(csv_path, cache_dir))
+
+    figures = run_analysis.discover_figures()
+    reports = discover_reports()
+    for module_name in sorted({module_name for module_name, _ in figures + reports}):
+        module = importlib.import_module(module_name)
+        inputs = timed(f"loader: {_short(module_name)}.figure_inputs", lambda: module.figure_inputs(csv_path))
+        # Skipped loaders still have to provide the inputs of the steps after them
+        run_analysis._inputs[module_name] = inputs if inputs is not None else module.figure_inputs(csv_path)
+
+    languages = df["primaryLanguage"].value_counts().head(10).index.tolist()
+    timed("stats: spearman_matrix", lambda: spearman_matrix(df, STATISTICS_COLUMNS))
+    timed("stats: bootstrap_median_ci", lambda: bootstrap_median_ci(df["closed_issues_percentage"]))
+    timed("stats: median_ci_by_group",
+          lambda: median_ci_by_group(df, "closed_issues_percentage", groups=languages))
+    timed("stats: MetricCube.build", lambda: MetricCube.build(df))
+    for module_name, name in reports:
+        function = getattr(importlib.import_module(module_name), name)
+        arguments = run_analysis.bind_arguments(function, run_analysis.figure_inputs(module_name))
+        timed(f"stats: {_short(module_name)}.{name}", lambda: function(**arguments))
+
+    with _figures_in_memory():
+        for module_name, name in figures:
+            timed(f"figure: {name}", lambda: run_analysis.render_figure(module_name, name))
+
+    del df
+    _reset_caches()
+    return timings
+
+
+def run_benchmark(sizes: List[str], repeat: int, max_seconds: float,
+                  seed: int) -> Tuple[Dict[str, Timings], Dict[str, Dict[str, str]]]:
+    """
+    Best-of-``repeat`` time per step and size, plus the errors of failed steps per size.
+
+    A step slower than ``max_seconds``, or that failed, is skipped at larger sizes.
+    """
+    results: Dict[str, Timings] = {}
+    failures: Dict[str, Dict[str, str]] = {}
+    skip: set = set()
+    with tempfile.TemporaryDirectory() as work_dir:
+        for label in sizes:
+            rows = PRESETS[label]
+            csv_path = write_synthetic_csv(rows, Path(work_dir) / f"repos_{label}.csv", seed)
+            print(f"▶ {label} ({rows:,} repositórios)...", flush=True)
+            best: Timings = {}
+            failed: Dict[str, str] = {}
+            for attempt in range(repeat):
+                cache_dir = Path(work_dir) / f"cache_{label}_{attempt}"
+                for step, seconds in run_size(csv_path, cache_dir, skip, failed).items():
+                    if seconds is None or step in failed:
+                        best[step] = None
+                    else:
+                        best[step] = min(seconds, best.get(step) or math.inf)
+            results[label] = best
+            failures[label] = failed
+            skip |= set(failed)
+            skip |= {step for step, seconds in best.items() if seconds is not None and seconds > max_seconds}
+            csv_path.unlink()
+    return results, failures
+
+
+def load_baseline(path: Path) -> Dict[str, Timings]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("results", {})
+
+
+def save_baseline(path: Path, results: Dict[str, Timings]) -> None:
+    """Merge ``results`` into the baseline file; sizes not run this time keep their stored times."""
+    merged = {**load_baseline(path), **results}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "results": merged,
+    }
+    path.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def find_regressions(results: Dict[str, Timings], baseline: Dict[str, Timings],
+                     threshold: float) -> List[Tuple[str, str, float, float]]:
+    """``(size, step, baseline, current)`` for steps slower than the baseline by more than ``threshold``."""
+    regressions = []
+    for label, timings in results.items():
+        for step, seconds in timings.items():
+            reference = baseline.get(label, {}).get(step)
+            if seconds is None or reference is None:
+                continue
+            if seconds > reference * (1 + threshold) and seconds - reference > MIN_REGRESSION_SECONDS:
+                regressions.append((label, step, reference, seconds))
+    return regressions
+
+
+def scaling_exponent(results: Dict[str, Timings], step: str) -> Optional[float]:
+    """Slope of log(time) over log(rows) between the smallest and largest size that ran the step."""
+    points = [(PRESETS[label], timings.get(step)) for label, timings in results.items()]
+    points = [(rows, seconds) for rows, seconds in points if seconds]
+    if len(points) < 2 or points[0][0] == points[-1][0]:
+        return None
+    (rows_low, low), (rows_high, high) = points[0], points[-1]
+    return math.log(high / low) / math.log(rows_high / rows_low)
+
+
+def print_report(results: Dict[str, Timings], failures: Dict[str, Dict[str, str]], baseline: Dict[str, Timings],
+                 regressions: List[Tuple[str, str, float, float]]) -> None:
+    flagged = {(label, step) for label, step, _, _ in regressions}
+    steps = list(dict.fromkeys(step for timings in results.values() for step in timings))
+    width = max(len(step) for step in steps) + 2
+    header = f"{'Etapa':<{width}}" + "".join(f"{label:>12}" for label in results) + f"{'escala':>9}"
+    print("\n" + header)
+    print("-" * len(header))
+    for step in steps:
+        cells = []
+        for label, timings in results.items():
+            seconds = timings.get(step)
+            if step in failures.get(label, {}):
+                cell = "falhou"
+            else:
+                cell = "pulado" if seconds is None else f"{seconds:.3f}s"
+            cells.append(f"{cell + (' ⚠' if (label, step) in flagged else ''):>12}")
+        exponent = scaling_exponent(results, step)
+        print(f"{step:<{width}}" + "".join(cells) + f"{'—' if exponent is None else f'{exponent:.2f}':>9}")
+    print("\n'pulado': a etapa passou de --max-seconds ou falhou em um tamanho menor. "
+          "Escala ≈ 1 indica crescimento linear.")
+    for label, failed in failures.items():
+        for step, error in failed.items():
+            print(f"✗ {label:>5} {step}: {error}")
+
+    if not baseline:
+        print("Nenhuma baseline encontrada; grave uma com --save-baseline.")
+    elif regressions:
+        print(f"\n⚠ {len(regressions)} regressões em relação à baseline:")
+        for label, step, reference, seconds in regressions:
+            print(f"  {label:>5} {step}: {reference:.3f}s → {seconds:.3f}s (+{seconds / reference - 1:.0%})")
+    else:
+        print("\n✅ Nenhuma regressão em relação à baseline.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", choices=list(PRESETS), default=list(PRESETS))
+    parser.add_argument("--repeat", type=int, default=1, help="execuções por tamanho (vale o menor tempo)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="lentidão relativa à baseline considerada regressão (0.25 = 25%%)")
+    parser.add_argument("--max-seconds", type=float, default=120.0,
+                        help="etapas mais lentas que isso não rodam nos tamanhos seguintes")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="grava os tempos desta execução como baseline")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sizes = sorted(args.sizes, key=PRESETS.get)
+    results, failures = run_benchmark(sizes, max(1, args.repeat), args.max_seconds, args.seed)
+    baseline = load_baseline(args.baseline)
+    regressions = find_regressions(results, baseline, args.threshold)
+    print_report(results, failures, baseline, regressions)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline gravada em {args.baseline}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
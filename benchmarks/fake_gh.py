@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Substituto mínimo do `gh api graphql` para os benchmarks.
+
+Entende os argumentos que o `CliRepositoryFetcher` monta (`-f`, `-F`,
+`name[]=`, `--include`), envia a consulta para `GITHUB_GRAPHQL_URL` e
+imprime a resposta como o `gh`: status e cabeçalhos com `--include`,
+código de saída 1 em respostas HTTP de erro. Com `FAKE_GH_FAIL=<código>`
+sai com esse código sem consultar o servidor, como um `gh` sem login.
+"""
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+
+def _typed(value: str):
+    # -F converts literals the way gh does
+    if value in ("true", "false"):
+        return value == "true"
+    if value == "null":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def main(argv) -> int:
+    forced_exit = os.environ.get("FAKE_GH_FAIL")
+    if forced_exit:
+        print("fake gh: falha forçada (FAKE_GH_FAIL)", file=sys.stderr)
+        return int(forced_exit)
+    if argv[:2] != ["api", "graphql"]:
+        print(f"fake gh: comando não suportado: {' '.join(argv)}", file=sys.stderr)
+        return 2
+
+    include, query, variables = False, "", {}
+    args = iter(argv[2:])
+    for arg in args:
+        if arg == "--include":
+            include = True
+            continue
+        if arg not in ("-f", "-F"):
+            continue
+        name, _, value = next(args).partition("=")
+        converted = value if arg == "-f" else _typed(value)
+        if name == "query":
+            query = value
+        elif name.endswith("[]"):
+            variables.setdefault(name[:-2], []).append(converted)
+        else:
+            variables[name] = converted
+
+    request = urllib.request.Request(
+        os.environ["GITHUB_GRAPHQL_URL"],
+        data=json.dumps({"query": query, "variables": variables}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            status, headers, body = response.status, response.headers, response.read()
+    except urllib.error.HTTPError as error:
+        status, headers, body = error.code, error.headers, error.read()
+
+    if include:
+        lines = [f"HTTP/1.1 {status}"] + [f"{name}: {value}" for name, value in headers.items()]
+        sys.stdout.write("\n".join(lines) + "\n\n")
+    sys.stdout.write(body.decode("utf-8"))
+    if status >= 400:
+        print(f"gh: HTTP {status}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
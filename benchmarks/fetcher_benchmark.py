@@ -0,0 +1,128 @@
+"""
+Benchmark dos fetchers registrados na fábrica contra o servidor GraphQL stub.
+
+Cada método (`http`, `cli`, ...) coleta o mesmo corpus sintético de um
+servidor local novo, com as mesmas latências, falhas 502 e limites, sem
+gastar rate limit da API real. O método HTTP é apontado para o stub com
+`GITHUB_GRAPHQL_URL`; o CLI executa `benchmarks/fake_gh.py` no lugar do
+`gh` (`GH_EXECUTABLE`), mantendo o custo de um processo por requisição.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.fetcher_benchmark --pages 100 --repeat 3
+    python -m benchmarks.fetcher_benchmark --methods http --overload-rate 0.5 --secondary-limit-every 25
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.github_graphql_stub import add_stub_arguments, start_stub_server, stub_config_from_args
+from src.services.fetcher_factory import RepositoryFetcherFactory
+
+FAKE_GH = Path(__file__).resolve().parent / "fake_gh.py"
+
+
+def _run_once(method: str, pages: int, args: argparse.Namespace) -> Dict[str, Any]:
+    server, stub, url = start_stub_server(stub_config_from_args(args))
+    os.environ["GITHUB_GRAPHQL_URL"] = url
+    try:
+        fetcher = RepositoryFetcherFactory.create(method)
+        with tempfile.TemporaryDirectory() as data_dir:
+            fetcher.data_dir = Path(data_dir)
+            fetcher.checkpoint_file = fetcher.data_dir / "checkpoint.jsonl"
+            output = io.StringIO() if args.quiet else sys.stdout
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(output):
+                repos = fetcher.fetch(pages=pages)
+            elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    metrics = fetcher.metrics
+    latency = metrics.latency_percentiles((50, 95, 99))
+    expected = {node["id"] for node in stub.corpus[:len(repos)]}
+    return {
+        "method": method,
+        "repos": len(repos),
+        "seconds": elapsed,
+        "repos_per_second": len(repos) / elapsed if elapsed else 0.0,
+        "requests": metrics.requests,
+        "failures": metrics.failures,
+        "retries": metrics.retries,
+        "bytes": metrics.bytes_received,
+        "wait_seconds": metrics.wait_seconds,
+        "p50_ms": latency[50] * 1000 if latency[50] is not None else None,
+        "p95_ms": latency[95] * 1000 if latency[95] is not None else None,
+        "p99_ms": latency[99] * 1000 if latency[99] is not None else None,
+        "complete": {repo["id"] for repo in repos} == expected,
+    }
+
+
+def _median_run(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The run with the median throughput, plus the spread across runs."""
+    ordered = sorted(runs, key=lambda run: run["repos_per_second"])
+    median = dict(ordered[len(ordered) // 2])
+    median["runs"] = len(runs)
+    median["repos_per_second_min"] = ordered[0]["repos_per_second"]
+    median["repos_per_second_max"] = ordered[-1]["repos_per_second"]
+    median["complete"] = all(run["complete"] for run in runs)
+    return median
+
+
+def _format_ms(value: Any) -> str:
+    return "—" if value is None else f"{value:.0f}"
+
+
+def _report(results: List[Dict[str, Any]]) -> None:
+    header = (f"{'método':<8} {'repos':>6} {'tempo (s)':>10} {'repos/s':>9} {'faixa repos/s':>15} "
+              f"{'req':>5} {'falhas':>7} {'retries':>8} {'p50':>6} {'p95':>6} {'p99':>6} {'KiB':>8} {'ok':>3}")
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        spread = f"{result['repos_per_second_min']:.0f}–{result['repos_per_second_max']:.0f}"
+        print(f"{result['method']:<8} {result['repos']:>6} {result['seconds']:>10.2f} "
+              f"{result['repos_per_second']:>9.1f} {spread:>15} {result['requests']:>5} {result['failures']:>7} "
+              f"{result['retries']:>8} {_format_ms(result['p50_ms']):>6} {_format_ms(result['p95_ms']):>6} "
+              f"{_format_ms(result['p99_ms']):>6} {result['bytes'] / 1024:>8.0f} "
+              f"{'sim' if result['complete'] else 'não':>3}")
+    print("\nLatências em ms por requisição; 'ok' indica que a coleta trouxe exatamente o topo do corpus.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100, help="páginas-base de 10 repositórios (como no app)")
+    parser.add_argument("--repeat", type=int, default=1, help="execuções por método (relata a mediana)")
+    parser.add_argument("--methods", nargs="+", default=RepositoryFetcherFactory.get_available_methods(),
+                        help="métodos da fábrica a medir (padrão: todos)")
+    parser.add_argument("--output", type=Path, help="grava os resultados em JSON")
+    parser.add_argument("--quiet", action="store_true", help="oculta o progresso da coleta")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    # The stub ignores the token, but the HTTP fetcher refuses to run without one
+    os.environ["GITHUB_TOKEN"] = "stub"
+    os.environ["GH_EXECUTABLE"] = str(FAKE_GH)
+
+    results = []
+    for method in args.methods:
+        runs = [_run_once(method, args.pages, args) for _ in range(max(1, args.repeat))]
+        results.append(_median_run(runs))
+
+    print(f"\nCorpus sintético: {args.corpus} repositórios, latência mediana {args.latency_ms:.0f} ms, "
+          f"502 em {args.overload_rate:.0%} das páginas com first > {args.overload_first}")
+    _report(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Resultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Verificação do pool de processos `gh` contra o servidor GraphQL stub.
+
+Executa `benchmarks/fake_gh.py` pelo `GhProcessPool` e pelo
+`CliRepositoryFetcher`, sem gastar rate limit, e confere:
+- concorrência: no máximo `--width` processos ao mesmo tempo, e o pool chega a usar todos;
+- ordem: cada resultado volta na posição da sua requisição, mesmo terminando fora de ordem;
+- falhas: um `gh` com código de saída diferente de zero vira erro, e um shard
+  que falha em todas as tentativas levanta exceção em vez de devolver páginas vazias;
+- timeout: um `gh` travado é encerrado.
+
+Termina com código 1 se alguma verificação falhar.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.gh_pool_check
+    python -m benchmarks.gh_pool_check --width 8 --requests 40
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+from typing import List, Tuple
+
+from benchmarks.fetcher_benchmark import FAKE_GH
+from benchmarks.github_graphql_stub import StubConfig, _encode_cursor, start_stub_server
+from src.infrastructure.cli.gh_process_pool import GhProcessPool
+from src.infrastructure.fetchers.cli_repository_fetcher import CliRepositoryFetcher
+from src.utils.star_shards import StarShard
+
+Check = Tuple[str, bool, str]
+
+
+@contextlib.contextmanager
+def _stub(config: StubConfig):
+    server, stub, url = start_stub_server(config)
+    os.environ["GITHUB_GRAPHQL_URL"] = url
+    try:
+        yield stub
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextlib.contextmanager
+def _failing_gh(exit_code: int):
+    os.environ["FAKE_GH_FAIL"] = str(exit_code)
+    try:
+        yield
+    finally:
+        del os.environ["FAKE_GH_FAIL"]
+
+
+def _fetcher(width: int, timeout: float = 30.0) -> CliRepositoryFetcher:
+    fetcher = CliRepositoryFetcher(GhProcessPool(width=width, timeout=timeout, executable=str(FAKE_GH)))
+    # No backoff between retries: the failure checks only care about the outcome
+    fetcher.scheduler.max_backoff = 0.0
+    return fetcher
+
+
+async def check_concurrency(width: int, requests: int) -> Check:
+    pool = GhProcessPool(width=width, executable=str(FAKE_GH))
+    args = CliRepositoryFetcher._build_args("query { viewer { login } }", None, {"first": 10})
+    with _stub(StubConfig(corpus_size=100, latency_ms=300, latency_sigma=0.0)) as stub:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(pool.run(args) for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+    ok = stub.max_in_flight == width and all(code == 0 for code, _, _ in results)
+    return ("concorrência", ok,
+            f"máximo de {stub.max_in_flight} processos simultâneos (largura {width}), "
+            f"{requests} requisições em {elapsed:.2f}s")
+
+
+async def check_ordering(width: int, requests: int) -> Check:
+    fetcher = _fetcher(width)
+    query = fetcher._get_query_content()
+    # Log-normal latency with a wide spread makes requests finish out of order
+    with _stub(StubConfig(corpus_size=requests * 10, latency_ms=80, latency_sigma=1.0)) as stub:
+        cursors = [_encode_cursor(index * 10) if index else None for index in range(requests)]
+        responses = await asyncio.gather(*(
+            fetcher._execute_request_async(query, cursor, {"first": 10}) for cursor in cursors
+        ))
+        expected = [stub.corpus[index * 10]["id"] for index in range(requests)]
+    first_ids: List[str] = [
+        ((response.get("data") or {}).get("search") or {}).get("edges", [{}])[0].get("node", {}).get("id")
+        for response in responses
+    ]
+    misplaced = sum(1 for got, want in zip(first_ids, expected) if got != want)
+    return ("ordem", misplaced == 0, f"{requests - misplaced}/{requests} páginas na posição da requisição")
+
+
+async def check_exit_code(width: int) -> Check:
+    pool = GhProcessPool(width=width, executable=str(FAKE_GH))
+    fetcher = _fetcher(width)
+    with _stub(StubConfig(corpus_size=100)), _failing_gh(4):
+        returncode, _, stderr = await pool.run(["api", "graphql"])
+        response = await fetcher._execute_request_async(fetcher._get_query_content(), None, {"first": 10})
+    ok = returncode == 4 and response.get("data") is None and bool(response.get("errors"))
+    return ("código de saída", ok, f"gh saiu com {returncode}; resposta: {response.get('errors')!r}")
+
+
+async def check_shard_failure(width: int) -> Check:
+    fetcher = _fetcher(width)
+    semaphore = asyncio.Semaphore(width)
+    with _stub(StubConfig(corpus_size=100)), _failing_gh(1), contextlib.redirect_stdout(io.StringIO()):
+        try:
+            repos = await fetcher.fetch_shard(StarShard(1000), semaphore)
+        except RuntimeError as error:
+            return ("falha de shard", True, f"exceção após {fetcher.metrics.retries} novas tentativas: {error}")
+    return ("falha de shard", False, f"shard devolveu {len(repos)} repositórios sem levantar exceção")
+
+
+async def check_timeout() -> Check:
+    pool = GhProcessPool(width=1, timeout=0.3, executable=str(FAKE_GH))
+    args = CliRepositoryFetcher._build_args("query { viewer { login } }", None, {"first": 10})
+    with _stub(StubConfig(corpus_size=100, latency_ms=3000, latency_sigma=0.0)):
+        started = time.perf_counter()
+        try:
+            await pool.run(args)
+        except asyncio.TimeoutError:
+            elapsed = time.perf_counter() - started
+            return ("timeout", elapsed < 2.0, f"processo encerrado após {elapsed:.2f}s (limite 0.3s)")
+    return ("timeout", False, "o processo travado terminou sem TimeoutError")
+
+
+async def run_checks(width: int, requests: int) -> List[Check]:
+    return [
+        await check_concurrency(width, requests),
+        await check_ordering(width, requests),
+        await check_exit_code(width),
+        await check_shard_failure(width),
+        await check_timeout(),
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=4, help="processos `gh` simultâneos do pool")
+    parser.add_argument("--requests", type=int, default=16,
+                        help="requisições nas verificações de concorrência e ordem")
+    args = parser.parse_args()
+
+    checks = asyncio.run(run_checks(max(1, args.width), max(args.width, args.requests)))
+    for name, ok, detail in checks:
+        print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    return 0 if all(ok for _, ok, _ in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
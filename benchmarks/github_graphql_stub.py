@@ -0,0 +1,298 @@
+"""
+Servidor local que imita a API GraphQL do GitHub para benchmarks offline.
+
+Responde às três consultas do coletor sobre um corpus sintético e
+determinístico (estrelas, PRs e releases com cauda longa; linguagens
+concentradas em poucas): a busca paginada de `query.graphql`, o histograma
+de estrelas com aliases (`s0: search(...) { repositoryCount }`) e
+`nodes(ids:)` de `refresh_nodes.graphql`.
+
+Também reproduz o que torna a API real lenta ou instável:
+- latência log-normal por requisição, maior para páginas maiores;
+- 502 com probabilidade configurável quando `first` passa de um limite;
+- cabeçalhos `X-RateLimit-*`, bloco `rateLimit` e 403 quando o orçamento acaba;
+- limite secundário: a cada N requisições, 403 com `Retry-After`.
+
+Uso isolado (na raiz do projeto):
+    python -m benchmarks.github_graphql_stub --port 8765 --latency-ms 40
+    GITHUB_GRAPHQL_URL=http://127.0.0.1:8765/graphql GITHUB_TOKEN=stub python src/app.py
+"""
+import argparse
+import base64
+import gzip
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# GitHub never returns more than this many results for one search
+SEARCH_RESULT_LIMIT = 1000
+DEFAULT_SEARCH_QUERY = "stars:>1000 sort:stars-desc"
+
+LANGUAGES = [
+    ("Python", 0.17), ("JavaScript", 0.15), ("TypeScript", 0.13), ("Go", 0.08), ("Java", 0.07),
+    ("C++", 0.06), ("Rust", 0.05), ("C", 0.04), ("Shell", 0.03), ("C#", 0.03), ("PHP", 0.03),
+    ("Ruby", 0.02), ("Kotlin", 0.02), ("Swift", 0.02), ("Jupyter Notebook", 0.02), (None, 0.08),
+]
+
+_ALIASED_SEARCH = re.compile(r'(\w+)\s*:\s*search\(\s*query:\s*"([^"]*)"')
+
+
+@dataclass
+class StubConfig:
+    corpus_size: int = 5000
+    seed: int = 7
+    latency_ms: float = 40.0           # median latency of a 10-node page
+    latency_sigma: float = 0.35        # spread of the log-normal latency
+    latency_per_node_ms: float = 1.5   # extra median latency per node beyond 10
+    overload_first: int = 50           # pages larger than this can fail with 502
+    overload_rate: float = 0.3         # probability of that 502
+    rate_limit: int = 5000             # points per hour
+    secondary_limit_every: int = 0     # every N-th request gets 403 + Retry-After (0 = never)
+    retry_after_seconds: int = 1
+
+
+def build_corpus(size: int, seed: int) -> List[Dict[str, Any]]:
+    """Repository nodes in the shape of ``query.graphql``, most starred first."""
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    languages = [name for name, _ in LANGUAGES]
+    weights = [weight for _, weight in LANGUAGES]
+    nodes = []
+    for index in range(size):
+        stars = int(1000 * rng.paretovariate(1.1))
+        created = now - timedelta(days=rng.uniform(30, 17 * 365))
+        updated = now - timedelta(days=rng.expovariate(1 / 20))
+        language = rng.choices(languages, weights)[0]
+        open_issues = int(rng.paretovariate(1.3) * 10) - 10
+        nodes.append({
+            "id": f"R_stub{index:07d}",
+            "name": f"repo-{index}",
+            "url": f"https://github.com/stub/repo-{index}",
+            "stargazerCount": stars,
+            "createdAt": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "updatedAt": max(updated, created).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "primaryLanguage": {"name": language} if language else None,
+            "releases": {"totalCount": int(rng.paretovariate(1.0)) - 1 if rng.random() < 0.7 else 0},
+            "pullRequests": {"totalCount": int(rng.paretovariate(0.9) * 20) - 20},
+            "openIssues": {"totalCount": open_issues},
+            "closedIssues": {"totalCount": int(open_issues * rng.uniform(0.5, 20))},
+            "mentionableUsers": {"totalCount": int(rng.paretovariate(1.2) * 5)},
+        })
+    nodes.sort(key=lambda node: node["stargazerCount"], reverse=True)
+    return nodes
+
+
+def _star_filter(search_query: str) -> Tuple[int, float]:
+    """Inclusive star range of a ``stars:>N``, ``stars:>=N`` or ``stars:A..B`` query."""
+    low, high = 0, float("inf")
+    for token in search_query.split():
+        if not token.startswith("stars:"):
+            continue
+        value = token[len("stars:"):].replace(",", "")
+        if value.startswith(">="):
+            low = int(value[2:])
+        elif value.startswith(">"):
+            low = int(value[1:]) + 1
+        elif ".." in value:
+            start, end = value.split("..")
+            low, high = int(start), (float("inf") if end == "*" else int(end))
+        else:
+            low = high = int(value)
+    return low, high
+
+
+def _encode_cursor(offset: int) -> str:
+    return base64.b64encode(f"cursor:{offset}".encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    return int(base64.b64decode(cursor).decode().split(":")[1])
+
+
+class GitHubGraphQLStub:
+    """Corpus, rate-limit budget and failure injection shared by all handler threads."""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.corpus = build_corpus(config.corpus_size, config.seed)
+        self.by_id = {node["id"]: node for node in self.corpus}
+        self.requests = 0
+        # Requests being served right now, and the most at once (concurrency of the client)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.remaining = config.rate_limit
+        self.reset_at = time.time() + 3600
+        self._lock = threading.Lock()
+
+    def _matching(self, search_query: str) -> List[Dict[str, Any]]:
+        low, high = _star_filter(search_query)
+        return [node for node in self.corpus if low <= node["stargazerCount"] <= high]
+
+    def _rate_limit_block(self, cost: int) -> Dict[str, Any]:
+        reset = datetime.fromtimestamp(self.reset_at, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return {"cost": cost, "limit": self.config.rate_limit, "remaining": self.remaining, "resetAt": reset}
+
+    def enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def rate_limit_headers(self) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.config.rate_limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(int(self.reset_at)),
+            "X-RateLimit-Used": str(self.config.rate_limit - self.remaining),
+        }
+
+    def latency(self, rng: random.Random, nodes: int) -> float:
+        config = self.config
+        median = config.latency_ms + max(nodes - 10, 0) * config.latency_per_node_ms
+        return median * rng.lognormvariate(0, config.latency_sigma) / 1000
+
+    def handle(self, query: str, variables: Dict[str, Any]) -> Tuple[int, Dict[str, str], Dict[str, Any], float]:
+        """Answer one request: ``(status, extra headers, body, seconds to stall)``."""
+        config = self.config
+        with self._lock:
+            self.requests += 1
+            number = self.requests
+            if time.time() >= self.reset_at:
+                self.remaining, self.reset_at = config.rate_limit, time.time() + 3600
+        rng = random.Random(config.seed * 1_000_003 + number)
+
+        if config.secondary_limit_every and number % config.secondary_limit_every == 0:
+            body = {"message": "You have exceeded a secondary rate limit. "
+                               "Please wait a few minutes before you try again."}
+            return 403, {"Retry-After": str(config.retry_after_seconds)}, body, 0.0
+        if self.remaining <= 0:
+            return 403, {}, {"message": "API rate limit exceeded"}, 0.0
+
+        aliases = _ALIASED_SEARCH.findall(query)
+        if "nodes(" in query:
+            ids = variables.get("ids") or []
+            nodes = [self.by_id.get(node_id) for node_id in ids]
+            size = len(ids)
+            payload: Dict[str, Any] = {"nodes": nodes}
+        elif aliases:
+            size = 1
+            payload = {alias: {"repositoryCount": len(self._matching(search))} for alias, search in aliases}
+        else:
+            size = int(variables.get("first") or 10)
+            if size > config.overload_first and rng.random() < config.overload_rate:
+                return 502, {}, {"message": "Server Error"}, self.latency(rng, size)
+            matching = self._matching(variables.get("searchQuery") or DEFAULT_SEARCH_QUERY)[:SEARCH_RESULT_LIMIT]
+            offset = _decode_cursor(variables.get("cursor"))
+            page = matching[offset:offset + size]
+            end = offset + len(page)
+            payload = {"search": {
+                "repositoryCount": len(matching),
+                "pageInfo": {"endCursor": _encode_cursor(end) if page else None, "hasNextPage": end < len(matching)},
+                "edges": [{"node": node} for node in page],
+            }}
+
+        cost = max(1, size // 100)
+        with self._lock:
+            self.remaining = max(self.remaining - cost, 0)
+            payload = {"rateLimit": self._rate_limit_block(cost), **payload}
+        return 200, {}, {"data": payload}, self.latency(rng, size)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    stub: GitHubGraphQLStub
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.stub.enter()
+        try:
+            status, headers, body, delay = self.stub.handle(request.get("query", ""), request.get("variables") or {})
+            if delay:
+                time.sleep(delay)
+        finally:
+            self.stub.leave()
+
+        payload = json.dumps(body).encode("utf-8")
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            payload = gzip.compress(payload, compresslevel=1)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in {**self.stub.rate_limit_headers(), **headers}.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(config: StubConfig, port: int = 0) -> Tuple[ThreadingHTTPServer, GitHubGraphQLStub, str]:
+    """Serve ``config`` on a background thread; returns the server, its state and the GraphQL URL."""
+    stub = GitHubGraphQLStub(config)
+    handler = type("StubHandler", (_StubHandler,), {"stub": stub})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stub, f"http://127.0.0.1:{server.server_address[1]}/graphql"
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = StubConfig()
+    parser.add_argument("--corpus", type=int, default=defaults.corpus_size, help="repositórios no corpus sintético")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms,
+                        help="latência mediana de uma página de 10 nós")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma,
+                        help="dispersão da latência log-normal")
+    parser.add_argument("--latency-per-node-ms", type=float, default=defaults.latency_per_node_ms)
+    parser.add_argument("--overload-first", type=int, default=defaults.overload_first,
+                        help="páginas maiores que isso podem falhar com 502")
+    parser.add_argument("--overload-rate", type=float, default=defaults.overload_rate)
+    parser.add_argument("--rate-limit", type=int, default=defaults.rate_limit)
+    parser.add_argument("--secondary-limit-every", type=int, default=defaults.secondary_limit_every,
+                        help="a cada N requisições, 403 com Retry-After (0 desativa)")
+    parser.add_argument("--retry-after", type=int, default=defaults.retry_after_seconds)
+
+
+def stub_config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        corpus_size=args.corpus, seed=args.seed, latency_ms=args.latency_ms, latency_sigma=args.latency_sigma,
+        latency_per_node_ms=args.latency_per_node_ms, overload_first=args.overload_first,
+        overload_rate=args.overload_rate, rate_limit=args.rate_limit,
+        secondary_limit_every=args.secondary_limit_every, retry_after_seconds=args.retry_after,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server, _, url = start_stub_server(stub_config_from_args(args), args.port)
+    print(f"Servidor GraphQL stub em {url} (Ctrl+C para encerrar)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark do transporte HTTP contra um servidor stub local.
+
+Compara a latência por requisição de `requests.post` avulso (comportamento
+anterior do HttpRepositoryFetcher: nova conexão a cada página) com o
+`HttpTransport` compartilhado (sessão com pool, keep-alive e gzip).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.http_transport_benchmark --requests 200
+"""
+import argparse
+import gzip
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import requests
+
+from src.infrastructure.http.http_transport import HttpTransport
+
+
+def _build_search_page(size: int = 10) -> bytes:
+    edges = [
+        {
+            "node": {
+                "name": f"repo-{i}",
+                "url": f"https://github.com/stub/repo-{i}",
+                "stargazerCount": 100_000 - i,
+                "createdAt": "2015-01-01T00:00:00Z",
+                "updatedAt": "2026-01-01T00:00:00Z",
+                "primaryLanguage": {"name": "Python"},
+                "releases": {"totalCount": 10},
+                "pullRequests": {"totalCount": 100},
+                "openIssues": {"totalCount": 5},
+                "closedIssues": {"totalCount": 50},
+                "mentionableUsers": {"totalCount": 20},
+            }
+        }
+        for i in range(size)
+    ]
+    page = {"data": {"search": {"pageInfo": {"endCursor": "stub", "hasNextPage": True}, "edges": edges}}}
+    return json.dumps(page).encode("utf-8")
+
+
+class StubGraphQLHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive capable
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    body = _build_search_page()
+    gzipped_body = gzip.compress(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        payload = self.gzipped_body if accepts_gzip else self.body
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if accepts_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _measure(send: Callable[[], requests.Response], count: int) -> List[float]:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        send().json()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _report(label: str, latencies: List[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<28} média={statistics.mean(ordered):7.3f} ms  "
+        f"p50={statistics.median(ordered):7.3f} ms  p95={p95:7.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="requisições por cenário")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGraphQLHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/graphql"
+    payload = {"query": "query { stub }", "variables": {"cursor": None}}
+
+    try:
+        before = _measure(lambda: requests.post(url, json=payload), args.requests)
+        transport = HttpTransport()
+        after = _measure(lambda: transport.post_json(url, payload), args.requests)
+        transport.close()
+    finally:
+        server.shutdown()
+
+    print(f"Servidor stub: {url} ({args.requests} requisições por cenário)")
+    _report("antes (requests.post)", before)
+    _report("depois (HttpTransport)", after)
+    print(f"Ganho na mediana: {statistics.median(before) / statistics.median(after):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
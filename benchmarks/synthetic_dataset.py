@@ -0,0 +1,143 @@
+"""
+Gerador de datasets sintéticos no schema do CSV do coletor.
+
+As distribuições imitam a coleta real: estrelas, PRs, releases, issues e
+contribuidores com cauda longa (Pareto/log-normal, PRs e issues
+correlacionados com as estrelas), ~35% dos repositórios sem release e uma
+mistura de linguagens concentrada em poucas, com uma cauda de linguagens
+raras. Tudo é vetorizado e determinístico para uma mesma semente.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.synthetic_dataset --rows 100000 --output data/synthetic/repos_100k.csv
+    python -m benchmarks.synthetic_dataset --preset all --output-dir data/synthetic
+"""
+import argparse
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.github_graphql_stub import LANGUAGES
+from src.utils.repository_record import RepositoryRecord
+
+PRESETS: Dict[str, int] = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+CSV_COLUMNS = [field.name for field in fields(RepositoryRecord)]
+
+# Fixed so the derived ages (and the prepared-dataset cache key) do not change between runs
+COLLECTED_AT = np.datetime64("2026-01-01T00:00:00")
+FIRST_CREATED_AT = np.datetime64("2008-02-01T00:00:00")
+
+RARE_LANGUAGES = [
+    "Dart", "Scala", "Elixir", "Haskell", "Lua", "R", "Perl", "Clojure", "OCaml", "Zig", "Julia", "Vue",
+    "HTML", "CSS", "Markdown", "Dockerfile", "Vim Script", "Objective-C", "Assembly", "Nim",
+]
+RARE_LANGUAGES_SHARE = 0.06
+
+# Pareto tails end near the largest values GitHub actually has
+MAX_STARS = 500_000
+MAX_RELEASES = 5_000
+
+
+def _language_weights() -> pd.Series:
+    common = pd.Series({name or "Unknown": weight for name, weight in LANGUAGES})
+    # Zipf-shaped tail: each rare language is less common than the one before
+    zipf = 1 / np.arange(1, len(RARE_LANGUAGES) + 1)
+    rare = pd.Series(zipf / zipf.sum() * RARE_LANGUAGES_SHARE, index=RARE_LANGUAGES)
+    weights = pd.concat([common, rare])
+    return weights / weights.sum()
+
+
+def _truncated_pareto(rng: np.random.Generator, alpha: float, low: float, high: float, size: int) -> np.ndarray:
+    """Pareto(``alpha``) samples from ``low`` up to ``high`` (inverse CDF, no pile-up at the cap)."""
+    ratio = (low / high) ** alpha
+    return low * (1 - rng.random(size) * (1 - ratio)) ** (-1 / alpha)
+
+
+def _timestamps(values: np.ndarray) -> np.ndarray:
+    return np.char.add(np.datetime_as_string(values.astype("datetime64[s]"), unit="s"), "Z")
+
+
+def generate_repositories(rows: int, seed: int = 42, min_stars: int = 1000) -> pd.DataFrame:
+    """``rows`` synthetic repositories, most starred first, with the columns of ``repos.csv``."""
+    rng = np.random.default_rng(seed)
+    index = np.arange(rows)
+
+    stars = np.sort(_truncated_pareto(rng, 1.1, min_stars, MAX_STARS, rows).astype(np.int64))[::-1]
+    popularity = np.log(stars / min_stars)
+
+    languages = _language_weights()
+    language = rng.choice(languages.index.to_numpy(), size=rows, p=languages.to_numpy())
+
+    seconds_span = (COLLECTED_AT - FIRST_CREATED_AT).astype("timedelta64[s]").astype(np.int64)
+    created = COLLECTED_AT - (rng.uniform(0.01, 1.0, rows) * seconds_span).astype("timedelta64[s]")
+    # New stars bump updatedAt, so almost every top repository was updated hours before the
+    # collection; the few dormant ones feed the rq04 "not updated on the collection day" table
+    recent = rng.exponential(3 * 3600, rows).clip(max=20 * 3600)
+    dormant = rng.uniform(0, 1, rows) * (COLLECTED_AT - created).astype(np.int64)
+    idle = np.where(rng.random(rows) < 0.97, recent, dormant).astype(np.int64)
+    updated = np.maximum(COLLECTED_AT - idle.astype("timedelta64[s]"), created)
+
+    releases = np.where(rng.random(rows) < 0.35, 0,
+                        np.floor(_truncated_pareto(rng, 1.2, 1, MAX_RELEASES, rows))).astype(np.int64)
+    pull_requests = np.floor(rng.lognormal(3.5 + 0.5 * popularity, 1.6)).astype(np.int64)
+    has_issues = rng.random(rows) > 0.05
+    open_issues = np.where(has_issues, np.floor(rng.lognormal(2.5 + 0.4 * popularity, 1.4)), 0).astype(np.int64)
+    closed_issues = np.where(
+        has_issues, np.floor(open_issues * rng.lognormal(1.5, 1.0, rows) + rng.poisson(3, rows)), 0
+    ).astype(np.int64)
+    mentionable_users = np.floor(rng.lognormal(3.0 + 0.4 * popularity, 1.2)).astype(np.int64)
+
+    names = pd.Series(index).astype(str).str.zfill(7)
+    df = pd.DataFrame({
+        "id": "R_syn" + names,
+        "name": "repo-" + names,
+        "url": "https://github.com/synthetic/repo-" + names,
+        "stargazerCount": stars,
+        "createdAt": _timestamps(created),
+        "updatedAt": _timestamps(updated),
+        "primaryLanguage": language,
+        "releases_count": releases,
+        "pullRequests_count": pull_requests,
+        "open_issues": open_issues,
+        "closed_issues": closed_issues,
+        "mentionable_users_count": mentionable_users,
+        "collectedAt": str(_timestamps(np.array([COLLECTED_AT]))[0]),
+    })
+    return df[CSV_COLUMNS]
+
+
+def write_synthetic_csv(rows: int, path: Path, seed: int = 42) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    generate_repositories(rows, seed).to_csv(path, index=False)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, help="número de repositórios")
+    parser.add_argument("--preset", choices=sorted(PRESETS) + ["all"], help="tamanho pré-definido (ou todos)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="arquivo CSV (com --rows ou um único --preset)")
+    parser.add_argument("--output-dir", type=Path, default=Path("data") / "synthetic",
+                        help="pasta dos arquivos repos_<preset>.csv")
+    args = parser.parse_args()
+
+    if args.rows:
+        targets = {str(args.rows): args.rows}
+    elif args.preset == "all":
+        targets = PRESETS
+    elif args.preset:
+        targets = {args.preset: PRESETS[args.preset]}
+    else:
+        parser.error("informe --rows ou --preset")
+
+    for label, rows in targets.items():
+        path = args.output if args.output and len(targets) == 1 else args.output_dir / f"repos_{label}.csv"
+        write_synthetic_csv(rows, path, args.seed)
+        print(f"✅ {rows:,} repositórios sintéticos em {path}")
+
+
+if __name__ == "__main__":
+    main()
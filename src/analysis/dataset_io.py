@@ -0,0 +1,86 @@
+"""Loading of the collected dataset for the analysis scripts."""
+from pathlib import Path
+from typing import List, Optional, Tuple
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.utils.collection_files import newest_existing
+from src.utils.jsonl_io import compression_variants, iter_json_line_chunks
+from src.utils.snapshot_store import SnapshotStore
+
+# Set to ``latest`` or a run's ``collectedAt`` to read from data/repos.db
+SNAPSHOT_ENV = "REPOS_SNAPSHOT"
+
+
+def resolve_source(csv_path: Path) -> Tuple[Path, Optional[str]]:
+    """File ``read_repositories`` will read for ``csv_path``, plus the snapshot if any."""
+    snapshot = os.environ.get(SNAPSHOT_ENV)
+    if snapshot:
+        return csv_path.with_name("repos.db"), snapshot
+    # Whichever collection was saved last wins, so a later CSV- or JSON Lines-only run is never shadowed
+    # by an older file; among the formats of that same run, the typed Parquet file is read first
+    candidates = [csv_path.with_suffix(".parquet"), csv_path, *compression_variants(csv_path.with_suffix(".jsonl"))]
+    return newest_existing(candidates) or csv_path, None
+
+
+def read_repositories(csv_path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read the most recently saved of the Parquet, CSV and JSON Lines files next to ``csv_path``.
+
+    Only ``columns`` are read when given. Parquet timestamps and counts keep
+    their types; ``primaryLanguage`` is decoded back to plain strings so the
+    scripts behave the same with either format. When ``REPOS_SNAPSHOT`` is
+    set, the rows come from that snapshot of the SQLite store instead. When
+    one collection saved several formats, Parquet is preferred over the CSV
+    and the CSV over ``repos.jsonl[.gz|.zst]``.
+    """
+    source, snapshot = resolve_source(csv_path)
+    if snapshot:
+        return read_snapshot(source, snapshot, columns)
+
+    if source.suffix == ".parquet":
+        if columns is not None:
+            available = set(pq.read_schema(source).names)
+            columns = [column for column in columns if column in available]
+        df = pq.read_table(source, columns=columns).to_pandas()
+        if "primaryLanguage" in df.columns and isinstance(df["primaryLanguage"].dtype, pd.CategoricalDtype):
+            df["primaryLanguage"] = df["primaryLanguage"].astype(object)
+        return df
+
+    if ".jsonl" in source.suffixes:
+        return read_json_lines(source, columns)
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda column: column in wanted  # noqa: E731
+    return pd.read_csv(source, usecols=usecols)
+
+
+def read_json_lines(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Build the frame chunk by chunk so only one chunk of dicts is alive at a time."""
+    frames = []
+    for chunk in iter_json_line_chunks(path):
+        frame = pd.DataFrame.from_records(chunk)
+        if columns is not None:
+            frame = frame[[column for column in columns if column in frame.columns]]
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_snapshot(db_path: Path, snapshot: str = "latest", columns: Optional[List[str]] = None) -> pd.DataFrame:
+    if not db_path.exists():
+        raise FileNotFoundError(f"Banco de snapshots não encontrado: {db_path}")
+    store = SnapshotStore(db_path)
+    query, params = store.snapshot_query(snapshot, columns)
+    connection = store.connect()
+    try:
+        df = pd.read_sql_query(query, connection, params=params)
+    finally:
+        connection.close()
+    if df.empty:
+        raise ValueError(f"Snapshot não encontrado em {db_path}: {snapshot}")
+    return df
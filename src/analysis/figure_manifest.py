@@ -0,0 +1,117 @@
+"""Build manifest that lets the runner skip figures whose inputs did not change."""
+from pathlib import Path
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, Set
+import hashlib
+import inspect
+import json
+import os
+import re
+
+import matplotlib
+import pandas as pd
+
+_STRING_LITERAL = re.compile(r"""["']([A-Za-z_][A-Za-z0-9_]*)["']""")
+
+
+def function_sources(function: Callable) -> List[str]:
+    """Source of ``function`` plus the same-module helpers it calls, recursively."""
+    module = inspect.getmodule(function)
+    sources, seen, pending = [], set(), [function]
+    while pending:
+        current = pending.pop()
+        if current.__name__ in seen:
+            continue
+        seen.add(current.__name__)
+        sources.append(inspect.getsource(current))
+        for name in _code_names(current.__code__):
+            helper = getattr(module, name, None)
+            if inspect.isfunction(helper) and helper.__module__ == module.__name__:
+                pending.append(helper)
+    return sorted(sources)
+
+
+def _code_names(code: CodeType) -> Set[str]:
+    """Global names used by ``code``, including nested comprehensions and lambdas."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def referenced_columns(df: pd.DataFrame, sources: List[str]) -> List[str]:
+    """Columns named by a string literal in the plotting code; all columns if none is."""
+    literals: Set[str] = set()
+    for source in sources:
+        literals.update(_STRING_LITERAL.findall(source))
+    return [column for column in df.columns if column in literals] or list(df.columns)
+
+
+def style_digest() -> str:
+    """Hash of the active matplotlib settings, i.e. after ``configure_plot_style`` ran."""
+    settings = sorted((key, repr(value)) for key, value in matplotlib.rcParams.items())
+    return hashlib.sha256(repr(settings).encode("utf-8")).hexdigest()
+
+
+def figure_fingerprint(function: Callable, arguments: Dict[str, Any], style: str) -> str:
+    """Hash of everything a figure depends on: data it reads, plotting code and style."""
+    sources = function_sources(function)
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(source.encode("utf-8"))
+    digest.update(style.encode("utf-8"))
+    for name in sorted(arguments):
+        value = arguments[name]
+        digest.update(name.encode("utf-8"))
+        if isinstance(value, pd.DataFrame):
+            columns = referenced_columns(value, sources)
+            digest.update(json.dumps(columns).encode("utf-8"))
+            digest.update(pd.util.hash_pandas_object(value[columns], index=False).values.tobytes())
+        else:
+            digest.update(repr(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class FigureManifest:
+    """
+    JSON file mapping each figure function to its fingerprint and output files.
+
+    A figure is up to date when its fingerprint matches and every file it
+    wrote last time still exists.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            try:
+                self._entries = json.loads(path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                self._entries = {}
+
+    def is_fresh(self, name: str, fingerprint: str) -> bool:
+        entry = self._entries.get(name)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return False
+        return all((self.path.parent / output).exists() for output in entry["outputs"])
+
+    def record(self, name: str, fingerprint: str, outputs: List[str]) -> None:
+        self._entries[name] = {"fingerprint": fingerprint, "outputs": sorted(outputs)}
+
+    def discard(self, name: str) -> None:
+        self._entries.pop(name, None)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._entries, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def relative_output(self, output: Any) -> Optional[str]:
+        """Path of a saved file relative to the manifest, or ``None`` if it lives elsewhere."""
+        path = Path(output).resolve()
+        try:
+            return str(path.relative_to(self.path.parent.resolve()))
+        except ValueError:
+            return None
@@ -5,6 +5,8 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from src.analysis.prepared_dataset import load_prepared_dataset
+
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
@@ -30,15 +32,16 @@ def configure_plot_style() -> None:
 
 
 def load_data(dataset_path: Path) -> pd.DataFrame:
-    df = pd.read_csv(dataset_path)
-    df["releases_count"] = pd.to_numeric(df["releases_count"], errors="coerce").fillna(0)
-    df["pullRequests_count"] = pd.to_numeric(df["pullRequests_count"], errors="coerce").fillna(0)
-    df["stargazerCount"] = pd.to_numeric(df["stargazerCount"], errors="coerce").fillna(0)
-    df["mentionable_users_count"] = pd.to_numeric(df["mentionable_users_count"], errors="coerce").fillna(0)
-    df["primaryLanguage"] = df["primaryLanguage"].fillna("Unknown")
+    df, _ = load_prepared_dataset(dataset_path)
     return df
 
 
+def figure_inputs(dataset_path: Path = DATASET_PATH) -> dict:
+    """Arguments for the ``plot_rq*`` functions, by parameter name."""
+    df = load_data(dataset_path)
+    return {"df": df, "df_zero": df[df["releases_count"] == 0].copy()}
+
+
 def save_figure(fig: plt.Figure, filename: str) -> None:
     FIGURES_DIR.mkdir(parents=True, exist_ok=True)
     output_path = FIGURES_DIR / filename
@@ -51,7 +54,7 @@ def is_non_software(language: str) -> bool:
     return language in {"Unknown", "Markdown", ""}
 
 
-def plot_zero_release_languages(df: pd.DataFrame, df_zero: pd.DataFrame) -> None:
+def plot_rq03_zero_release_languages(df: pd.DataFrame, df_zero: pd.DataFrame) -> None:
     """Gráfico 1: distribuição de linguagens — repos sem releases vs todos."""
     top_langs_all = df["primaryLanguage"].value_counts().head(10).index.tolist()
     all_langs = set(top_langs_all) | set(df_zero["primaryLanguage"].value_counts().head(10).index.tolist())
@@ -123,7 +126,7 @@ def main() -> None:
     print(f"Total de repositórios: {len(df)}")
 
     print_console_summary(df, df_zero)
-    plot_zero_release_languages(df, df_zero)
+    plot_rq03_zero_release_languages(df, df_zero)
 
     print("\nConcluído: visualizações extras de RQ03 geradas.")
 
@@ -9,8 +9,9 @@ import matplotlib
 import seaborn as sns
 from pathlib import Path
 
+from src.analysis.prepared_dataset import load_prepared_dataset
+
 matplotlib.use("Agg")
-sns.set_theme(style="whitegrid")
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_PATH = BASE_DIR / "data" / "repos.csv"
@@ -20,21 +21,23 @@ FIG_DIR.mkdir(parents=True, exist_ok=True)
 DPI = 300
 
 
-def load_and_prepare() -> pd.DataFrame:
-    df = pd.read_csv(DATA_PATH)
-    df["updatedAt"] = pd.to_datetime(df["updatedAt"])
-    df["collectedAt"] = pd.to_datetime(df["collectedAt"])
-    df["createdAt"] = pd.to_datetime(df["createdAt"])
+def configure_plot_style() -> None:
+    sns.set_theme(style="whitegrid")
 
-    reference_date = df["collectedAt"].max()
-    df["days_since_update"] = (reference_date - df["updatedAt"]).dt.days
 
-    df = df.sort_values("stargazerCount", ascending=False).reset_index(drop=True)
-    df["star_rank"] = df.index + 1
+def load_and_prepare(dataset_path: Path = DATA_PATH) -> pd.DataFrame:
+    df, reference_date = load_prepared_dataset(dataset_path)
+    df = df.sort_values("star_rank").reset_index(drop=True)
     return df, reference_date
 
 
-def generate_table(df: pd.DataFrame, reference_date: pd.Timestamp):
+def figure_inputs(dataset_path: Path = DATA_PATH) -> dict:
+    """Arguments for the ``plot_rq*`` functions, by parameter name."""
+    df, reference_date = load_and_prepare(dataset_path)
+    return {"df": df, "reference_date": reference_date}
+
+
+def plot_rq04_not_recently_updated(df: pd.DataFrame, reference_date: pd.Timestamp):
     """Tabela com os repositórios que NÃO foram atualizados no dia da coleta."""
     not_recent = (
         df[df["days_since_update"] > 0]
@@ -161,8 +164,9 @@ def print_analysis(df: pd.DataFrame, reference_date: pd.Timestamp):
 
 
 def main():
+    configure_plot_style()
     df, reference_date = load_and_prepare()
-    generate_table(df, reference_date)
+    plot_rq04_not_recently_updated(df, reference_date)
     print_analysis(df, reference_date)
 
 
@@ -6,56 +6,51 @@ from pathlib import Path
 import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
-from scipy import stats
+
+from src.analysis.prepared_dataset import load_metric_cube, load_prepared_dataset
+from src.analysis.stats_engine import median_ci_by_group, spearman_matrix
+from src.utils.metric_cube import MetricCube
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 DATASET_PATH = ROOT_DIR / "data" / "repos.csv"
 FIGURES_DIR = ROOT_DIR / "reports" / "figures"
 
+STATISTICS_COLUMNS = [
+    "closed_issues_percentage",
+    "age_years",
+    "stargazerCount",
+    "total_issues",
+    "pullRequests_count",
+    "releases_count",
+    "mentionable_users_count",
+    "days_since_update",
+]
 
-def load_and_prepare(csv_path: Path) -> pd.DataFrame:
-    df = pd.read_csv(csv_path)
-
-    df["primaryLanguage"] = (
-        df["primaryLanguage"].fillna("Unknown").astype(str).str.strip().replace("", "Unknown")
-    )
-
-    for col in ["open_issues", "closed_issues", "stargazerCount", "mentionable_users_count"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-    df["createdAt"] = pd.to_datetime(df["createdAt"], utc=True, errors="coerce")
-    df["collectedAt"] = pd.to_datetime(df["collectedAt"], utc=True, errors="coerce")
 
-    reference_date = df["collectedAt"].max()
-
-    df["total_issues"] = df["open_issues"] + df["closed_issues"]
-    df = df[df["total_issues"] > 0].copy()
-
-    df["closed_issues_pct"] = df["closed_issues"] / df["total_issues"] * 100
-    df["age_years"] = (reference_date - df["createdAt"]).dt.total_seconds() / (365.25 * 86400)
+def load_and_prepare(csv_path: Path) -> pd.DataFrame:
+    df, _ = load_prepared_dataset(csv_path)
+    return df[df["total_issues"] > 0].copy()
 
-    df["age_range"] = pd.cut(
-        df["age_years"],
-        bins=[0, 2, 5, 10, float("inf")],
-        labels=["0–2 anos", "2–5 anos", "5–10 anos", "10+ anos"],
-        right=False,
-    )
 
-    return df
+def figure_inputs(dataset_path: Path = DATASET_PATH) -> dict:
+    """Arguments for the ``plot_rq*`` functions, by parameter name."""
+    return {"df": load_and_prepare(dataset_path), "cube": load_metric_cube(dataset_path)}
 
 
-def plot_issues_by_language(df: pd.DataFrame) -> None:
-    top10 = df["primaryLanguage"].value_counts().nlargest(10).index.tolist()
+def plot_rq06_issues_by_language(df: pd.DataFrame, cube: MetricCube) -> None:
+    # Repos without issues have no percentage, so counting it keeps the total_issues > 0 subset
+    top10 = cube.top("primaryLanguage", 10, metric="closed_issues_percentage")
     subset = df[df["primaryLanguage"].isin(top10)].copy()
 
-    lang_medians = subset.groupby("primaryLanguage")["closed_issues_pct"].median()
+    # Exact medians: the cube's sketches (≈1% error) could swap languages with close medians
+    lang_medians = subset.groupby("primaryLanguage")["closed_issues_percentage"].median()
     order = lang_medians.sort_values(ascending=False).index.tolist()
 
     fig, ax = plt.subplots(figsize=(12, 6))
     sns.boxplot(
         data=subset,
         x="primaryLanguage",
-        y="closed_issues_pct",
+        y="closed_issues_percentage",
         hue="primaryLanguage",
         order=order,
         hue_order=order,
@@ -80,40 +75,44 @@ def plot_issues_by_language(df: pd.DataFrame) -> None:
     print(f"  ✓ Salvo: {out}")
 
 
-def print_statistics(df: pd.DataFrame) -> None:
+def print_statistics(df: pd.DataFrame, cube: MetricCube) -> None:
     print("\n" + "=" * 60)
     print("ESTATÍSTICAS — RQ6: Correlações e Rankings")
     print("=" * 60)
 
-    rho_age, p_age = stats.spearmanr(df["age_years"], df["closed_issues_pct"])
+    rho, p_values, _ = spearman_matrix(df, STATISTICS_COLUMNS)
+    # Repos with no mentionable users are left out of the contributors correlation only
     contributors = df[df["mentionable_users_count"] > 0]
-    rho_contrib, p_contrib = stats.spearmanr(
-        contributors["mentionable_users_count"], contributors["closed_issues_pct"]
-    )
-    rho_stars, p_stars = stats.spearmanr(df["stargazerCount"], df["closed_issues_pct"])
+    rho_contrib, p_contrib, _ = spearman_matrix(contributors, ["closed_issues_percentage", "mentionable_users_count"])
 
     print("\n📊 Correlações de Spearman:")
-    print(f"  • Issues% vs Idade:          ρ = {rho_age:+.4f}  (p = {p_age:.2e})")
-    print(f"  • Issues% vs Contribuidores:  ρ = {rho_contrib:+.4f}  (p = {p_contrib:.2e})")
-    print(f"  • Issues% vs Stars:           ρ = {rho_stars:+.4f}  (p = {p_stars:.2e})")
+    for column, label in [("age_years", "Idade"), ("stargazerCount", "Stars")]:
+        print(f"  • Issues% vs {label + ':':<17}ρ = {rho.loc['closed_issues_percentage', column]:+.4f}  "
+              f"(p = {p_values.loc['closed_issues_percentage', column]:.2e})")
+    print(f"  • Issues% vs Contribuidores:  ρ = {rho_contrib.iloc[0, 1]:+.4f}  (p = {p_contrib.iloc[0, 1]:.2e})")
+
+    print("\n📊 Matriz de Spearman (todas as métricas):")
+    print(rho.round(3).to_string())
 
-    lang_medians = df.groupby("primaryLanguage")["closed_issues_pct"].median()
-    lang_counts = df["primaryLanguage"].value_counts()
+    lang_counts = cube.counts("primaryLanguage", metric="closed_issues_percentage")
     # Considerar apenas linguagens com ≥ 5 repos
-    valid_langs = lang_counts[lang_counts >= 5].index
-    lang_medians = lang_medians[lang_medians.index.isin(valid_langs)].sort_values(ascending=False)
+    valid_langs = lang_counts[lang_counts >= 5].index.tolist()
+    lang_medians = median_ci_by_group(df, "closed_issues_percentage", groups=valid_langs)
+    overall = lang_medians.loc["Overall"]
+    lang_medians = lang_medians.drop(index="Overall").sort_values("median", ascending=False)
 
+    print(f"\n📈 Mediana geral: {overall['median']:.2f}%  (IC 95%: {overall['ci_low']:.2f}–{overall['ci_high']:.2f}%)")
     print("\n🏆 Top 3 linguagens por mediana de issues fechadas (≥ 5 repos):")
-    for i, (lang, med) in enumerate(lang_medians.head(3).items(), 1):
-        n = lang_counts[lang]
-        print(f"  {i}. {lang}: {med:.2f}%  (n={n})")
+    for i, (lang, row) in enumerate(lang_medians.head(3).iterrows(), 1):
+        print(f"  {i}. {lang}: {row['median']:.2f}%  (IC 95%: {row['ci_low']:.2f}–{row['ci_high']:.2f}%, "
+              f"n={row['n']:.0f})")
 
     print("\n⚠️  Bottom 3 linguagens por mediana de issues fechadas (≥ 5 repos):")
-    for i, (lang, med) in enumerate(lang_medians.tail(3).items(), 1):
-        n = lang_counts[lang]
-        print(f"  {i}. {lang}: {med:.2f}%  (n={n})")
+    for i, (lang, row) in enumerate(lang_medians.tail(3).iterrows(), 1):
+        print(f"  {i}. {lang}: {row['median']:.2f}%  (IC 95%: {row['ci_low']:.2f}–{row['ci_high']:.2f}%, "
+              f"n={row['n']:.0f})")
 
-    print(f"\n📋 Repos analisados: {len(df)} (excluídos {1000 - len(df)} com 0 issues)")
+    print(f"\n📋 Repos analisados: {len(df)} (excluídos {cube.total() - len(df)} com 0 issues)")
     print("=" * 60)
 
 
@@ -121,11 +120,12 @@ def main() -> None:
     FIGURES_DIR.mkdir(parents=True, exist_ok=True)
     print("Carregando dataset...")
     df = load_and_prepare(DATASET_PATH)
+    cube = load_metric_cube(DATASET_PATH)
     print(f"  → {len(df)} repos com issues (total_issues > 0)\n")
 
     print("Gerando gráficos RQ6 extras:")
-    plot_issues_by_language(df)
-    print_statistics(df)
+    plot_rq06_issues_by_language(df, cube)
+    print_statistics(df, cube)
 
 
 if __name__ == "__main__":
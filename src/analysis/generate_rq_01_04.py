@@ -4,6 +4,8 @@ import matplotlib
 import pandas as pd
 import seaborn as sns
 
+from src.analysis.prepared_dataset import load_prepared_dataset
+
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
@@ -27,7 +29,7 @@ def configure_plot_style() -> None:
 
 
 def load_and_prepare_data(dataset_path: Path) -> tuple[pd.DataFrame, pd.Timestamp]:
-    df = pd.read_csv(dataset_path)
+    df, reference_date = load_prepared_dataset(dataset_path)
 
     required_columns = {
         "createdAt",
@@ -40,27 +42,18 @@ def load_and_prepare_data(dataset_path: Path) -> tuple[pd.DataFrame, pd.Timestam
         missing = ", ".join(sorted(missing_columns))
         raise ValueError(f"Colunas ausentes em {dataset_path}: {missing}")
 
-    df["createdAt"] = pd.to_datetime(df["createdAt"], utc=True, errors="coerce")
-    df["updatedAt"] = pd.to_datetime(df["updatedAt"], utc=True, errors="coerce")
-    df["pullRequests_count"] = pd.to_numeric(df["pullRequests_count"], errors="coerce").fillna(0)
-    df["releases_count"] = pd.to_numeric(df["releases_count"], errors="coerce").fillna(0)
-
-    if "collectedAt" in df.columns:
-        df["collectedAt"] = pd.to_datetime(df["collectedAt"], utc=True, errors="coerce")
-        reference_date = df["collectedAt"].max()
-    else:
-        reference_date = df["updatedAt"].max()
-    if pd.isna(reference_date):
-        raise ValueError("Não foi possível calcular reference_date.")
-
-    df = df.dropna(subset=["createdAt", "updatedAt"]).copy()
-    df["age_days"] = (reference_date - df["createdAt"]).dt.days.clip(lower=0)
+    # RQ01 reports ages counted in whole days
     df["age_years"] = df["age_days"] / 365.25
-    df["days_since_update"] = (reference_date - df["updatedAt"]).dt.days.clip(lower=0)
-
+    df = df.dropna(subset=["createdAt", "updatedAt"])
     return df, reference_date
 
 
+def figure_inputs(dataset_path: Path = DATASET_PATH) -> dict:
+    """Arguments for the ``plot_rq*`` functions, by parameter name."""
+    df, reference_date = load_and_prepare_data(dataset_path)
+    return {"df": df, "reference_date": reference_date}
+
+
 def save_figure(fig: plt.Figure, filename: str) -> None:
     FIGURES_DIR.mkdir(parents=True, exist_ok=True)
     output_path = FIGURES_DIR / filename
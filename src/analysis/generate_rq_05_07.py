@@ -5,15 +5,21 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from src.analysis.prepared_dataset import load_metric_cube, load_prepared_dataset
+from src.analysis.stats_engine import bootstrap_median_ci, median_ci_by_group
+from src.utils.metric_cube import MetricCube
+
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 DATASET_PATH = ROOT_DIR / "data" / "repos.csv"
 FIGURES_DIR = ROOT_DIR / "reports" / "figures"
 
 
-def load_dataset(csv_path: Path) -> tuple[pd.DataFrame, pd.Timestamp]:
-    df = pd.read_csv(csv_path)
+def configure_plot_style() -> None:
+    sns.set_theme(style="whitegrid")
 
+
+def load_dataset(csv_path: Path) -> tuple[pd.DataFrame, pd.Timestamp]:
     required_columns = [
         "name",
         "updatedAt",
@@ -23,42 +29,31 @@ def load_dataset(csv_path: Path) -> tuple[pd.DataFrame, pd.Timestamp]:
         "open_issues",
         "closed_issues",
     ]
+    df, reference_date = load_prepared_dataset(csv_path)
     missing_columns = [column for column in required_columns if column not in df.columns]
     if missing_columns:
         raise ValueError(f"Colunas obrigatórias ausentes no dataset: {missing_columns}")
 
-    df["primaryLanguage"] = (
-        df["primaryLanguage"].fillna("Unknown").astype(str).str.strip().replace("", "Unknown")
-    )
-
-    numeric_columns = ["releases_count", "pullRequests_count", "open_issues", "closed_issues"]
-    for column in numeric_columns:
-        df[column] = pd.to_numeric(df[column], errors="coerce").fillna(0)
-
-    df["updatedAt"] = pd.to_datetime(df["updatedAt"], errors="coerce", utc=True)
     if df["updatedAt"].isna().all():
         raise ValueError("Não foi possível interpretar valores válidos na coluna updatedAt.")
 
-    if "collectedAt" in df.columns:
-        df["collectedAt"] = pd.to_datetime(df["collectedAt"], utc=True, errors="coerce")
-        reference_date = df["collectedAt"].max()
-    else:
-        reference_date = df["updatedAt"].max()
-    df["days_since_update"] = (reference_date - df["updatedAt"]).dt.total_seconds() / 86400
-    df["days_since_update"] = df["days_since_update"].clip(lower=0)
-
-    total_issues = df["open_issues"] + df["closed_issues"]
-    df["closed_issues_percentage"] = np.where(
-        total_issues > 0,
-        (df["closed_issues"] / total_issues) * 100,
-        np.nan,
-    )
-
+    # RQ07 compares medians of fractional days; the shared column is truncated to whole days
+    df["days_since_update"] = ((reference_date - df["updatedAt"]).dt.total_seconds() / 86400).clip(lower=0)
     return df, reference_date
 
 
-def plot_rq05_primary_languages(df: pd.DataFrame, output_file: Path, top_n: int = 12) -> None:
-    language_counts = df["primaryLanguage"].value_counts()
+def figure_inputs(dataset_path: Path = DATASET_PATH) -> dict:
+    """Arguments for the ``plot_rq*`` functions, by parameter name."""
+    df, reference_date = load_dataset(dataset_path)
+    return {"df": df, "reference_date": reference_date, "cube": load_metric_cube(dataset_path)}
+
+
+def plot_rq05_primary_languages(
+    cube: MetricCube,
+    output_file: Path = FIGURES_DIR / "rq05_primary_languages_ranking.png",
+    top_n: int = 12,
+) -> None:
+    language_counts = cube.counts("primaryLanguage")
     top_languages = language_counts.head(top_n)
     others_count = language_counts.iloc[top_n:].sum()
 
@@ -90,7 +85,10 @@ def plot_rq05_primary_languages(df: pd.DataFrame, output_file: Path, top_n: int
     plt.close(fig)
 
 
-def plot_rq06_closed_issues(df: pd.DataFrame, output_file: Path) -> None:
+def plot_rq06_closed_issues(
+    df: pd.DataFrame,
+    output_file: Path = FIGURES_DIR / "rq06_closed_issues_percentage.png",
+) -> None:
     closed_issues_percentage = df["closed_issues_percentage"].dropna()
     if closed_issues_percentage.empty:
         raise ValueError("Nenhum repositório com issues para calcular o percentual de issues fechadas.")
@@ -104,7 +102,8 @@ def plot_rq06_closed_issues(df: pd.DataFrame, output_file: Path) -> None:
         color="#10B981",
         ax=axes[0],
     )
-    median_value = closed_issues_percentage.median()
+    median_value, ci_low, ci_high = bootstrap_median_ci(closed_issues_percentage)
+    axes[0].axvspan(ci_low, ci_high, color="#DC2626", alpha=0.15, label=f"IC 95%: {ci_low:.1f}–{ci_high:.1f}%")
     axes[0].axvline(
         median_value,
         color="#DC2626",
@@ -130,40 +129,41 @@ def plot_rq06_closed_issues(df: pd.DataFrame, output_file: Path) -> None:
 
 def plot_rq07_contribution_by_language(
     df: pd.DataFrame,
-    output_file: Path,
+    cube: MetricCube,
     reference_date: pd.Timestamp,
+    output_file: Path = FIGURES_DIR / "rq07_contribution_by_language.png",
     top_n: int = 10,
 ) -> None:
-    top_languages = df["primaryLanguage"].value_counts().head(top_n).index.tolist()
+    top_languages = cube.top("primaryLanguage", top_n)
     language_subset = df[df["primaryLanguage"].isin(top_languages)].copy()
 
     if language_subset.empty:
         raise ValueError("Não há dados suficientes para gerar a análise da RQ07.")
 
-    summary = (
-        language_subset.groupby("primaryLanguage", as_index=True)
-        .agg(
-            median_pull_requests=("pullRequests_count", "median"),
-            median_releases=("releases_count", "median"),
-            median_days_since_update=("days_since_update", "median"),
-        )
-        .reindex(top_languages)
-    )
-
     fig, axes = plt.subplots(1, 3, figsize=(24, 7))
     plot_config = [
-        ("median_pull_requests", "Mediana de Pull Requests", "#2563EB"),
-        ("median_releases", "Mediana de Releases", "#F59E0B"),
-        ("median_days_since_update", "Mediana de Dias desde Atualização", "#14B8A6"),
+        ("pullRequests_count", "Mediana de Pull Requests", "#2563EB"),
+        ("releases_count", "Mediana de Releases", "#F59E0B"),
+        ("days_since_update", "Mediana de Dias desde Atualização", "#14B8A6"),
     ]
 
     for axis, (column, title, color) in zip(axes, plot_config):
+        summary = median_ci_by_group(language_subset, column, groups=top_languages, overall=False)
         sns.barplot(
             x=summary.index,
-            y=summary[column].values,
+            y=summary["median"].values,
             ax=axis,
             color=color,
         )
+        # 95% bootstrap interval of each median
+        axis.errorbar(
+            np.arange(len(summary)),
+            summary["median"].values,
+            yerr=[summary["median"] - summary["ci_low"], summary["ci_high"] - summary["median"]],
+            fmt="none",
+            ecolor="#1F2937",
+            capsize=4,
+        )
         axis.set_title(title)
         axis.set_xlabel("Linguagem Primária")
         axis.tick_params(axis="x", rotation=35)
@@ -183,13 +183,14 @@ def plot_rq07_contribution_by_language(
 
 
 def main() -> None:
-    sns.set_theme(style="whitegrid")
+    configure_plot_style()
     FIGURES_DIR.mkdir(parents=True, exist_ok=True)
 
     df, reference_date = load_dataset(DATASET_PATH)
+    cube = load_metric_cube(DATASET_PATH)
 
     plot_rq05_primary_languages(
-        df=df,
+        cube=cube,
         output_file=FIGURES_DIR / "rq05_primary_languages_ranking.png",
     )
     plot_rq06_closed_issues(
@@ -198,6 +199,7 @@ def main() -> None:
     )
     plot_rq07_contribution_by_language(
         df=df,
+        cube=cube,
         output_file=FIGURES_DIR / "rq07_contribution_by_language.png",
         reference_date=reference_date,
     )
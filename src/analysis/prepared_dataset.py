@@ -0,0 +1,145 @@
+"""Prepared dataset shared by the RQ scripts: typed columns plus every derived metric."""
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import hashlib
+import os
+
+import pandas as pd
+
+from src.analysis.dataset_io import read_repositories, resolve_source
+from src.utils.metric_cube import AGE_RANGE_BINS, AGE_RANGE_LABELS, MetricCube
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+DATASET_PATH = ROOT_DIR / "data" / "repos.csv"
+CACHE_DIR = ROOT_DIR / "data" / "cache" / "prepared"
+
+# Bump when the derived columns change so stale cache files are not reused
+PREPARED_VERSION = 2
+
+COUNT_COLUMNS = [
+    "stargazerCount",
+    "releases_count",
+    "pullRequests_count",
+    "open_issues",
+    "closed_issues",
+    "mentionable_users_count",
+]
+TIMESTAMP_COLUMNS = ["createdAt", "updatedAt", "collectedAt"]
+# Union of what the RQ scripts and the derived columns read; ``id`` and ``url`` are never loaded
+PREPARED_COLUMNS = ["name", "primaryLanguage", *COUNT_COLUMNS, *TIMESTAMP_COLUMNS]
+
+SECONDS_PER_YEAR = 365.25 * 86400
+
+_memo: Dict[str, pd.DataFrame] = {}
+_cube_memo: Dict[str, MetricCube] = {}
+# Content hashes by (source, snapshot, size, mtime): an unchanged file is hashed once per process
+_digest_memo: Dict[Tuple[Path, Optional[str], int, int], str] = {}
+
+
+def prepare_dataset(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Timestamp]:
+    """Normalize the raw columns and add the derived ones in a single vectorized pass.
+
+    Derived columns: ``age_days`` and ``days_since_update`` (whole days),
+    ``age_years`` (exact elapsed time), ``age_range``, ``total_issues``,
+    ``closed_issues_percentage`` (NaN without issues) and ``star_rank``
+    (1 = most starred). All ages are measured from ``reference_date``,
+    the latest ``collectedAt`` (or ``updatedAt`` for older datasets).
+    """
+    for column in COUNT_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").fillna(0)
+    for column in TIMESTAMP_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], utc=True, errors="coerce")
+    if "primaryLanguage" in df.columns:
+        df["primaryLanguage"] = (
+            df["primaryLanguage"].fillna("Unknown").astype(str).str.strip().replace("", "Unknown")
+        )
+
+    reference_date = reference_date_of(df)
+
+    if "createdAt" in df.columns:
+        age = reference_date - df["createdAt"]
+        df["age_days"] = age.dt.days.clip(lower=0)
+        df["age_years"] = (age.dt.total_seconds() / SECONDS_PER_YEAR).clip(lower=0)
+        df["age_range"] = pd.cut(df["age_years"], bins=AGE_RANGE_BINS, labels=AGE_RANGE_LABELS, right=False)
+    if "updatedAt" in df.columns:
+        df["days_since_update"] = (reference_date - df["updatedAt"]).dt.days.clip(lower=0)
+    if {"open_issues", "closed_issues"} <= set(df.columns):
+        df["total_issues"] = df["open_issues"] + df["closed_issues"]
+        df["closed_issues_percentage"] = (df["closed_issues"] / df["total_issues"] * 100).where(
+            df["total_issues"] > 0
+        )
+    if "stargazerCount" in df.columns:
+        df["star_rank"] = df["stargazerCount"].rank(method="first", ascending=False).astype("int64")
+
+    return df, reference_date
+
+
+def reference_date_of(df: pd.DataFrame) -> pd.Timestamp:
+    if "collectedAt" in df.columns:
+        reference_date = df["collectedAt"].max()
+    else:
+        reference_date = df["updatedAt"].max()
+    if pd.isna(reference_date):
+        raise ValueError("Não foi possível calcular reference_date.")
+    return reference_date
+
+
+def load_prepared_dataset(csv_path: Path = DATASET_PATH,
+                          cache_dir: Optional[Path] = CACHE_DIR) -> Tuple[pd.DataFrame, pd.Timestamp]:
+    """Return the prepared dataset for ``csv_path`` and its reference date.
+
+    The result is memoized per process and cached on disk under the content
+    hash of the source file, so only the first script of a report run pays
+    for parsing. Callers get their own copy and may modify it freely.
+    """
+    key = source_digest(csv_path)
+    if key not in _memo:
+        cache_path = cache_dir / f"{key}.parquet" if cache_dir is not None else None
+        if cache_path is not None and cache_path.exists():
+            _memo[key] = pd.read_parquet(cache_path)
+        else:
+            df, _ = prepare_dataset(read_repositories(csv_path, columns=PREPARED_COLUMNS))
+            if cache_path is not None:
+                _write_cache(df, cache_path)
+            _memo[key] = df
+
+    df = _memo[key].copy()
+    return df, reference_date_of(df)
+
+
+def load_metric_cube(csv_path: Path = DATASET_PATH, cache_dir: Optional[Path] = CACHE_DIR) -> MetricCube:
+    """Metric cube of the prepared dataset, built once per dataset and process."""
+    key = source_digest(csv_path)
+    if key not in _cube_memo:
+        load_prepared_dataset(csv_path, cache_dir)
+        _cube_memo[key] = MetricCube.build(_memo[key])
+    return _cube_memo[key]
+
+
+def source_digest(csv_path: Path) -> str:
+    """Content hash of the file that backs ``csv_path`` (and the selected snapshot).
+
+    Rehashed only when the file's size or modification time changes.
+    """
+    source, snapshot = resolve_source(csv_path)
+    if not source.exists():
+        raise FileNotFoundError(f"Dataset não encontrado: {source}")
+    stat = source.stat()
+    memo_key = (source.resolve(), snapshot, stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _digest_memo:
+        digest = hashlib.sha256(f"v{PREPARED_VERSION}:{snapshot or ''}:".encode("utf-8"))
+        with source.open("rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        _digest_memo[memo_key] = digest.hexdigest()
+    return _digest_memo[memo_key]
+
+
+def _write_cache(df: pd.DataFrame, cache_path: Path) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename so a concurrent reader never sees a partial file
+    tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
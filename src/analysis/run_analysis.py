@@ -0,0 +1,168 @@
+"""Regenerate every RQ figure from one process, rendering figures in parallel.
+
+Usage: python -m src.analysis.run_analysis [--workers N] [--force]
+
+Figures whose data, plotting code and style are unchanged since the last
+run (see ``reports/figures/manifest.json``) are skipped unless ``--force``.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Tuple
+import importlib
+import inspect
+import multiprocessing
+import os
+import pkgutil
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+import src.analysis as analysis_package
+from src.analysis.figure_manifest import FigureManifest, figure_fingerprint, style_digest
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+FIGURES_DIR = ROOT_DIR / "reports" / "figures"
+MANIFEST_PATH = FIGURES_DIR / "manifest.json"
+
+# Figure arguments per module, filled before the pool starts so forked
+# workers inherit the prepared frames instead of loading them again
+_inputs: Dict[str, Dict[str, Any]] = {}
+
+
+def discover_figures() -> List[Tuple[str, str]]:
+    """``(module, function)`` pairs for every ``plot_rq*`` in the ``generate_*`` scripts."""
+    figures = []
+    for module_info in sorted(pkgutil.iter_modules(analysis_package.__path__), key=lambda info: info.name):
+        if not module_info.name.startswith("generate_"):
+            continue
+        module = importlib.import_module(f"{analysis_package.__name__}.{module_info.name}")
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if name.startswith("plot_rq") and function.__module__ == module.__name__:
+                figures.append((module.__name__, name))
+    return figures
+
+
+def figure_inputs(module_name: str) -> Dict[str, Any]:
+    if module_name not in _inputs:
+        _inputs[module_name] = importlib.import_module(module_name).figure_inputs()
+    return _inputs[module_name]
+
+
+def bind_arguments(function: Callable, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Pass each input the function declares; parameters it has defaults for may be left out."""
+    parameters = inspect.signature(function).parameters
+    return {name: value for name, value in inputs.items() if name in parameters}
+
+
+def apply_plot_style(module: ModuleType) -> None:
+    """Reset matplotlib so one script's style never leaks into the next figure."""
+    matplotlib.rcdefaults()
+    configure = getattr(module, "configure_plot_style", None)
+    if configure is not None:
+        configure()
+
+
+def fingerprint(module_name: str, function_name: str) -> str:
+    module = importlib.import_module(module_name)
+    function = getattr(module, function_name)
+    apply_plot_style(module)
+    return figure_fingerprint(function, bind_arguments(function, figure_inputs(module_name)), style_digest())
+
+
+def render_figure(module_name: str, function_name: str) -> Tuple[float, List[str]]:
+    """Render one figure; return how long it took, in seconds, and the files it saved."""
+    module = importlib.import_module(module_name)
+    function = getattr(module, function_name)
+    inputs = figure_inputs(module_name)
+
+    # Each worker renders one figure at a time, so patching savefig here
+    # records exactly the files written by this figure
+    saved: List[str] = []
+    original_savefig = Figure.savefig
+
+    def recording_savefig(figure, fname, *args, **kwargs):
+        saved.append(str(fname))
+        return original_savefig(figure, fname, *args, **kwargs)
+
+    started = time.perf_counter()
+    Figure.savefig = recording_savefig
+    try:
+        apply_plot_style(module)
+        function(**bind_arguments(function, inputs))
+    finally:
+        Figure.savefig = original_savefig
+        plt.close("all")
+    return time.perf_counter() - started, saved
+
+
+def run(workers: int, force: bool = False) -> int:
+    started = time.perf_counter()
+    FIGURES_DIR.mkdir(parents=True, exist_ok=True)
+    figures = discover_figures()
+
+    for module_name in sorted({module_name for module_name, _ in figures}):
+        figure_inputs(module_name)
+    load_time = time.perf_counter() - started
+    print(f"Dataset preparado em {load_time:.2f}s; {len(figures)} figuras encontradas.")
+
+    manifest = FigureManifest(MANIFEST_PATH)
+    fingerprints = {name: fingerprint(module_name, name) for module_name, name in figures}
+    pending = [(module_name, name) for module_name, name in figures
+               if force or not manifest.is_fresh(name, fingerprints[name])]
+    skipped = len(figures) - len(pending)
+    if skipped:
+        print(f"{skipped} figuras sem alterações (use --force para gerar novamente).")
+
+    # fork shares the prepared frames with the workers; elsewhere each worker
+    # loads them once from the on-disk prepared-dataset cache
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+    timings: Dict[str, float] = {}
+    failures: Dict[str, BaseException] = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(render_figure, module_name, name): name for module_name, name in pending}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                timings[name], saved = future.result()
+                outputs = [manifest.relative_output(path) or path for path in saved]
+                manifest.record(name, fingerprints[name], outputs)
+                print(f"  ✓ {name} ({timings[name]:.2f}s)")
+            except Exception as e:
+                failures[name] = e
+                manifest.discard(name)
+                print(f"  ✗ {name}: {e}")
+    manifest.save()
+
+    print_timings(timings, time.perf_counter() - started)
+    return 1 if failures else 0
+
+
+def print_timings(timings: Dict[str, float], wall_time: float) -> None:
+    print("\n" + "=" * 60)
+    print(f"{'Figura':<45} {'Tempo (s)':>12}")
+    print("-" * 60)
+    for name, elapsed in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        print(f"{name:<45} {elapsed:>12.2f}")
+    print("-" * 60)
+    print(f"{'Soma das figuras':<45} {sum(timings.values()):>12.2f}")
+    print(f"{'Tempo total (relógio)':<45} {wall_time:>12.2f}")
+    print("=" * 60)
+
+
+def get_workers() -> int:
+    for i, arg in enumerate(sys.argv):
+        if arg.startswith("--workers="):
+            return int(arg.split("=", 1)[1])
+        if arg == "--workers" and i + 1 < len(sys.argv):
+            return int(sys.argv[i + 1])
+    return os.cpu_count() or 1
+
+
+if __name__ == "__main__":
+    sys.exit(run(get_workers(), force="--force" in sys.argv))
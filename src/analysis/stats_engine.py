@@ -0,0 +1,144 @@
+"""Vectorized statistics for the RQ scripts: Spearman matrices and bootstrap CIs for medians."""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+DEFAULT_RESAMPLES = 2000
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_SEED = 42
+# Upper bound on the resample matrix built at once (resamples × sample size)
+MAX_CHUNK_ELEMENTS = 16_000_000
+
+
+def spearman_matrix(df: pd.DataFrame,
+                    columns: Optional[Sequence[str]] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Spearman ρ and two-sided p-values for every pair of ``columns``.
+
+    Missing values are dropped pair by pair, as ``scipy.stats.spearmanr``
+    on each pair of complete columns would. Without missing values each
+    column is ranked once (average ranks for ties) and the whole matrix
+    comes from one product of the standardized ranks; otherwise only the
+    pairs involving an incomplete column are re-ranked on their shared
+    rows. Returns ``(rho, p_values, n)``, ``n`` being the rows behind each pair.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include="number").columns.tolist()
+    index = list(columns)
+    data = df[index]
+    present = data.notna().to_numpy()
+
+    complete = present.all(axis=0)
+    n = present.T.astype(np.int64) @ present.astype(np.int64)
+
+    rho = np.full((len(index), len(index)), np.nan)
+    if complete.any():
+        ranks = data.loc[:, complete].rank(method="average").to_numpy(dtype=float)
+        rho[np.ix_(complete, complete)] = _rank_correlation(ranks)
+    for i, j in zip(*np.triu_indices(len(index))):
+        if complete[i] and complete[j]:
+            continue
+        rows = present[:, i] & present[:, j]
+        pair = data.iloc[rows, [i, j]].rank(method="average").to_numpy(dtype=float)
+        rho[i, j] = rho[j, i] = _rank_correlation(pair)[0, 1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = rho * np.sqrt((n - 2) / ((1.0 - rho) * (1.0 + rho)))
+        p_values = np.where(n > 2, 2 * stats.t.sf(np.abs(t), np.maximum(n - 2, 1)), np.nan)
+    np.fill_diagonal(p_values, 0.0)
+
+    return (pd.DataFrame(rho, index=index, columns=index),
+            pd.DataFrame(p_values, index=index, columns=index),
+            pd.DataFrame(n, index=index, columns=index))
+
+
+def _rank_correlation(ranks: np.ndarray) -> np.ndarray:
+    """Pearson correlation of the rank columns, i.e. their Spearman ρ."""
+    centered = ranks - ranks.mean(axis=0)
+    norms = np.sqrt((centered ** 2).sum(axis=0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        standardized = centered / norms
+        return np.clip(standardized.T @ standardized, -1.0, 1.0)
+
+
+def _resampled_medians(sorted_values: np.ndarray, resamples: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Medians of ``resamples`` bootstrap samples of ``sorted_values``.
+
+    On sorted data the median of a resample is the value at its median
+    index, so only the int32 index matrix is partitioned; the floats are
+    never gathered.
+    """
+    size = len(sorted_values)
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, size, size=(resamples, size), dtype=np.int32)
+    middle = size // 2
+    if size % 2:
+        return sorted_values[np.partition(indices, middle, axis=1)[:, middle]]
+    indices = np.partition(indices, [middle - 1, middle], axis=1)
+    return (sorted_values[indices[:, middle - 1]] + sorted_values[indices[:, middle]]) / 2
+
+
+def _chunk_sizes(resamples: int, size: int) -> List[int]:
+    per_chunk = max(1, min(resamples, MAX_CHUNK_ELEMENTS // max(size, 1)))
+    return [min(per_chunk, resamples - start) for start in range(0, resamples, per_chunk)]
+
+
+def bootstrap_median_ci(values: Sequence[float], resamples: int = DEFAULT_RESAMPLES,
+                        confidence: float = DEFAULT_CONFIDENCE, seed: int = DEFAULT_SEED,
+                        workers: Optional[int] = None) -> Tuple[float, float, float]:
+    """Median of ``values`` and its percentile bootstrap interval: ``(median, low, high)``.
+
+    Resamples are drawn as index matrices and reduced with one
+    ``np.partition`` per chunk; chunks run on a thread pool (NumPy releases
+    the GIL while sorting and indexing) with seeds derived from ``seed``,
+    so the result does not depend on ``workers``.
+    """
+    array = np.asarray(values, dtype=float)
+    array = np.sort(array[~np.isnan(array)])
+    if array.size == 0:
+        return np.nan, np.nan, np.nan
+    median = float(np.median(array))
+    if array.size == 1:
+        return median, median, median
+
+    sizes = _chunk_sizes(resamples, array.size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(sizes) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+            chunks = list(pool.map(_resampled_medians, [array] * len(sizes), sizes, seeds))
+    else:
+        chunks = [_resampled_medians(array, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    alpha = (1.0 - confidence) / 2
+    low, high = np.quantile(np.concatenate(chunks), [alpha, 1.0 - alpha])
+    return median, float(low), float(high)
+
+
+def median_ci_by_group(df: pd.DataFrame, value: str, group: str = "primaryLanguage",
+                       groups: Optional[Sequence[str]] = None, resamples: int = DEFAULT_RESAMPLES,
+                       confidence: float = DEFAULT_CONFIDENCE, seed: int = DEFAULT_SEED,
+                       workers: Optional[int] = None, overall: bool = True) -> pd.DataFrame:
+    """Bootstrap CI of the median of ``value`` per ``group``, plus an ``Overall`` row when ``overall``.
+
+    Returns one row per group (in ``groups`` order when given) with the
+    columns ``median``, ``ci_low``, ``ci_high`` and ``n``.
+    """
+    grouped = {name: frame[value].to_numpy(dtype=float) for name, frame in df.groupby(group, observed=True)}
+    names = list(groups) if groups is not None else sorted(grouped)
+    workers = workers or os.cpu_count() or 1
+
+    def row(name: str, values: np.ndarray, row_workers: int) -> Tuple[str, float, float, float, int]:
+        median, low, high = bootstrap_median_ci(values, resamples, confidence, seed, workers=row_workers)
+        return name, median, low, high, int(np.count_nonzero(~np.isnan(values)))
+
+    # Groups run side by side, each resampled on one thread; the overall
+    # sample is the largest and gets the whole pool to itself
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names) or 1))) as pool:
+        rows = list(pool.map(lambda name: row(name, grouped.get(name, np.array([])), 1), names))
+    if overall:
+        rows.append(row("Overall", df[value].to_numpy(dtype=float), workers))
+    return pd.DataFrame(rows, columns=[group, "median", "ci_low", "ci_high", "n"]).set_index(group)
@@ -1,7 +1,18 @@
+import asyncio
 import sys
+from pathlib import Path
+from typing import Optional
 from src.services.fetcher_factory import RepositoryFetcherFactory
 from src.services.repository_manager import RepositoryManager
-from src.utils.output_formatter import RepositoryOutputFormatter
+from src.utils.output_formatter import RepositoryOutputFormatter, TableView
+from src.utils.parquet_dataset import ParquetSink
+from src.utils.jsonl_io import with_compression_suffix
+from src.utils.repository_sinks import CsvSink, JsonArraySink, JsonLinesSink
+from src.utils.response_cache import ResponseCache
+from src.utils.snapshot_store import SnapshotStore, SqliteSink
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+CACHE_DIR = DATA_DIR / "cache"
 
 def display_menu(options: list):
     print("=" * 60)
@@ -16,23 +27,83 @@ def display_menu(options: list):
     print("\n  [0] Sair")
     print("-" * 60)
 
-def run_collection(method: str, save_json: bool, save_csv: bool):
+def get_option(flag: str, default: Optional[str] = None) -> Optional[str]:
+    """Read a flag passed as `--flag VALUE` or `--flag=VALUE`."""
+    for i, arg in enumerate(sys.argv):
+        if arg.startswith(f"{flag}="):
+            return arg.split("=", 1)[1]
+        if arg == flag and i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return default
+
+def get_int_option(flag: str, default: Optional[int] = None) -> Optional[int]:
+    """Read an integer flag passed as `--flag N` or `--flag=N`."""
+    value = get_option(flag)
+    return int(value) if value is not None else default
+
+def build_cache(cache_mode: str, ttl: int) -> Optional[ResponseCache]:
+    """`on` reads and writes the cache, `refresh` (--no-cache) skips hits but stores fresh responses."""
+    if cache_mode == "off":
+        return None
+    return ResponseCache(CACHE_DIR, ttl=ttl)
+
+def run_collection(method: str, save_json: bool, save_csv: bool,
+                   shards: Optional[int] = None, concurrency: int = 4, resume: bool = False,
+                   refresh: bool = False, enrich: bool = False, cache_mode: str = "off",
+                   cache_ttl: int = 3600, stream: bool = False, save_parquet: bool = False,
+                   save_sqlite: bool = False, save_jsonl: bool = False,
+                   jsonl_compression: Optional[str] = None, view: Optional[TableView] = None,
+                   spans: bool = False):
     """Encapsulates execution to keep main loop clean"""
     try:
         print("\n" + "=" * 40)
         print(f"Iniciando coleta via {method.upper()}...")
         print("=" * 40 + "\n")
         
-        fetcher = RepositoryFetcherFactory.create(method)
+        cache = build_cache(cache_mode, cache_ttl)
+        cache_read = cache_mode == "on"
+        fetcher = RepositoryFetcherFactory.create(method, cache=cache, cache_read=cache_read,
+                                                  jsonl_compression=jsonl_compression, spans=spans)
         manager = RepositoryManager(fetcher)
         
-        repos = manager.fetch_repositories(pages=100, save_json=save_json, save_csv=save_csv)
-        manager.display_results(repos)
+        if stream:
+            sinks = []
+            if save_csv:
+                sinks.append(CsvSink(DATA_DIR / "repos.csv"))
+            if save_json:
+                sinks.append(JsonArraySink(DATA_DIR / "repos.json"))
+            if save_jsonl:
+                sinks.append(JsonLinesSink(with_compression_suffix(DATA_DIR / "repos.jsonl", jsonl_compression)))
+            if save_parquet:
+                sinks.append(ParquetSink(DATA_DIR / "repos.parquet"))
+            if save_sqlite:
+                sinks.append(SqliteSink(SnapshotStore(DATA_DIR / "repos.db")))
+            total = manager.stream_repositories(sinks, pages=100, resume=resume)
+            RepositoryOutputFormatter.print_completion(total)
+            return
+        if refresh:
+            repos = manager.refresh_repositories(pages=100, save_json=save_json, save_csv=save_csv,
+                                                 save_parquet=save_parquet, save_sqlite=save_sqlite,
+                                                 save_jsonl=save_jsonl)
+        elif shards:
+            repos = asyncio.run(RepositoryFetcherFactory.fetch_sharded(
+                method, pages=100, shards=shards, concurrency=concurrency,
+                save_json=save_json, save_csv=save_csv, save_parquet=save_parquet,
+                save_sqlite=save_sqlite, save_jsonl=save_jsonl, cache=cache, cache_read=cache_read,
+                jsonl_compression=jsonl_compression, spans=spans,
+            ))
+        else:
+            repos = manager.fetch_repositories(pages=100, save_json=save_json, save_csv=save_csv,
+                                               resume=resume, enrich=enrich, save_parquet=save_parquet,
+                                               save_sqlite=save_sqlite, save_jsonl=save_jsonl)
+        manager.display_results(repos, view)
         
     except Exception as e:
         RepositoryOutputFormatter.print_error(f"Erro na execução: {e}")
 
-def main(save_json=False, save_csv=False):
+def main(save_json=False, save_csv=False, shards=None, concurrency=4, resume=False, refresh=False,
+         enrich=False, cache_mode="off", cache_ttl=3600, stream=False, save_parquet=False,
+         save_sqlite=False, save_jsonl=False, jsonl_compression=None, view=None, spans=False):
     # get available methods from the factory (OCP in practice)
     available_methods = RepositoryFetcherFactory.get_available_methods()
     
@@ -46,16 +117,81 @@ def main(save_json=False, save_csv=False):
             
         if choice.isdigit() and 1 <= int(choice) <= len(available_methods):
             selected_method = available_methods[int(choice) - 1]
-            run_collection(selected_method, save_json, save_csv)
+            run_collection(selected_method, save_json, save_csv, shards, concurrency, resume, refresh, enrich,
+                           cache_mode, cache_ttl, stream, save_parquet, save_sqlite, save_jsonl,
+                           jsonl_compression, view, spans)
             break
         else:
             print(f"\n❌ Opção inválida! Digite de 1 a {len(available_methods)} ou 0.")
 
+def has_flag(flag: str) -> bool:
+    return any(arg == flag or arg.startswith(f"{flag}=") for arg in sys.argv)
+
+def check_flag_conflicts() -> None:
+    """Reject flag combinations whose stages cannot run together instead of silently dropping one.
+
+    `--stream` writes pages as they arrive, so the stages that need the full list cannot run with it;
+    `--shards` and `--refresh` do not go through the paginated crawl that `--resume` and `--enrich` extend.
+    """
+    rules = (
+        ("--stream", ("--refresh", "--shards", "--enrich")),
+        ("--resume", ("--refresh", "--shards")),
+        ("--enrich", ("--refresh", "--shards")),
+    )
+    for flag, others in rules:
+        conflicting = [other for other in others if has_flag(other)]
+        if has_flag(flag) and conflicting:
+            RepositoryOutputFormatter.print_error(f"{flag} não pode ser combinado com {', '.join(conflicting)}.")
+            sys.exit(2)
+
+def build_table_view() -> TableView:
+    """Build the terminal table view up front, so a mistyped `--sort` fails before the collection starts."""
+    view = TableView(
+        limit=get_int_option("--limit"),
+        page=get_int_option("--page", 1),
+        sort_by=get_option("--sort"),
+        ascending="--asc" in sys.argv,
+        language=get_option("--language"),
+        min_stars=get_int_option("--min-stars"),
+    )
+    try:
+        view.sort_field()
+    except ValueError as e:
+        RepositoryOutputFormatter.print_error(str(e))
+        sys.exit(2)
+    return view
+
 if __name__ == "__main__":
+    check_flag_conflicts()
+    table_view = build_table_view()
     should_save_json = "--json" in sys.argv
     should_save_csv = "--csv" in sys.argv
+    if "--no-cache" in sys.argv:
+        selected_cache_mode = "refresh"
+    elif "--cache" in sys.argv:
+        selected_cache_mode = "on"
+    else:
+        selected_cache_mode = "off"
     try:
-        main(save_json=should_save_json, save_csv=should_save_csv)
+        main(
+            save_json=should_save_json,
+            save_csv=should_save_csv,
+            shards=get_int_option("--shards"),
+            concurrency=get_int_option("--concurrency", 4),
+            resume="--resume" in sys.argv,
+            refresh="--refresh" in sys.argv,
+            enrich="--enrich" in sys.argv,
+            cache_mode=selected_cache_mode,
+            cache_ttl=get_int_option("--cache-ttl", 3600),
+            stream="--stream" in sys.argv,
+            save_parquet="--parquet" in sys.argv,
+            save_sqlite="--sqlite" in sys.argv,
+            save_jsonl="--jsonl" in sys.argv,
+            jsonl_compression=get_option("--compress"),
+            view=table_view,
+            spans="--spans" in sys.argv,
+        )
     except KeyboardInterrupt:
         print("\n\n⚠️ Interrompido pelo usuário. Saindo...")
+        print("💾 Páginas já coletadas ficam em data/checkpoint.jsonl — use --resume para continuar a coleta.")
         sys.exit(0)
\ No newline at end of file
@@ -0,0 +1,52 @@
+import asyncio
+import os
+from typing import List, Optional, Tuple
+
+
+class GhProcessPool:
+    """
+    Bounded pool of concurrent `gh` processes on the running event loop.
+
+    At most ``width`` processes run at once; a process that does not finish
+    within ``timeout`` seconds is killed so a hung `gh` cannot stall the
+    collection.
+    """
+
+    DEFAULT_WIDTH = 4
+    DEFAULT_TIMEOUT = 60.0
+
+    def __init__(self, width: Optional[int] = None, timeout: Optional[float] = None,
+                 executable: Optional[str] = None):
+        self.width = max(1, width or int(os.getenv("GH_POOL_WIDTH", self.DEFAULT_WIDTH)))
+        self.timeout = timeout or float(os.getenv("GH_TIMEOUT", self.DEFAULT_TIMEOUT))
+        self.executable = executable or os.getenv("GH_EXECUTABLE", "gh")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def run(self, args: List[str]) -> Tuple[int, str, str]:
+        """Run `gh <args>` and return (returncode, stdout, stderr).
+
+        Raises:
+            asyncio.TimeoutError: the process hung and was killed
+        """
+        async with self._get_semaphore():
+            process = await asyncio.create_subprocess_exec(
+                self.executable, *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise
+            return process.returncode, stdout.decode('utf-8'), stderr.decode('utf-8')
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; each asyncio.run gets a fresh one
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.width)
+            self._loop = loop
+        return self._semaphore
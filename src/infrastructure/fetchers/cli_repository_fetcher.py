@@ -1,33 +1,95 @@
+import asyncio
 import subprocess
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from src.infrastructure.cli.gh_process_pool import GhProcessPool
 from src.interfaces.repository_fetcher import BaseRepositoryFetcher
 
 class CliRepositoryFetcher(BaseRepositoryFetcher):
     """
     Implementation that uses the 'gh' GitHub CLI binary
     to perform GraphQL requests.
+
+    Async requests (sharded collection) go through a bounded pool of
+    concurrent `gh` processes instead of one blocking process at a time.
     """
+
+    def __init__(self, pool: Optional[GhProcessPool] = None):
+        super().__init__()
+        self.pool = pool or GhProcessPool()
     
-    def _execute_request(self, query: str, cursor: Optional[str]) -> Dict[str, Any]:
-        
-        cmd = [
-            'gh', 'api', 'graphql',
+    def _execute_request(
+        self, query: str, cursor: Optional[str], variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        cmd = [self.pool.executable] + self._build_args(query, cursor, variables)
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.pool.timeout)
+            return self._parse_result(result.returncode, result.stdout, result.stderr)
+        except subprocess.TimeoutExpired:
+            return {"errors": f"gh timed out after {self.pool.timeout:.0f}s", "data": None}
+        except Exception as e:
+            return {"errors": str(e), "data": None}
+
+    async def _execute_request_async(
+        self, query: str, cursor: Optional[str], variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        try:
+            returncode, stdout, stderr = await self.pool.run(self._build_args(query, cursor, variables))
+            return self._parse_result(returncode, stdout, stderr)
+        except asyncio.TimeoutError:
+            return {"errors": f"gh timed out after {self.pool.timeout:.0f}s", "data": None}
+        except Exception as e:
+            return {"errors": str(e), "data": None}
+
+    @staticmethod
+    def _build_args(query: str, cursor: Optional[str], variables: Optional[Dict[str, Any]]) -> List[str]:
+        args = [
+            'api', 'graphql',
+            '--include', # print status line and headers so rate-limit headers reach the scheduler
             '-f', f'query={query}'
         ]
 
         if cursor:
-            cmd.extend(['-f', f'cursor={cursor}'])
+            args.extend(['-f', f'cursor={cursor}'])
         else:
-            cmd.extend(['-F', 'cursor=null']) # -F forces it to be treated as a real null value
+            args.extend(['-F', 'cursor=null']) # -F forces it to be treated as a real null value
 
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                return {"errors": result.stderr.strip(), "data": None}
+        for name, value in (variables or {}).items():
+            if isinstance(value, list):
+                # gh builds a JSON array from repeated `name[]=` fields
+                for item in value:
+                    args.extend(['-f', f'{name}[]={item}'])
+                continue
+            # -f sends raw strings, -F lets gh convert numbers/booleans
+            flag = '-f' if isinstance(value, str) else '-F'
+            args.extend([flag, f'{name}={value}'])
+        return args
 
-            return json.loads(result.stdout)
-        except Exception as e:
-            return {"errors": str(e), "data": None}
\ No newline at end of file
+    def _parse_result(self, returncode: int, stdout: str, stderr: str) -> Dict[str, Any]:
+        self.metrics.record_bytes(len(stdout.encode("utf-8")))
+        status, headers, body = self._split_included_response(stdout)
+        if status is not None:
+            self.scheduler.observe_headers(status, headers)
+        
+        if returncode != 0:
+            return {"errors": stderr.strip() or body.strip(), "data": None, "status": status}
+
+        return json.loads(body)
+
+    @staticmethod
+    def _split_included_response(stdout: str) -> Tuple[Optional[int], Dict[str, str], str]:
+        """Split `gh api --include` output into status code, headers and body."""
+        lines = stdout.splitlines()
+        if not lines or not lines[0].startswith('HTTP/'):
+            return None, {}, stdout
+
+        status = int(lines[0].split()[1])
+        headers: Dict[str, str] = {}
+        index = 1
+        while index < len(lines) and lines[index].strip():
+            name, _, value = lines[index].partition(':')
+            headers[name.strip()] = value.strip()
+            index += 1
+        return status, headers, "\n".join(lines[index + 1:])
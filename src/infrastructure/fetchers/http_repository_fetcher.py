@@ -1,21 +1,33 @@
 import os
-import requests
+from functools import lru_cache
 from dotenv import load_dotenv
 from pathlib import Path
 from typing import Dict, Any, Optional
+from src.infrastructure.http.http_transport import HttpTransport
 from src.interfaces.repository_fetcher import BaseRepositoryFetcher
 
+
+@lru_cache(maxsize=None)
+def _load_env() -> None:
+    """Load the project .env once per process."""
+    env_path = Path(__file__).resolve().parent.parent.parent.parent / '.env'
+    load_dotenv(dotenv_path=env_path)
+
+
 class HttpRepositoryFetcher(BaseRepositoryFetcher):
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, transport: Optional[HttpTransport] = None):
         super().__init__()
         
-        env_path = Path(__file__).resolve().parent.parent.parent.parent / '.env'
-        load_dotenv(dotenv_path=env_path)
+        _load_env()
         
         self.token = token or os.getenv("GITHUB_TOKEN")
-        self.api_url = "https://api.github.com/graphql"
+        # Overridable for GitHub Enterprise or the local stub used by the benchmarks
+        self.api_url = os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+        self.transport = transport or HttpTransport.shared()
 
-    def _execute_request(self, query: str, cursor: Optional[str]) -> Dict[str, Any]:
+    def _execute_request(
+        self, query: str, cursor: Optional[str], variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         if not self.token:
             return {"errors": "GITHUB_TOKEN não configurado no .env", "data": None}
 
@@ -24,14 +36,21 @@ class HttpRepositoryFetcher(BaseRepositoryFetcher):
             "Content-Type": "application/json"
         }
         
-        variables = {"cursor": cursor} if cursor else {"cursor": None}
+        variables = {"cursor": cursor, **(variables or {})}
         
         try:
-            response = requests.post(
+            response = self.transport.post_json(
                 self.api_url,
-                json={"query": query, "variables": variables},
+                {"query": query, "variables": variables},
                 headers=headers
             )
+            self.scheduler.observe_headers(response.status_code, response.headers)
+            # Wire size when the body was compressed, decoded size otherwise
+            self.metrics.record_bytes(int(response.headers.get("Content-Length") or len(response.content)))
+            if response.status_code >= 500:
+                # GitHub answers oversized queries with HTML 5xx pages
+                return {"errors": f"HTTP {response.status_code}: {response.reason}", "data": None,
+                        "status": response.status_code}
             return response.json()
         except Exception as e:
-            return {"errors": str(e), "data": None}
\ No newline at end of file
+            return {"errors": str(e), "data": None}
@@ -0,0 +1,63 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpTransport:
+    """
+    Persistent HTTP transport shared by the HTTP fetchers.
+
+    Wraps a pooled ``requests.Session`` so every page reuses an open
+    keep-alive connection instead of paying a new TCP+TLS handshake, asks
+    the server for compressed responses and always applies connect/read
+    timeouts.
+    """
+
+    DEFAULT_CONNECT_TIMEOUT = 5.0
+    DEFAULT_READ_TIMEOUT = 60.0
+    DEFAULT_POOL_SIZE = 16
+
+    _shared: Optional["HttpTransport"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+
+        # Retries are handled by the fetch loop, so the adapter never retries on its own
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+
+    @classmethod
+    def shared(cls) -> "HttpTransport":
+        """Process-wide transport reused across fetcher instances.
+
+        Timeouts can be tuned with ``GITHUB_CONNECT_TIMEOUT`` and
+        ``GITHUB_READ_TIMEOUT`` (seconds).
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    connect_timeout=float(os.getenv("GITHUB_CONNECT_TIMEOUT", cls.DEFAULT_CONNECT_TIMEOUT)),
+                    read_timeout=float(os.getenv("GITHUB_READ_TIMEOUT", cls.DEFAULT_READ_TIMEOUT)),
+                )
+            return cls._shared
+
+    def post_json(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        return self.session.post(url, json=payload, headers=headers, timeout=self.timeout)
+
+    def close(self) -> None:
+        self.session.close()
@@ -1,18 +1,37 @@
 from abc import ABC, abstractmethod
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterator, Mapping, Optional, Sequence, Tuple
+import asyncio
 import csv
+import hashlib
 import json
 import time
 
+from src.utils.star_shards import DEFAULT_MIN_STARS, StarShard, build_star_histogram_query
+from src.utils.crawl_dashboard import CrawlDashboard
+from src.utils.crawl_metrics import CrawlMetrics, SpanLog
+from src.utils.checkpoint_journal import CheckpointJournal
 from src.utils.output_formatter import RepositoryOutputFormatter
+from src.utils.collection_files import newest_existing
+from src.utils.parquet_dataset import write_repositories_parquet
+from src.utils.snapshot_store import SnapshotStore
+from src.utils.page_size_controller import PageSizeController
+from src.utils.rate_limit_scheduler import RateLimitScheduler
+from src.utils.jsonl_io import (
+    JsonLinesWriter, compression_variants, iter_json_lines, with_compression_suffix, write_json_array,
+)
+from src.utils.repository_record import RepositoryRecord, collection_timestamp
+from src.utils.response_cache import ResponseCache
+from src.utils.run_telemetry import SPANS_FILE, write_run_telemetry
+from src.utils.seen_index import SeenIndex, StarFrontier
 
 
 class RepositoryFetcher(ABC):
     
     @abstractmethod
-    def fetch(self, pages: int = 10, save_json: bool = False, save_csv: bool = False) -> List[Dict[str, Any]]:
+    def fetch(self, pages: int = 10, save_json: bool = False, save_csv: bool = False,
+              resume: bool = False, save_parquet: bool = False, save_sqlite: bool = False,
+              save_jsonl: bool = False) -> List[RepositoryRecord]:
         """
         Fetch repositories and return standardized data.
         
@@ -20,9 +39,15 @@ class RepositoryFetcher(ABC):
             pages: number of result pages to collect
             save_json: whether to persist data as JSON file
             save_csv: whether to persist data as CSV file
+            save_parquet: whether to persist data as a typed Parquet file
+            save_sqlite: whether to store the run as a snapshot in the SQLite database
+            save_jsonl: whether to stream data to a JSON Lines file (optionally compressed)
+            resume: continue from the checkpoint journal of an interrupted run
 
         Returns:
-            List of repository dictionaries with standardized keys:
+            List of ``RepositoryRecord``s, read like dicts with the standardized
+            keys (``to_dict()`` gives the plain dict):
+            - id: str (GraphQL node ID)
             - name: str
             - url: str
             - stargazerCount: int
@@ -33,150 +58,676 @@ class RepositoryFetcher(ABC):
             - pullRequests_count: int
             - open_issues: int
             - closed_issues: int
+            - mentionable_users_count: int
+            - collectedAt: str (ISO format, one value per run)
         """
         pass
-    
-    def _standardize_repository(self, repo: Dict[str, Any]) -> Dict[str, Any]:
+
+    @abstractmethod
+    def iter_pages(self, pages: int = 10, resume: bool = False) -> Iterator[List[RepositoryRecord]]:
         """
-        Ensure all required fields are present in standardized format.
-        
-        Args:
-            repo: Repository data dictionary
-            
-        Returns:
-            Standardized repository dictionary
+        Yield each collected page as soon as it is parsed, in the same
+        standardized format as ``fetch``, without keeping earlier pages.
         """
-        return {
-            "name": repo.get("name", "Unknown"),
-            "url": repo.get("url", ""),
-            "stargazerCount": repo.get("stargazerCount", 0),
-            "createdAt": repo.get("createdAt", ""),
-            "updatedAt": repo.get("updatedAt", ""),
-            "primaryLanguage": repo.get("primaryLanguage", "Unknown"),
-            "releases_count": repo.get("releases_count", 0),
-            "pullRequests_count": repo.get("pullRequests_count", 0),
-            "open_issues": repo.get("open_issues", 0),
-            "closed_issues": repo.get("closed_issues", 0),
-            "mentionable_users_count": repo.get("mentionable_users_count", 0),
-            "collectedAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-        }
+        pass
+
+    @abstractmethod
+    def refresh(self, pages: int = 10, save_json: bool = False, save_csv: bool = False,
+                save_parquet: bool = False, save_sqlite: bool = False,
+                save_jsonl: bool = False) -> List[RepositoryRecord]:
+        """
+        Re-query the repositories of the previous collection by node ID
+        and look for newcomers near the star cutoff.
+
+        Returns the same standardized dictionaries as ``fetch``. Raises
+        ``RuntimeError`` without saving anything if a batch keeps failing.
+        """
+        pass
+
+    @abstractmethod
+    def write_telemetry(self) -> None:
+        """Write the run's metrics JSON and Prometheus textfile to the data directory."""
+        pass
 
 
 class BaseRepositoryFetcher(RepositoryFetcher):
     """Base class that implements fetching logic common to all methods.
     """
 
+    # Base page size: translates `pages` into a repository target and seeds
+    # the adaptive page-size controller
+    PAGE_SIZE = 10
+
+    # Failures that mean the page was too expensive for the server
+    OVERLOAD_STATUSES = {502, 503, 504}
+    OVERLOAD_MARKERS = ("502", "503", "504", "timeout", "timed out", "something went wrong")
+
+    # The page size does not change what a cursor points at, so it is left
+    # out of cache keys: a warm run replays the cached pages whatever size
+    # the page-size controller picks.
+    CACHE_KEY_IGNORED_VARIABLES = ("first",)
+
+    # A boundary band holds a handful of repositories; this only bounds
+    # the re-query if the ranking moved a lot between two pages
+    GAP_FILL_MAX_PAGES = 3
+
     def __init__(self):
         self.output = RepositoryOutputFormatter()
+        self.scheduler = RateLimitScheduler()
+        self.metrics = CrawlMetrics()
+        self.page_size_controller = PageSizeController(initial=self.PAGE_SIZE)
+        # `nodes(ids:)` accepts at most 100 IDs; start lower and let AIMD find the ceiling
+        self.node_batch_controller = PageSizeController(initial=50, minimum=10, maximum=100, increase=10)
         # Calculate project root by walking up from this file:
         # repository_fetcher.py -> src/interfaces -> src -> <repo_root>
         self.base_path = Path(__file__).resolve().parent.parent.parent
 
         # Paths for query and data directory
-        self.query_file = (
-            self.base_path / "src" / "infrastructure" / "graphql" / "query.graphql"
-        )
+        graphql_dir = self.base_path / "src" / "infrastructure" / "graphql"
+        self.query_file = graphql_dir / "query.graphql"
+        self.refresh_query_file = graphql_dir / "refresh_nodes.graphql"
         self.data_dir = self.base_path / "data"
+        self.checkpoint_file = self.data_dir / "checkpoint.jsonl"
+        self.cache: Optional[ResponseCache] = None
+        self.cache_read = True
+        # A fetcher serves one run: every record it parses shares this timestamp
+        self.collected_at = collection_timestamp()
+        self.jsonl_compression: Optional[str] = None
 
-    def _get_query_content(self) -> str:
-        if not self.query_file.exists():
-            raise FileNotFoundError(f"Arquivo de query não encontrado em: {self.query_file}")
-        return self.query_file.read_text(encoding="utf-8")
+    def enable_span_log(self) -> None:
+        """Log every request as one span in ``data/spans.jsonl``."""
+        self.metrics.span_log = SpanLog(self.data_dir / SPANS_FILE)
+
+    def configure_cache(self, cache: Optional[ResponseCache], read: bool = True) -> None:
+        """Attach a response cache; ``read=False`` bypasses hits but still refreshes entries."""
+        self.cache = cache
+        self.cache_read = read
+
+    def _get_query_content(self, query_file: Optional[Path] = None) -> str:
+        query_file = query_file or self.query_file
+        if not query_file.exists():
+            raise FileNotFoundError(f"Arquivo de query não encontrado em: {query_file}")
+        return query_file.read_text(encoding="utf-8")
+
+    def load_query(self, file_name: str) -> str:
+        """Read another ``.graphql`` file from this fetcher's query directory (e.g. a shared fragment)."""
+        return self._get_query_content(self.query_file.parent / file_name)
 
     @abstractmethod
-    def _execute_request(self, query: str, cursor: Optional[str]) -> Dict[str, Any]:
-        """Each subclass implements its own communication mechanism."""
+    def _execute_request(
+        self, query: str, cursor: Optional[str], variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Each subclass implements its own communication mechanism.
+
+        ``variables`` carries extra GraphQL variables (e.g. ``searchQuery``)
+        sent alongside the pagination cursor.
+        """
         pass
 
-    def fetch(self, pages: int = 10, save_json: bool = False, save_csv: bool = False) -> List[Dict[str, Any]]:
+    async def _execute_request_async(
+        self, query: str, cursor: Optional[str], variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Async counterpart of ``_execute_request``.
+
+        The default runs the blocking implementation in a worker thread so
+        several requests can be in flight on the same event loop.
+        """
+        return await asyncio.to_thread(self._execute_request, query, cursor, variables)
+
+    def _cache_key(self, query: str, cursor: Optional[str], variables: Optional[Dict[str, Any]]) -> str:
+        key_variables = {
+            name: value for name, value in {"cursor": cursor, **(variables or {})}.items()
+            if name not in self.CACHE_KEY_IGNORED_VARIABLES
+        }
+        return ResponseCache.make_key(query, key_variables)
+
+    def _cache_lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.cache is None or not self.cache_read:
+            return None
+        data = self.cache.get(key)
+        if data is not None:
+            self.metrics.record_cache_hit()
+        return data
+
+    def _wait_for_budget(self) -> None:
+        started = time.perf_counter()
+        self.scheduler.wait()
+        self.metrics.record_wait(time.perf_counter() - started)
+
+    def _sleep_before_retry(self, attempt: int) -> None:
+        self.metrics.record_retry()
+        delay = self.scheduler.retry_delay(attempt)
+        self.metrics.record_wait(delay)
+        time.sleep(delay)
+
+    def _cache_store(self, key: str, data: Dict[str, Any]) -> None:
+        if self.cache is not None and not data.get('errors'):
+            self.cache.put(key, data)
+
+    @staticmethod
+    def _is_valid_search_response(data: Optional[Dict[str, Any]]) -> bool:
+        return bool(data) and data.get('data') is not None and data['data'].get('search') is not None
+
+    def _is_overload_failure(self, data: Optional[Dict[str, Any]]) -> bool:
+        if not data:
+            return False
+        if data.get('status') in self.OVERLOAD_STATUSES:
+            return True
+        message = str(data.get('errors') or '').lower()
+        return any(marker in message for marker in self.OVERLOAD_MARKERS)
+
+    def _page_variables(self, variables: Optional[Dict[str, Any]], limit: Optional[int]) -> Dict[str, Any]:
+        """Variables for the next attempt, with `first` taken from the page-size controller."""
+        first = self.page_size_controller.size
+        if limit is not None:
+            first = max(1, min(first, limit))
+        return {**(variables or {}), "first": first}
+
+    @staticmethod
+    def _response_cost(data: Optional[Dict[str, Any]]) -> Optional[float]:
+        rate_limit = ((data or {}).get('data') or {}).get('rateLimit') or {}
+        return rate_limit.get('cost')
+
+    def _record_page_outcome(self, data: Optional[Dict[str, Any]], latency: float, **span: Any) -> None:
+        self.metrics.record_request(latency, self._is_valid_search_response(data), cost=self._response_cost(data),
+                                    status=(data or {}).get('status'), **span)
+        if self._is_valid_search_response(data):
+            self.page_size_controller.on_success(latency)
+        elif self._is_overload_failure(data):
+            self.page_size_controller.on_overload()
+
+    def _request_page(
+        self, query: str, cursor: Optional[str], variables: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Request one search page, paced and retried by the rate-limit scheduler.
+
+        The page size is re-read from the controller on every attempt, so a
+        retry after a 502 or timeout asks for a smaller page. ``limit`` caps
+        the size when only a few repositories are still missing.
+        """
+        cache_key = self._cache_key(query, cursor, variables)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            return cached
+
+        max_retries = 5
+        for attempt in range(1, max_retries + 1):
+            self._wait_for_budget()
+            page_variables = self._page_variables(variables, limit)
+            started = time.perf_counter()
+            data = self._execute_request(query, cursor, page_variables)
+            self._record_page_outcome(data, time.perf_counter() - started, kind="search", attempt=attempt,
+                                      first=page_variables["first"])
+            self.scheduler.observe_response(data)
+            if self._is_valid_search_response(data):
+                self._cache_store(cache_key, data)
+                return data
+
+            self._report_failed_attempt(data, attempt, max_retries)
+            if attempt < max_retries:
+                self._sleep_before_retry(attempt)
+        return None
+
+    async def _request_page_async(
+        self, query: str, cursor: Optional[str], variables: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Async counterpart of ``_request_page``."""
+        cache_key = self._cache_key(query, cursor, variables)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            return cached
+
+        max_retries = 5
+        for attempt in range(1, max_retries + 1):
+            delay = self.scheduler.next_delay()
+            self.metrics.record_wait(delay)
+            await asyncio.sleep(delay)
+            page_variables = self._page_variables(variables, None)
+            started = time.perf_counter()
+            data = await self._execute_request_async(query, cursor, page_variables)
+            self._record_page_outcome(data, time.perf_counter() - started, kind="search", attempt=attempt,
+                                      first=page_variables["first"])
+            self.scheduler.observe_response(data)
+            if self._is_valid_search_response(data):
+                self._cache_store(cache_key, data)
+                return data
+
+            self._report_failed_attempt(data, attempt, max_retries)
+            if attempt < max_retries:
+                self.metrics.record_retry()
+                delay = self.scheduler.retry_delay(attempt)
+                self.metrics.record_wait(delay)
+                await asyncio.sleep(delay)
+        return None
+
+    def _report_failed_attempt(self, data: Optional[Dict[str, Any]], attempt: int, max_retries: int) -> None:
+        if data is None:
+            self.output.print_error(f"Resposta None (tentativa {attempt}/{max_retries})")
+            return
+        err = data.get('errors', 'Resposta malformada ou erro de permissão')
+        self.output.print_error(f"Erro na resposta (tentativa {attempt}/{max_retries}): {err}")
+
+    def _parse_search_page(self, search_results: Dict[str, Any]) -> List[RepositoryRecord]:
+        """Parse every repository node of a search page."""
+        repos: List[RepositoryRecord] = []
+        for edge in search_results.get('edges', []):
+            node = edge.get('node')
+            if not node: continue
+
+            try:
+                repos.append(self._parse_node(node))
+            except Exception as e:
+                self.output.print_error(f"Erro ao padronizar repositório {node.get('name')}: {e}")
+                continue
+        return repos
+
+    def fetch(self, pages: int = 10, save_json: bool = False, save_csv: bool = False,
+              resume: bool = False, save_parquet: bool = False, save_sqlite: bool = False,
+              save_jsonl: bool = False) -> List[RepositoryRecord]:
+        all_repos: List[RepositoryRecord] = []
+        for repos_this_page in self.iter_pages(pages=pages, resume=resume):
+            all_repos.extend(repos_this_page)
+
+        self.save_results(all_repos, save_json=save_json, save_csv=save_csv, save_parquet=save_parquet,
+                          save_sqlite=save_sqlite, save_jsonl=save_jsonl)
+        return all_repos
+
+    def iter_pages(self, pages: int = 10, resume: bool = False) -> Iterator[List[RepositoryRecord]]:
         query_content = self._get_query_content()
-        all_repos: List[Dict[str, Any]] = []
         cursor = None
+        has_next = True
+        target = pages * self.PAGE_SIZE
+        collected = 0
+        page = 0
         
-        self.output.print_fetch_start(self.__class__.__name__, pages)
+        # The journal is only valid for the query that produced it
+        run_key = hashlib.sha256(query_content.encode('utf-8')).hexdigest()
+        journal = CheckpointJournal(self.checkpoint_file)
+        checkpoint = journal.load(run_key) if resume else None
+        seen = SeenIndex()
+        frontier = StarFrontier()
+        if checkpoint is not None:
+            cursor, has_next, page = checkpoint.cursor, checkpoint.has_next, checkpoint.page
+            self.output.print_resume(page, len(checkpoint.repos))
+            resumed = seen.admit(RepositoryRecord.from_dict(repo) for repo in checkpoint.repos[:target])
+            collected = len(resumed)
+            if resumed:
+                frontier.advance(resumed[-self.PAGE_SIZE:])
+                yield resumed
+        else:
+            if resume:
+                self.output.print_error("Nenhum checkpoint compatível encontrado. Iniciando nova coleta.")
+            journal.start(run_key)
 
-        for page in range(1, pages + 1):
-            max_retries = 5
-            data = None
-            for attempt in range(1, max_retries + 1):
-                data = self._execute_request(query_content, cursor)
+        self.output.print_fetch_start(self.__class__.__name__, target, self.page_size_controller.size)
 
+        with CrawlDashboard(self.metrics, self.scheduler, target, resumed=collected) as dashboard:
+            while has_next and collected < target:
+                page += 1
+                page_started = time.perf_counter()
+                requests_before = self.metrics.requests
+                data = self._request_page(query_content, cursor, limit=target - collected)
                 if data is None:
-                    self.output.print_error(f"Resposta None (tentativa {attempt}/{max_retries})")
-                    if attempt < max_retries:
-                        time.sleep(2 ** attempt)
-                        continue
-                    break
-
-                if 'data' not in data or data.get('data') is None or data['data'].get('search') is None:
-                    err = data.get('errors', 'Resposta malformada ou erro de permissão')
-                    self.output.print_error(f"Erro na resposta (tentativa {attempt}/{max_retries}): {err}")
-                    if attempt < max_retries:
-                        time.sleep(2 ** attempt)
-                        continue
-                    break
-                # Success
+                    self.output.print_error("Falha após todas as tentativas. Encerrando coleta.")
+                    return
+
+                search_results = data['data']['search']
+                with self.metrics.stage("parse"):
+                    parsed = self._parse_search_page(search_results)
+                fresh = seen.admit(parsed)
+                gap = frontier.gap(parsed, len(parsed) - len(fresh))
+                if gap is not None:
+                    recovered = self._fill_gap(query_content, gap, seen)
+                    self.output.print_gap_fill(page, len(parsed) - len(fresh), gap.label, len(recovered))
+                    fresh = sorted(recovered + fresh, key=lambda repo: repo['stargazerCount'], reverse=True)
+                frontier.advance(parsed)
+
+                # Cached pages keep the size they were fetched with and may overshoot
+                repos_this_page = fresh[:target - collected]
+                collected += len(repos_this_page)
+                self.metrics.add_repos(len(repos_this_page))
+                self.metrics.record_page(page, len(repos_this_page), time.perf_counter() - page_started,
+                                         self.metrics.requests - requests_before, self._response_cost(data))
+                dashboard.update(page)
+
+                page_info = search_results.get('pageInfo', {})
+                has_next = bool(page_info.get('hasNextPage'))
+                cursor = page_info.get('endCursor')
+                journal.append_page(page, cursor, has_next, repos_this_page)
+                yield repos_this_page
+
+        journal.clear()
+
+    def _fill_gap(self, query: str, gap: StarShard, seen: SeenIndex) -> List[RepositoryRecord]:
+        """Walk the narrow ``stars:A..B`` band of a page boundary and keep the repositories not seen yet."""
+        variables = {"searchQuery": gap.search_query}
+        recovered: List[RepositoryRecord] = []
+        cursor = None
+        for _ in range(self.GAP_FILL_MAX_PAGES):
+            data = self._request_page(query, cursor, variables)
+            if data is None:
+                self.output.print_error(f"Falha ao reconsultar a faixa stars:{gap.label}.")
+                return recovered
+            search_results = data['data']['search']
+            recovered.extend(seen.admit(self._parse_search_page(search_results)))
+            page_info = search_results.get('pageInfo', {})
+            if not page_info.get('hasNextPage'):
+                return recovered
+            cursor = page_info.get('endCursor')
+        self.output.print_gap_fill_truncated(gap.label, self.GAP_FILL_MAX_PAGES)
+        return recovered
+
+    def refresh(self, pages: int = 10, save_json: bool = False, save_csv: bool = False,
+                save_parquet: bool = False, save_sqlite: bool = False, save_jsonl: bool = False,
+                newcomer_window: int = 50) -> List[RepositoryRecord]:
+        """Refresh the previous collection by node ID instead of re-running the full crawl.
+
+        Known repositories (from ``data/repos.json``, ``repos.csv`` or ``repos.jsonl``)
+        are re-queried in batches of up to 100 IDs with ``nodes(ids:)``.
+        Newcomers are looked up with a short search that starts at the star
+        count of the last ``newcomer_window`` ranks, which is where
+        repositories enter the top list.
+
+        Raises ``RuntimeError`` when a batch still fails after all retries;
+        nothing is saved in that case, so the previous snapshot stays intact.
+        """
+        target = pages * self.PAGE_SIZE
+        known_ids = self.load_known_ids()
+        if not known_ids:
+            self.output.print_error("Nenhuma coleta anterior com IDs encontrada em data/. Executando coleta completa.")
+            return self.fetch(pages=pages, save_json=save_json, save_csv=save_csv, save_parquet=save_parquet,
+                              save_sqlite=save_sqlite, save_jsonl=save_jsonl)
+
+        self.output.print_refresh_start(len(known_ids))
+        refreshed = self._refresh_known(known_ids)
+        refreshed.sort(key=lambda repo: repo['stargazerCount'], reverse=True)
+        refreshed = refreshed[:target]
+
+        # Walk downwards from the band just above the cutoff: this catches
+        # newcomers and also fills slots left by deleted repositories
+        band_top = refreshed[max(len(refreshed) - newcomer_window, 0)]['stargazerCount'] if refreshed else None
+        newcomers = self._search_newcomers(band_top, refreshed, known_ids, target)
+
+        by_id = {repo['id']: repo for repo in refreshed + newcomers}
+        repos = sorted(by_id.values(), key=lambda repo: repo['stargazerCount'], reverse=True)[:target]
+        known = set(known_ids)
+        added = sum(1 for repo in repos if repo['id'] not in known)
+        self.output.print_refresh_summary(len(refreshed), added, len(repos))
+
+        self.save_results(repos, save_json=save_json, save_csv=save_csv, save_parquet=save_parquet,
+                          save_sqlite=save_sqlite, save_jsonl=save_jsonl)
+        return repos
+
+    def load_known_ids(self) -> List[str]:
+        """Node IDs of the most recently saved collection, in their saved order.
+
+        The same rule as the analysis scripts: a stale ``repos.json`` never
+        beats a newer CSV or JSON Lines file, and among files of the same
+        collection the JSON array is read first.
+        """
+        saved_file = newest_existing([
+            self.data_dir / 'repos.json',
+            self.data_dir / 'repos.csv',
+            *compression_variants(self.data_dir / 'repos.jsonl'),
+        ])
+        if saved_file is None:
+            return []
+        if saved_file.suffix == '.json':
+            repos = json.loads(saved_file.read_text(encoding='utf-8'))
+        elif saved_file.suffix == '.csv':
+            with saved_file.open(newline='', encoding='utf-8') as f:
+                repos = list(csv.DictReader(f))
+        else:
+            repos = iter_json_lines(saved_file)
+        return [repo['id'] for repo in repos if repo.get('id')]
+
+    def _refresh_known(self, ids: List[str]) -> List[RepositoryRecord]:
+        query_content = self._get_query_content(self.refresh_query_file)
+        repos: List[RepositoryRecord] = []
+        pending = list(ids)
+
+        while pending:
+            result = self._request_nodes(query_content, pending)
+            if result is None:
+                # A partial refresh would overwrite the saved snapshot with a truncated dataset
+                raise RuntimeError(
+                    f"Falha após todas as tentativas com {len(pending)} de {len(ids)} repositórios pendentes; "
+                    "a coleta anterior em data/ foi mantida"
+                )
+
+            nodes, batch_size = result
+            pending = pending[batch_size:]
+            # Deleted or inaccessible repositories come back as null
+            with self.metrics.stage("parse"):
+                repos.extend(self._parse_node(node) for node in nodes if node)
+            self.output.print_refresh_progress(len(ids) - len(pending), len(ids))
+        return repos
+
+    def _request_nodes(self, query: str, ids: List[str]) -> Optional[Tuple[List[Optional[Dict[str, Any]]], int]]:
+        """Request the next batch of ``ids``; returns the nodes and how many IDs were consumed.
+
+        The batch size is re-read from ``node_batch_controller`` on every
+        attempt, so a retry after a 502 or timeout asks for fewer nodes.
+        """
+        max_retries = 5
+        for attempt in range(1, max_retries + 1):
+            batch = ids[:self.node_batch_controller.size]
+            cache_key = self._cache_key(query, None, {"ids": batch})
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                return cached['data']['nodes'], len(batch)
+
+            self._wait_for_budget()
+            started = time.perf_counter()
+            data = self._execute_request(query, None, {"ids": batch})
+            latency = time.perf_counter() - started
+            self.scheduler.observe_response(data)
+
+            nodes = ((data or {}).get('data') or {}).get('nodes')
+            self.metrics.record_request(latency, nodes is not None, kind="nodes", attempt=attempt, ids=len(batch),
+                                        cost=self._response_cost(data), status=(data or {}).get('status'))
+            if nodes is not None:
+                self._cache_store(cache_key, data)
+                self.node_batch_controller.on_success(latency)
+                return nodes, len(batch)
+            if self._is_overload_failure(data):
+                self.node_batch_controller.on_overload()
+
+            self._report_failed_attempt(data, attempt, max_retries)
+            if attempt < max_retries:
+                self._sleep_before_retry(attempt)
+        return None
+
+    def _search_newcomers(self, band_top: Optional[int], refreshed: List[RepositoryRecord],
+                          known_ids: List[str], target: int) -> List[RepositoryRecord]:
+        """Search downwards from ``band_top`` stars until the top ``target`` is settled."""
+        query_content = self._get_query_content()
+        shard = StarShard(DEFAULT_MIN_STARS, band_top)
+        variables = {"searchQuery": shard.search_query}
+        known = set(known_ids)
+        refreshed_stars = [repo['stargazerCount'] for repo in refreshed]
+        newcomers: List[RepositoryRecord] = []
+        cursor = None
+
+        while True:
+            data = self._request_page(query_content, cursor, variables)
+            if data is None:
+                self.output.print_error("Falha ao buscar novos repositórios próximos ao corte.")
+                break
+
+            search_results = data['data']['search']
+            page_repos = self._parse_search_page(search_results)
+            newcomers.extend(repo for repo in page_repos if repo['id'] not in known)
+
+            page_info = search_results.get('pageInfo', {})
+            if not page_repos or not page_info.get('hasNextPage'):
                 break
 
-            if data is None or 'data' not in data or data.get('data') is None or data['data'].get('search') is None:
-                self.output.print_error("Falha após todas as tentativas. Encerrando coleta.")
+            # Everything at or above this page's lowest star count is now known
+            lowest = page_repos[-1]['stargazerCount']
+            settled = sum(1 for stars in refreshed_stars if stars >= lowest) + len(newcomers)
+            if settled >= target:
                 break
+            cursor = page_info.get('endCursor')
+        return newcomers
+
+    async def fetch_shard(self, shard: StarShard, semaphore: asyncio.Semaphore) -> List[RepositoryRecord]:
+        """Walk the cursor of a single star-range shard until it is exhausted.
+
+        ``semaphore`` is shared by all shards and bounds how many requests
+        are in flight at once. Raises ``RuntimeError`` when a page still
+        fails after all retries.
+        """
+        query_content = self._get_query_content()
+        variables = {"searchQuery": shard.search_query}
+        shard_repos: List[RepositoryRecord] = []
+        cursor = None
+        page = 0
+
+        while True:
+            page += 1
+            page_started = time.perf_counter()
+            requests_before = self.metrics.requests
+            async with semaphore:
+                data = await self._request_page_async(query_content, cursor, variables)
+            if data is None:
+                # A shard cut short would leave a hole in the middle of the merged ranking
+                raise RuntimeError(f"Falha após todas as tentativas no shard {shard.label}")
 
             search_results = data['data']['search']
-            repos_this_page = []
-
-            for edge in search_results.get('edges', []):
-                node = edge.get('node')
-                if not node: continue
-                
-                repo_data = self._parse_node(node)
-                
-                try:
-                    standardized = self._standardize_repository(repo_data)
-                    repos_this_page.append(standardized)
-                    all_repos.append(standardized)
-                except Exception as e:
-                    self.output.print_error(f"Erro ao padronizar repositório {repo_data.get('name')}: {e}")
-                    continue
-
-            self.output.print_page_progress(page, pages, len(repos_this_page), len(all_repos))
+            with self.metrics.stage("parse"):
+                repos_this_page = self._parse_search_page(search_results)
+            shard_repos.extend(repos_this_page)
+            self.metrics.add_repos(len(repos_this_page))
+            # Shards run concurrently, so the request count is approximate here
+            self.metrics.record_page(page, len(repos_this_page), time.perf_counter() - page_started,
+                                     self.metrics.requests - requests_before, self._response_cost(data),
+                                     shard=shard.label)
+
+            self.output.print_shard_progress(shard.label, page, len(repos_this_page), len(shard_repos))
 
             page_info = search_results.get('pageInfo', {})
             if not page_info.get('hasNextPage'):
                 break
-            
+
             cursor = page_info.get('endCursor')
-            time.sleep(0.5)
 
-        if save_json:
-            self._save_json(all_repos)
-        if save_csv:
-            self._save_csv(all_repos)
-        return all_repos
+        return shard_repos
+
+    async def count_repositories_by_stars(self, thresholds: List[int]) -> Dict[int, int]:
+        """Return how many repositories have at least each star threshold.
+
+        All thresholds are answered by a single aliased ``search`` request.
+        """
+        query = build_star_histogram_query(thresholds)
+        cache_key = self._cache_key(query, None, None)
+        data = self._cache_lookup(cache_key)
+        if data is None:
+            await asyncio.sleep(self.scheduler.next_delay())
+            data = await self._execute_request_async(query, None)
+            self.scheduler.observe_response(data)
+            if not data or data.get('data') is None:
+                err = (data or {}).get('errors', 'Resposta malformada ou erro de permissão')
+                raise RuntimeError(f"Falha ao consultar distribuição de estrelas: {err}")
+            self._cache_store(cache_key, data)
 
-    def _parse_node(self, node: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse node handling possible nulls from GraphQL."""
         return {
-            "name": node.get('name', 'N/A'),
-            "url": node.get('url', ''),
-            "stargazerCount": node.get('stargazerCount', 0),
-            "createdAt": node.get('createdAt', ''),
-            "updatedAt": node.get('updatedAt', ''),
-            "primaryLanguage": (node.get('primaryLanguage') or {}).get('name', 'Unknown'),
-            "releases_count": (node.get('releases') or {}).get('totalCount', 0),
-            "pullRequests_count": (node.get('pullRequests') or {}).get('totalCount', 0),
-            "open_issues": (node.get('openIssues') or {}).get('totalCount', 0),
-            "closed_issues": (node.get('closedIssues') or {}).get('totalCount', 0),
-            "mentionable_users_count": (node.get('mentionableUsers') or {}).get('totalCount', 0),
+            threshold: (data['data'].get(f"s{i}") or {}).get('repositoryCount', 0)
+            for i, threshold in enumerate(thresholds)
         }
 
-    def _save_json(self, repos: List[Dict[str, Any]]) -> None:
+    def execute_query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Send one arbitrary GraphQL document, paced by the rate-limit scheduler.
+
+        Returns the raw response; retries are left to the caller.
+        """
+        cache_key = self._cache_key(query, None, variables)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            return cached
+
+        self._wait_for_budget()
+        started = time.perf_counter()
+        data = self._execute_request(query, None, variables)
+        self.metrics.record_request(time.perf_counter() - started, bool(data and data.get('data') is not None),
+                                    kind="query", cost=self._response_cost(data), status=(data or {}).get('status'))
+        self.scheduler.observe_response(data)
+        if data and data.get('data') is not None:
+            self._cache_store(cache_key, data)
+        return data
+
+    def execute_batch(self, items: Sequence[Any], build_query: Callable[[Sequence[Any]], str],
+                      controller: PageSizeController) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Send a document covering the first ``controller.size`` of ``items``, retried like the search pages.
+
+        Returns the response's ``data`` and how many items it covered, or
+        ``None`` after the last attempt. A 502 or timeout shrinks the batch
+        through ``controller`` before the next attempt.
+        """
+        max_retries = 5
+        for attempt in range(1, max_retries + 1):
+            batch = items[:controller.size]
+            started = time.perf_counter()
+            response = self.execute_query(build_query(batch))
+            latency = time.perf_counter() - started
+
+            data = (response or {}).get('data')
+            if data is not None:
+                controller.on_success(latency)
+                return data, len(batch)
+            if self._is_overload_failure(response):
+                controller.on_overload()
+
+            self._report_failed_attempt(response, attempt, max_retries)
+            if attempt < max_retries:
+                self._sleep_before_retry(attempt)
+        return None
+
+    def save_results(self, repos: List[Mapping[str, Any]], save_json: bool = False, save_csv: bool = False,
+                     save_parquet: bool = False, save_sqlite: bool = False, save_jsonl: bool = False) -> None:
+        if save_json:
+            with self.metrics.stage("save_json"):
+                self._save_json(repos)
+        if save_csv:
+            with self.metrics.stage("save_csv"):
+                self._save_csv(repos)
+        if save_parquet:
+            with self.metrics.stage("save_parquet"):
+                self._save_parquet(repos)
+        if save_sqlite:
+            with self.metrics.stage("save_sqlite"):
+                self._save_sqlite(repos)
+        if save_jsonl:
+            with self.metrics.stage("save_jsonl"):
+                self._save_jsonl(repos)
+
+    def write_telemetry(self) -> None:
+        if self.metrics.span_log is not None:
+            self.metrics.span_log.close()
+            self.output.print_save_success(str(self.metrics.span_log.path))
+            self.metrics.span_log = None
+        json_path, prometheus_path = write_run_telemetry(self.metrics, self.data_dir, self.__class__.__name__,
+                                                         self.collected_at)
+        self.output.print_save_success(f"{json_path} / {prometheus_path.name}")
+
+    def _parse_node(self, node: Dict[str, Any]) -> RepositoryRecord:
+        return RepositoryRecord.from_node(node, self.collected_at)
+
+    def _save_json(self, repos: List[Mapping[str, Any]]) -> None:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         output_file = self.data_dir / 'repos.json'
-        output_file.write_text(json.dumps(repos, indent=2), encoding='utf-8')
+        write_json_array(repos, output_file)
+        self.output.print_save_success(str(output_file))
+
+    def _save_jsonl(self, repos: List[Mapping[str, Any]]) -> None:
+        output_file = with_compression_suffix(self.data_dir / 'repos.jsonl', self.jsonl_compression)
+        with JsonLinesWriter(output_file) as writer:
+            for start in range(0, len(repos), 1000):
+                writer.write_many(repos[start:start + 1000])
         self.output.print_save_success(str(output_file))
 
-    def _save_csv(self, repos: List[Dict[str, Any]]) -> None:
+    def _save_csv(self, repos: List[Mapping[str, Any]]) -> None:
         if not repos:
             return
         self.data_dir.mkdir(parents=True, exist_ok=True)
@@ -187,3 +738,17 @@ class BaseRepositoryFetcher(RepositoryFetcher):
             writer.writeheader()
             writer.writerows(repos)
         self.output.print_save_success(str(output_file))
+
+    def _save_parquet(self, repos: List[Mapping[str, Any]]) -> None:
+        if not repos:
+            return
+        output_file = self.data_dir / 'repos.parquet'
+        write_repositories_parquet(repos, output_file)
+        self.output.print_save_success(str(output_file))
+
+    def _save_sqlite(self, repos: List[Mapping[str, Any]]) -> None:
+        if not repos:
+            return
+        output_file = self.data_dir / 'repos.db'
+        collected_at = SnapshotStore(output_file).save_snapshot(repos)
+        self.output.print_save_success(f"{output_file} (snapshot {collected_at})")
@@ -1,7 +1,13 @@
-from typing import Literal, Dict, Type
+import asyncio
+from typing import Any, Literal, Dict, List, Optional, Type
 from ..interfaces.repository_fetcher import RepositoryFetcher
 from ..infrastructure.fetchers.http_repository_fetcher import HttpRepositoryFetcher
 from ..infrastructure.fetchers.cli_repository_fetcher import CliRepositoryFetcher
+from ..utils.jsonl_io import check_compression
+from ..utils.repository_record import RepositoryRecord
+from ..utils.response_cache import ResponseCache
+from ..utils.seen_index import SeenIndex
+from ..utils.star_shards import plan_star_shards, star_thresholds
 
 class RepositoryFetcherFactory:
     _FETCHERS: Dict[str, Type[RepositoryFetcher]] = {
@@ -10,7 +16,8 @@ class RepositoryFetcherFactory:
     }
 
     @classmethod
-    def create(cls, method: str) -> RepositoryFetcher:
+    def create(cls, method: str, cache: Optional[ResponseCache] = None, cache_read: bool = True,
+               jsonl_compression: Optional[str] = None, spans: bool = False) -> RepositoryFetcher:
         fetcher_class = cls._FETCHERS.get(method.lower())
         
         if not fetcher_class:
@@ -18,8 +25,53 @@ class RepositoryFetcherFactory:
             raise ValueError(f"Método '{method}' não suportado. Escolha entre: {available}")
         
         # Factory could resolve environment tokens or check dependencies before instantiation
-        return fetcher_class()
+        check_compression(jsonl_compression)
+        fetcher = fetcher_class()
+        if cache is not None:
+            fetcher.configure_cache(cache, read=cache_read)
+        fetcher.jsonl_compression = jsonl_compression
+        if spans:
+            fetcher.enable_span_log()
+        return fetcher
+
+    @classmethod
+    async def fetch_sharded(cls, method: str, pages: int = 10, shards: int = 4, concurrency: int = 4,
+                            save_json: bool = False, save_csv: bool = False, save_parquet: bool = False,
+                            save_sqlite: bool = False, save_jsonl: bool = False,
+                            cache: Optional[ResponseCache] = None, cache_read: bool = True,
+                            jsonl_compression: Optional[str] = None,
+                            spans: bool = False) -> List[RepositoryRecord]:
+        """Collect the same top repositories as ``fetch`` using concurrent star-range shards.
+
+        The star distribution is sampled with one aliased request, split into
+        ``shards`` disjoint ``stars:A..B`` ranges, and each range's cursor is
+        walked on the same event loop with at most ``concurrency`` requests
+        in flight. Results are merged back in descending star order.
+        """
+        fetcher = cls.create(method, cache=cache, cache_read=cache_read, jsonl_compression=jsonl_compression,
+                             spans=spans)
+        target = pages * fetcher.PAGE_SIZE
+
+        try:
+            counts = await fetcher.count_repositories_by_stars(star_thresholds())
+            plan = plan_star_shards(counts, target, shards)
+            fetcher.output.print_shard_plan([shard.label for shard in plan], concurrency, target)
+
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+            results = await asyncio.gather(*(fetcher.fetch_shard(shard, semaphore) for shard in plan))
+
+            # A repository whose stars cross a shard edge mid-walk can be returned by both shards
+            repos = SeenIndex().admit(repo for shard_repos in results for repo in shard_repos)
+            # Stars can move while shards are walked; re-sort before trimming
+            repos.sort(key=lambda repo: repo['stargazerCount'], reverse=True)
+            repos = repos[:target]
+
+            fetcher.save_results(repos, save_json=save_json, save_csv=save_csv, save_parquet=save_parquet,
+                                 save_sqlite=save_sqlite, save_jsonl=save_jsonl)
+            return repos
+        finally:
+            fetcher.write_telemetry()
 
     @classmethod
     def get_available_methods(cls):
-        return list(cls._FETCHERS.keys())
\ No newline at end of file
+        return list(cls._FETCHERS.keys())
@@ -0,0 +1,124 @@
+import json
+import math
+import statistics
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from ..interfaces.repository_fetcher import BaseRepositoryFetcher
+from ..utils.page_size_controller import PageSizeController
+from ..utils.repository_record import as_dict
+
+
+class RepositoryEnricher:
+    """
+    Adds per-repository details that do not fit in the search query.
+
+    Dozens of ``repository(owner:, name:)`` lookups are packed into one
+    GraphQL document with ``r<i>`` aliases. The batch size is bounded by the
+    query cost each request may spend (estimated up front and recalibrated
+    from the ``rateLimit.cost`` GitHub reports) and shrunk on 502/timeouts.
+
+    Added keys:
+        - last_release_at: str (ISO format, empty when there are no releases)
+        - release_interval_days: float (median gap between the latest releases)
+        - default_branch_commits: int
+    """
+
+    # Connections requested per aliased repository (releases, history)
+    CONNECTIONS_PER_REPO = 2
+    # GitHub refuses `first` values above 100 and documents with too many aliases time out
+    MAX_BATCH = 100
+
+    def __init__(self, fetcher: BaseRepositoryFetcher, max_cost: int = 5):
+        self.fetcher = fetcher
+        self.output = fetcher.output
+        self.max_cost = max_cost
+        self.fragment = fetcher.load_query("enrichment_fields.graphql")
+        self.cost_per_repo = self.CONNECTIONS_PER_REPO / 100
+        self.batch_controller = PageSizeController(
+            initial=25, minimum=5, maximum=self._cost_bound(), increase=10
+        )
+
+    def enrich(self, repos: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        # The added keys do not fit the fixed record layout
+        repos = [as_dict(repo) for repo in repos]
+        pending = [repo for repo in repos if self._owner_and_name(repo)]
+        total = len(pending)
+        for repo in repos:
+            repo.update({"last_release_at": "", "release_interval_days": None, "default_branch_commits": 0})
+
+        self.output.print_enrichment_start(total)
+        requests_made = 0
+        while pending:
+            result = self._request_batch(pending)
+            if result is None:
+                self.output.print_error("Falha após todas as tentativas. Enriquecimento interrompido.")
+                break
+
+            data, batch_size = result
+            requests_made += 1
+            for index, repo in enumerate(pending[:batch_size]):
+                self._apply(repo, data.get(f"r{index}"))
+            pending = pending[batch_size:]
+            self.output.print_enrichment_progress(total - len(pending), total)
+
+        self.output.print_enrichment_summary(total - len(pending), requests_made)
+        return repos
+
+    def build_query(self, repos: List[Dict[str, Any]]) -> str:
+        lines = ["query {", "  rateLimit { cost limit remaining resetAt }"]
+        for index, repo in enumerate(repos):
+            owner, name = self._owner_and_name(repo)
+            # JSON string escaping is valid GraphQL string syntax
+            lines.append(f"  r{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ ...EnrichmentFields }}")
+        lines.append("}")
+        return "\n".join(lines) + "\n" + self.fragment
+
+    def _request_batch(self, pending: List[Dict[str, Any]]) -> Optional[Tuple[Dict[str, Any], int]]:
+        # Unknown/renamed repositories only null their alias; the rest of the batch is valid
+        result = self.fetcher.execute_batch(pending, self.build_query, self.batch_controller)
+        if result is not None:
+            data, batch_size = result
+            self._recalibrate(data.get("rateLimit"), batch_size)
+        return result
+
+    def _cost_bound(self) -> int:
+        return max(1, min(self.MAX_BATCH, math.floor(self.max_cost / self.cost_per_repo)))
+
+    def _recalibrate(self, rate_limit: Optional[Dict[str, Any]], batch_size: int) -> None:
+        """Replace the estimated per-repo cost with the one GitHub actually charged."""
+        cost = (rate_limit or {}).get("cost")
+        # Costs are rounded up to at least 1 point, so tiny batches say nothing
+        if not cost or cost <= 1:
+            return
+        self.cost_per_repo = cost / batch_size
+        self.batch_controller.set_maximum(self._cost_bound())
+
+    def _apply(self, repo: Dict[str, Any], node: Optional[Dict[str, Any]]) -> None:
+        if not node:
+            return
+
+        release_dates = [
+            datetime.fromisoformat(release["createdAt"].replace("Z", "+00:00"))
+            for release in (node.get("releases") or {}).get("nodes") or []
+            if release and release.get("createdAt")
+        ]
+        release_dates.sort(reverse=True)
+        if release_dates:
+            repo["last_release_at"] = release_dates[0].strftime("%Y-%m-%dT%H:%M:%SZ")
+        if len(release_dates) >= 2:
+            gaps = [
+                (newer - older).total_seconds() / 86400
+                for newer, older in zip(release_dates, release_dates[1:])
+            ]
+            repo["release_interval_days"] = round(statistics.median(gaps), 2)
+
+        target = ((node.get("defaultBranchRef") or {}).get("target") or {})
+        repo["default_branch_commits"] = (target.get("history") or {}).get("totalCount", 0)
+
+    @staticmethod
+    def _owner_and_name(repo: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        parts = repo.get("url", "").rstrip("/").split("/")
+        if len(parts) < 2 or not parts[-1] or not parts[-2] or "github.com" in parts[-2]:
+            return None
+        return parts[-2], parts[-1]
@@ -1,20 +1,66 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 from ..interfaces.repository_fetcher import RepositoryFetcher
-from ..utils.output_formatter import RepositoryOutputFormatter
+from .repository_enricher import RepositoryEnricher
+from ..utils.output_formatter import RepositoryOutputFormatter, TableView
+from ..utils.repository_sinks import BackgroundWriter, RepositorySink
 
 class RepositoryManager:
     def __init__(self, fetcher: RepositoryFetcher):
         self.fetcher = fetcher
         self.output = RepositoryOutputFormatter()
     
-    def fetch_repositories(self, pages: int = 10, save_json: bool = False, save_csv: bool = False) -> List[Dict[str, Any]]:
-        return self.fetcher.fetch(pages=pages, save_json=save_json, save_csv=save_csv)
+    def fetch_repositories(self, pages: int = 10, save_json: bool = False, save_csv: bool = False,
+                           resume: bool = False, enrich: bool = False,
+                           save_parquet: bool = False, save_sqlite: bool = False,
+                           save_jsonl: bool = False) -> List[Dict[str, Any]]:
+        try:
+            if not enrich:
+                return self.fetcher.fetch(pages=pages, save_json=save_json, save_csv=save_csv, resume=resume,
+                                          save_parquet=save_parquet, save_sqlite=save_sqlite,
+                                          save_jsonl=save_jsonl)
+
+            # Enrichment runs before saving so the extra columns reach the files
+            repos = self.fetcher.fetch(pages=pages, resume=resume)
+            repos = RepositoryEnricher(self.fetcher).enrich(repos)
+            self.fetcher.save_results(repos, save_json=save_json, save_csv=save_csv, save_parquet=save_parquet,
+                                      save_sqlite=save_sqlite, save_jsonl=save_jsonl)
+            return repos
+        finally:
+            # Interrupted runs are written too: their timings are the ones worth a look
+            self.fetcher.write_telemetry()
+    
+    def stream_repositories(self, sinks: Sequence[RepositorySink], pages: int = 10, resume: bool = False) -> int:
+        """Write pages to ``sinks`` as they arrive without materializing the full list.
+
+        Returns the number of repositories written.
+        """
+        total = 0
+        try:
+            with BackgroundWriter(sinks) as writer:
+                for repos_this_page in self.fetcher.iter_pages(pages=pages, resume=resume):
+                    writer.write(repos_this_page)
+                    total += len(repos_this_page)
+        finally:
+            self.fetcher.write_telemetry()
+
+        for sink in sinks:
+            self.output.print_save_success(str(sink.path))
+        return total
+
+    def refresh_repositories(self, pages: int = 10, save_json: bool = False, save_csv: bool = False,
+                             save_parquet: bool = False, save_sqlite: bool = False,
+                             save_jsonl: bool = False) -> List[Dict[str, Any]]:
+        try:
+            return self.fetcher.refresh(pages=pages, save_json=save_json, save_csv=save_csv,
+                                        save_parquet=save_parquet, save_sqlite=save_sqlite, save_jsonl=save_jsonl)
+        finally:
+            self.fetcher.write_telemetry()
     
-    def display_results(self, repos: List[Dict[str, Any]]) -> None:
+    def display_results(self, repos: List[Dict[str, Any]], view: Optional[TableView] = None) -> None:
         if not repos:
             self.output.print_no_repos()
             return
         
-        self.output.print_repositories(repos)
+        self.output.print_repositories(repos, view)
         self.output.print_summary(repos)
         self.output.print_completion(len(repos))
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""Append-only journal that lets an interrupted collection resume."""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+import json
+import os
+
+from src.utils.repository_record import as_dict
+
+
+@dataclass
+class Checkpoint:
+    """State rebuilt from the pages committed to the journal."""
+    page: int = 0
+    cursor: Optional[str] = None
+    has_next: bool = True
+    repos: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class CheckpointJournal:
+    """
+    JSON Lines journal with one header line followed by one line per page.
+
+    Every page line carries the page's repositories and the ``endCursor``
+    to continue from, and is flushed and fsync'ed before the next request,
+    so a crash loses at most the page that was in flight. A torn last line
+    (crash mid-write) is ignored on load.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def start(self, run_key: str) -> None:
+        """Begin a new journal, discarding any previous one."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "type": "header",
+            "run_key": run_key,
+            "startedAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        with self.path.open('w', encoding='utf-8') as f:
+            self._write_line(f, header)
+
+    def append_page(self, page: int, cursor: Optional[str], has_next: bool, repos: List[Mapping[str, Any]]) -> None:
+        entry = {"type": "page", "page": page, "cursor": cursor, "has_next": has_next,
+                 "repos": [as_dict(repo) for repo in repos]}
+        with self.path.open('a', encoding='utf-8') as f:
+            self._write_line(f, entry)
+
+    def load(self, run_key: str) -> Optional[Checkpoint]:
+        """Rebuild the checkpoint, or ``None`` if there is no journal for ``run_key``."""
+        if not self.path.exists():
+            return None
+
+        checkpoint = Checkpoint()
+        with self.path.open(encoding='utf-8') as f:
+            for index, line in enumerate(f):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # torn write from a crash: everything before it is intact
+
+                if index == 0:
+                    if entry.get("type") != "header" or entry.get("run_key") != run_key:
+                        return None
+                    continue
+
+                checkpoint.page = entry["page"]
+                checkpoint.cursor = entry["cursor"]
+                checkpoint.has_next = entry["has_next"]
+                checkpoint.repos.extend(entry["repos"])
+        return checkpoint
+
+    def clear(self) -> None:
+        if self.path.exists():
+            self.path.unlink()
+
+    @staticmethod
+    def _write_line(f, entry: Dict[str, Any]) -> None:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
@@ -0,0 +1,21 @@
+"""Choosing which of the files saved by past collections to read."""
+from pathlib import Path
+from typing import Iterable, Optional
+
+# The formats one collection saves are all written within this many seconds
+SAME_COLLECTION_SECONDS = 60.0
+
+
+def newest_existing(candidates: Iterable[Path], tolerance: float = SAME_COLLECTION_SECONDS) -> Optional[Path]:
+    """Most recently saved of ``candidates``, or ``None`` when none exists.
+
+    ``candidates`` come in order of preference. Files written by the same
+    collection as the newest one (up to ``tolerance`` seconds older) count as
+    equally new, so the preferred format wins over the ones saved after it in
+    that run, while any older collection is ignored.
+    """
+    existing = [(path, path.stat().st_mtime) for path in candidates if path.exists()]
+    if not existing:
+        return None
+    newest = max(mtime for _, mtime in existing)
+    return next(path for path, mtime in existing if mtime >= newest - tolerance)
@@ -0,0 +1,123 @@
+"""Live progress view of a collection: throughput, latency, retries, rate budget and ETA."""
+from typing import Optional
+import time
+
+from rich.live import Live
+from rich.table import Table
+from rich import box
+
+from src.utils.crawl_metrics import CrawlMetrics
+from src.utils.output_formatter import console
+from src.utils.rate_limit_scheduler import RateLimitScheduler
+
+# Redirected output gets one plain line at most this often instead of a live view
+LOG_INTERVAL_SECONDS = 10.0
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "—"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def _format_latency(seconds: Optional[float]) -> str:
+    return "—" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class CrawlDashboard:
+    """
+    Progress of ``iter_pages``, refreshed from the fetch loop.
+
+    On a terminal a ``rich.live.Live`` table is redrawn in place (at most
+    ``refresh_per_second``); messages printed through the shared console
+    appear above it. When the output is redirected, nothing is redrawn:
+    one summary line is written every ``LOG_INTERVAL_SECONDS`` and at the end.
+    """
+
+    def __init__(self, metrics: CrawlMetrics, scheduler: RateLimitScheduler, target: int,
+                 resumed: int = 0, refresh_per_second: float = 4.0):
+        self.metrics = metrics
+        self.scheduler = scheduler
+        self.target = target
+        # Repositories restored from the checkpoint count towards the target, not the rate
+        self.resumed = resumed
+        self.page = 0
+        self.interactive = console.is_terminal
+        self._live: Optional[Live] = None
+        self._refresh_per_second = refresh_per_second
+        self._last_log = 0.0
+
+    def __enter__(self) -> "CrawlDashboard":
+        if self.interactive:
+            self._live = Live(console=console, refresh_per_second=self._refresh_per_second,
+                              get_renderable=self._render)
+            self._live.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+        else:
+            self._log_line()
+
+    def update(self, page: int) -> None:
+        self.page = page
+        # The live view re-reads the metrics on its own refresh timer
+        if self._live is None and time.monotonic() - self._last_log >= LOG_INTERVAL_SECONDS:
+            self._log_line()
+
+    def _budget(self) -> str:
+        scheduler = self.scheduler
+        if scheduler.throttled_until > time.time():
+            return f"esgotado — aguardando reset ({_format_seconds(scheduler.throttled_until - time.time())})"
+        if scheduler.remaining is None or not scheduler.limit:
+            return "—"
+        return f"{scheduler.remaining:,}/{scheduler.limit:,} pontos"
+
+    def _time_split(self) -> str:
+        metrics = self.metrics
+        elapsed = max(metrics.elapsed(), 1e-9)
+        return (f"rede {metrics.request_seconds / elapsed:.0%} · "
+                f"espera rate limit {metrics.wait_seconds / elapsed:.0%}")
+
+    def _render(self) -> Table:
+        metrics = self.metrics
+        latency = metrics.latency_percentiles()
+        table = Table(title="📡 Coleta em andamento", box=box.ROUNDED, show_header=False, title_justify="left")
+        table.add_column("Métrica", style="cyan")
+        table.add_column("Valor", style="yellow")
+        table.add_row("Repositórios", f"{self.resumed + metrics.repos:,}/{self.target:,} (página {self.page})")
+        table.add_row("Vazão", f"{metrics.repos_per_second():.1f} repos/s")
+        table.add_row("Latência p50/p95/p99", " / ".join(_format_latency(latency[p]) for p in (50, 95, 99)))
+        table.add_row("Requisições", f"{metrics.requests:,} ({metrics.retries:,} novas tentativas, "
+                                     f"{metrics.failures:,} falhas, {metrics.cache_hits:,} do cache)")
+        table.add_row("Rate limit", self._budget())
+        table.add_row("Recebido", _format_bytes(metrics.bytes_received))
+        table.add_row("Tempo", f"{_format_seconds(metrics.elapsed())} ({self._time_split()})")
+        table.add_row("ETA", _format_seconds(metrics.eta(self.target - self.resumed)))
+        return table
+
+    def _log_line(self) -> None:
+        self._last_log = time.monotonic()
+        metrics = self.metrics
+        latency = metrics.latency_percentiles()
+        console.print(
+            f"[coleta] {self.resumed + metrics.repos}/{self.target} repos | página {self.page} | "
+            f"{metrics.repos_per_second():.1f} repos/s | "
+            f"p50/p95/p99 {'/'.join(_format_latency(latency[p]) for p in (50, 95, 99))} | "
+            f"{metrics.retries} novas tentativas | rate limit {self._budget()} | "
+            f"{_format_bytes(metrics.bytes_received)} | {self._time_split()} | "
+            f"ETA {_format_seconds(metrics.eta(self.target - self.resumed))}",
+            markup=False, highlight=False, soft_wrap=True,
+        )
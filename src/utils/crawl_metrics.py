@@ -0,0 +1,139 @@
+"""Counters and latency samples of one collection run."""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import math
+import threading
+import time
+
+from src.utils.jsonl_io import JsonLinesWriter
+
+
+class SpanLog:
+    """One JSON line per request: start time, duration, outcome and the caller's attributes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._writer = JsonLinesWriter(path)
+        self._lock = threading.Lock()
+
+    def write(self, start: float, duration: float, ok: bool, attributes: Dict[str, Any]) -> None:
+        span = {"start": round(start, 6), "duration_ms": round(duration * 1000, 3), "ok": ok, **attributes}
+        with self._lock:
+            self._writer.write_many([span])
+
+    def close(self) -> None:
+        with self._lock:
+            self._writer.close()
+
+
+def nearest_rank_percentiles(samples: Sequence[float],
+                             percentiles: Sequence[float] = (50, 95, 99)) -> Dict[float, Optional[float]]:
+    """Nearest-rank percentiles of ``samples`` (``None`` for each when there are none)."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {p: None for p in percentiles}
+    return {p: ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)] for p in percentiles}
+
+
+class CrawlMetrics:
+    """
+    What a run did and where its time went.
+
+    The fetch loop records every request (latency and outcome), retries,
+    time spent waiting on the rate-limit scheduler, cache hits, bytes
+    received and repositories collected, plus the duration of each
+    pipeline stage (parsing, saving) and the cost of each page. Updates
+    take a lock, so the sharded collection's worker threads can share one
+    instance. With a ``span_log`` attached, every request is also written
+    out as one span.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.bytes_received = 0
+        self.repos = 0
+        self.request_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.latencies: List[float] = []
+        self.stage_seconds: Dict[str, List[float]] = {}
+        self.pages: List[Dict[str, Any]] = []
+        self.span_log: Optional[SpanLog] = None
+        self._lock = threading.Lock()
+
+    def record_request(self, latency: float, ok: bool, **span: Any) -> None:
+        """Count one request; ``span`` attributes (kind, attempt, cost...) go to the span log."""
+        with self._lock:
+            self.requests += 1
+            self.request_seconds += latency
+            self.latencies.append(latency)
+            if not ok:
+                self.failures += 1
+        if self.span_log is not None:
+            self.span_log.write(time.time() - latency, latency, ok, span)
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def record_cache_hit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    def record_bytes(self, size: int) -> None:
+        with self._lock:
+            self.bytes_received += size
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_seconds += seconds
+
+    def add_repos(self, count: int) -> None:
+        with self._lock:
+            self.repos += count
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stage_seconds.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one run of stage ``name``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - started)
+
+    def record_page(self, page: int, repos: int, seconds: float, requests: int, cost: Optional[float],
+                    shard: Optional[str] = None) -> None:
+        """One search page: wall time including waits and retries, requests sent (0 if cached), points spent."""
+        entry = {"page": page, "repos": repos, "seconds": seconds, "requests": requests, "cost": cost}
+        if shard is not None:
+            entry["shard"] = shard
+        with self._lock:
+            self.pages.append(entry)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def repos_per_second(self) -> float:
+        elapsed = self.elapsed()
+        return self.repos / elapsed if elapsed > 0 else 0.0
+
+    def latency_percentiles(self, percentiles: Sequence[float] = (50, 95, 99)) -> Dict[float, Optional[float]]:
+        """Nearest-rank percentiles of the request latencies, in seconds (``None`` before any request)."""
+        with self._lock:
+            samples = list(self.latencies)
+        return nearest_rank_percentiles(samples, percentiles)
+
+    def eta(self, target: int) -> Optional[float]:
+        """Seconds until ``target`` repositories at the current rate, or ``None`` while unknown."""
+        rate = self.repos_per_second()
+        if rate <= 0:
+            return None
+        return max(target - self.repos, 0) / rate
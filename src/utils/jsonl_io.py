@@ -0,0 +1,123 @@
+"""Streaming JSON / JSON Lines encoding with optional gzip or zstd compression."""
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, Optional
+import gzip
+import io
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from src.utils.repository_record import RepositoryRecord, as_dict
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def check_compression(compression: Optional[str]) -> None:
+    """Fail before collecting, not when the results are about to be saved."""
+    if compression and compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Compressão desconhecida: {compression} (use gzip ou zstd)")
+    if compression == "zstd" and zstandard is None:
+        raise RuntimeError("Arquivos .zst exigem o pacote 'zstandard' (pip install zstandard).")
+
+
+def with_compression_suffix(path: Path, compression: Optional[str]) -> Path:
+    """``repos.jsonl`` -> ``repos.jsonl.gz`` / ``repos.jsonl.zst``."""
+    check_compression(compression)
+    if not compression:
+        return path
+    return path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+
+
+def compression_variants(path: Path) -> List[Path]:
+    """``repos.jsonl`` plus its compressed names, the files a ``--jsonl`` collection may have saved."""
+    return [path.with_name(path.name + suffix) for suffix in ("", *COMPRESSION_SUFFIXES.values())]
+
+
+def encode(repo: Mapping[str, Any]) -> bytes:
+    """Compact UTF-8 JSON for one repository, using orjson when it is installed."""
+    if orjson is not None:
+        # orjson serializes slotted dataclasses natively, in field order
+        return orjson.dumps(repo if isinstance(repo, RepositoryRecord) else dict(repo))
+    return json.dumps(as_dict(repo), ensure_ascii=False).encode("utf-8")
+
+
+def decode(line: bytes) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def open_binary(path: Path, mode: str) -> BinaryIO:
+    """Open ``path`` for ``rb``/``wb``, (de)compressing according to its suffix."""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, compresslevel=6)
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError("Arquivos .zst exigem o pacote 'zstandard' (pip install zstandard).")
+        raw = path.open(mode)
+        if mode == "wb":
+            return zstandard.ZstdCompressor(level=3).stream_writer(raw)
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw))
+    return path.open(mode)
+
+
+class JsonLinesWriter:
+    """Writes one repository per line; only the page being written is held in memory."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open_binary(path, "wb")
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write_many(self, repos: Iterable[Mapping[str, Any]]) -> None:
+        self._file.write(b"".join(encode(repo) + b"\n" for repo in repos))
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def write_json_array(repos: Iterable[Mapping[str, Any]], path: Path) -> None:
+    """Write a JSON array one element at a time instead of building it as one string."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open_binary(path, "wb") as f:
+        f.write(b"[")
+        for index, repo in enumerate(repos):
+            f.write(b",\n  " if index else b"\n  ")
+            f.write(encode(repo))
+        f.write(b"\n]\n")
+
+
+def iter_json_lines(path: Path) -> Iterator[Dict[str, Any]]:
+    with open_binary(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield decode(line)
+
+
+def iter_json_line_chunks(path: Path, chunk_size: int = 10_000) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the records of ``path`` in lists of at most ``chunk_size``."""
+    chunk: List[Dict[str, Any]] = []
+    for record in iter_json_lines(path):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,187 @@
+"""Pre-aggregated metric cube: language × star bucket × age bucket.
+
+Each cell holds the row count and, per metric, the number of non-null
+values, their sum and a quantile sketch. Sketches are log-bucketed
+histograms (relative error ``SKETCH_ACCURACY`` on every quantile) that
+merge by adding counts, so any roll-up of cells is answered without going
+back to the raw rows.
+"""
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Union
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from src.utils.repository_record import as_dict
+
+DIMENSIONS = ["primaryLanguage", "star_bucket", "age_bucket"]
+METRICS = [
+    "stargazerCount",
+    "releases_count",
+    "pullRequests_count",
+    "open_issues",
+    "closed_issues",
+    "mentionable_users_count",
+    "total_issues",
+    "age_years",
+    "days_since_update",
+    "closed_issues_percentage",
+]
+
+STAR_BUCKET_BINS = [0, 10_000, 25_000, 50_000, 100_000, float("inf")]
+STAR_BUCKET_LABELS = ["<10k", "10k–25k", "25k–50k", "50k–100k", "100k+"]
+AGE_RANGE_BINS = [0, 2, 5, 10, float("inf")]
+AGE_RANGE_LABELS = ["0–2 anos", "2–5 anos", "5–10 anos", "10+ anos"]
+
+SKETCH_ACCURACY = 0.01
+_GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+_LOG_GAMMA = np.log(_GAMMA)
+# Bin 0 holds zeros (and negatives); positive values start above this offset
+_BIN_OFFSET = 4000
+
+Where = Optional[Mapping[str, Sequence[Any]]]
+
+
+def _sketch_bins(values: np.ndarray) -> np.ndarray:
+    bins = np.zeros(len(values), dtype=np.int32)
+    positive = values > 0
+    bins[positive] = np.ceil(np.log(values[positive]) / _LOG_GAMMA).astype(np.int32) + _BIN_OFFSET
+    return bins
+
+
+def _bin_values(bins: np.ndarray) -> np.ndarray:
+    """Representative value of each bin (within ``SKETCH_ACCURACY`` of every value in it)."""
+    values = 2 * _GAMMA ** (bins.astype(float) - _BIN_OFFSET) / (_GAMMA + 1)
+    return np.where(bins == 0, 0.0, values)
+
+
+class MetricCube:
+    """Counts, sums and quantile sketches per (language, star bucket, age bucket) cell."""
+
+    def __init__(self, cells: pd.DataFrame, sketches: pd.DataFrame):
+        # cells: one row per cell id with the dimensions, ``count`` and per-metric ``<m>_count``/``<m>_sum``
+        # sketches: long format (cell, metric, bin, count)
+        self.cells = cells
+        self.sketches = sketches
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "MetricCube":
+        """Aggregate a frame with ``stargazerCount``, ``primaryLanguage`` and ``age_years`` plus any metrics."""
+        frame = pd.DataFrame({
+            "primaryLanguage": df["primaryLanguage"].astype(str),
+            "star_bucket": pd.cut(df["stargazerCount"], bins=STAR_BUCKET_BINS, labels=STAR_BUCKET_LABELS,
+                                  right=False),
+            "age_bucket": pd.cut(df["age_years"], bins=AGE_RANGE_BINS, labels=AGE_RANGE_LABELS, right=False),
+        })
+        metrics = [metric for metric in METRICS if metric in df.columns]
+        for metric in metrics:
+            frame[metric] = pd.to_numeric(df[metric], errors="coerce").astype(float)
+
+        grouped = frame.groupby(DIMENSIONS, observed=True, dropna=False, sort=True)
+        cell_ids = grouped.ngroup().to_numpy()
+        cells = grouped.size().rename("count").reset_index()
+        for metric in metrics:
+            cells[f"{metric}_count"] = grouped[metric].count().to_numpy()
+            cells[f"{metric}_sum"] = grouped[metric].sum().to_numpy()
+
+        sketch_parts = []
+        for metric in metrics:
+            values = frame[metric].to_numpy()
+            valid = ~np.isnan(values)
+            keys = cell_ids[valid].astype(np.int64) * (2 * _BIN_OFFSET + 1) + _sketch_bins(values[valid])
+            unique, counts = np.unique(keys, return_counts=True)
+            sketch_parts.append(pd.DataFrame({
+                "cell": unique // (2 * _BIN_OFFSET + 1),
+                "metric": metric,
+                "bin": (unique % (2 * _BIN_OFFSET + 1)).astype(np.int32),
+                "count": counts,
+            }))
+        sketches = pd.concat(sketch_parts, ignore_index=True) if sketch_parts else pd.DataFrame(
+            columns=["cell", "metric", "bin", "count"])
+        sketches["metric"] = sketches["metric"].astype("category")
+        return cls(cells, sketches)
+
+    @classmethod
+    def from_repositories(cls, repos: Iterable[Mapping[str, Any]]) -> "MetricCube":
+        """Cube of a collection held in memory (records or dicts), aged from its ``collectedAt``."""
+        df = pd.DataFrame([as_dict(repo) for repo in repos])
+        created = pd.to_datetime(df["createdAt"], utc=True, errors="coerce")
+        updated = pd.to_datetime(df["updatedAt"], utc=True, errors="coerce")
+        if "collectedAt" in df.columns:
+            reference = pd.to_datetime(df["collectedAt"], utc=True, errors="coerce").max()
+        else:
+            reference = updated.max()
+        df["age_years"] = ((reference - created).dt.total_seconds() / (365.25 * 86400)).clip(lower=0)
+        df["days_since_update"] = (reference - updated).dt.days.clip(lower=0)
+        df["total_issues"] = df["open_issues"] + df["closed_issues"]
+        df["closed_issues_percentage"] = (df["closed_issues"] / df["total_issues"] * 100).where(
+            df["total_issues"] > 0
+        )
+        return cls.build(df)
+
+    def _select(self, where: Where) -> pd.DataFrame:
+        cells = self.cells
+        for dimension, values in (where or {}).items():
+            cells = cells[cells[dimension].isin(list(values))]
+        return cells
+
+    def total(self, where: Where = None) -> int:
+        return int(self._select(where)["count"].sum())
+
+    def counts(self, by: str = "primaryLanguage", metric: Optional[str] = None, where: Where = None) -> pd.Series:
+        """Rows per ``by`` value, largest first; with ``metric``, only rows where it is not null."""
+        column = "count" if metric is None else f"{metric}_count"
+        counts = self._select(where).groupby(by, observed=True)[column].sum()
+        counts = counts[counts > 0].astype("int64")
+        return counts.sort_values(ascending=False, kind="stable")
+
+    def top(self, by: str = "primaryLanguage", n: int = 10, metric: Optional[str] = None,
+            where: Where = None) -> List[str]:
+        return self.counts(by, metric, where).head(n).index.tolist()
+
+    def sums(self, metrics: Optional[Sequence[str]] = None, by: Optional[str] = None,
+             where: Where = None) -> Union[pd.Series, pd.DataFrame]:
+        """Sum of each metric, overall (a Series) or per ``by`` value (a DataFrame)."""
+        metrics = list(metrics) if metrics is not None else self.metrics
+        cells = self._select(where)
+        columns = [f"{metric}_sum" for metric in metrics]
+        if by is None:
+            return cells[columns].sum().set_axis(metrics)
+        return cells.groupby(by, observed=True)[columns].sum().set_axis(metrics, axis=1)
+
+    def quantile(self, metric: str, q: float = 0.5, by: Optional[str] = None,
+                 where: Where = None) -> Union[float, pd.Series]:
+        """Quantile of ``metric`` from the merged sketches, overall or per ``by`` value."""
+        cells = self._select(where)
+        sketch = self.sketches[(self.sketches["metric"] == metric) & self.sketches["cell"].isin(cells.index)]
+        groups = cells[by].reindex(sketch["cell"]).to_numpy() if by is not None else np.zeros(len(sketch))
+
+        # Merge the cells of each group, then take the first bin whose
+        # running count passes the quantile's rank within that group
+        merged = sketch.groupby([groups, sketch["bin"].to_numpy()], observed=True)["count"].sum()
+        group_level = merged.index.get_level_values(0)
+        running = merged.groupby(level=0, observed=True).cumsum()
+        rank = q * (merged.groupby(level=0, observed=True).transform("sum") - 1)
+        first = running[running > rank].groupby(level=0, observed=True).head(1)
+        result = pd.Series(_bin_values(first.index.get_level_values(1).to_numpy()),
+                           index=first.index.get_level_values(0), name=metric, dtype=float)
+        if by is None:
+            return float(result.iloc[0]) if len(result) else np.nan
+        return result.reindex(pd.unique(group_level))
+
+    def median(self, metric: str, by: Optional[str] = None, where: Where = None) -> Union[float, pd.Series]:
+        return self.quantile(metric, 0.5, by, where)
+
+    @property
+    def metrics(self) -> List[str]:
+        return [column[:-len("_sum")] for column in self.cells.columns if column.endswith("_sum")]
+
+    def digest(self) -> str:
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(self.cells, index=True).values.tobytes())
+        digest.update(pd.util.hash_pandas_object(self.sketches, index=False).values.tobytes())
+        return digest.hexdigest()
+
+    def __repr__(self) -> str:
+        # Content-based so the figure manifest fingerprints a cube by what it holds
+        return f"MetricCube(cells={len(self.cells)}, digest={self.digest()[:16]})"
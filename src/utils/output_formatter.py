@@ -1,83 +1,205 @@
-from typing import List, Dict, Any
-from datetime import datetime
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterator, Mapping, Optional, Sequence
+import heapq
 from rich.console import Console
 from rich.table import Table
 from rich import box
 
+from src.utils.metric_cube import MetricCube
+
+# One console for every message; creating one per call re-detects the terminal each time
+console = Console()
+
+# Friendly names accepted by --sort, mapped to the repository fields
+SORT_FIELDS = {
+    "stars": "stargazerCount",
+    "name": "name",
+    "language": "primaryLanguage",
+    "created": "createdAt",
+    "updated": "updatedAt",
+    "releases": "releases_count",
+    "prs": "pullRequests_count",
+    "open_issues": "open_issues",
+    "closed_issues": "closed_issues",
+}
+
+# Rows per rendered table; each chunk is printed as soon as it is built
+RENDER_CHUNK_SIZE = 500
+
+
+@dataclass(frozen=True)
+class _Column:
+    title: str
+    width: int
+    style: str
+    right: bool = False
+
+
+REPOSITORY_COLUMNS = [
+    _Column("Nº", 7, "dim", right=True),
+    _Column("Nome", 28, "cyan"),
+    _Column("URL", 48, "blue"),
+    _Column("Stars", 9, "yellow", right=True),
+    _Column("Linguagem", 14, "green"),
+    _Column("Criado", 10, "dim"),
+    _Column("Atualizado", 10, "dim"),
+    _Column("Releases", 8, "magenta", right=True),
+    _Column("PRs", 8, "magenta", right=True),
+    _Column("Iss. abertas", 12, "red", right=True),
+    _Column("Iss. fechadas", 13, "green", right=True),
+]
+
+# Cells plus one space of padding on each side and a separator between columns
+REPOSITORY_TABLE_WIDTH = sum(column.width + 2 for column in REPOSITORY_COLUMNS) + len(REPOSITORY_COLUMNS) - 1
+
+
+@dataclass
+class TableView:
+    """Which rows of a result set the terminal table shows (``--limit``/``--page``/``--sort``/filters)."""
+    limit: Optional[int] = None
+    page: int = 1
+    sort_by: Optional[str] = None
+    ascending: bool = False
+    language: Optional[str] = None
+    min_stars: Optional[int] = None
+
+    def sort_field(self) -> Optional[str]:
+        if self.sort_by is None:
+            return None
+        field = SORT_FIELDS.get(self.sort_by, self.sort_by)
+        if field not in SORT_FIELDS.values():
+            raise ValueError(f"Campo de ordenação desconhecido: {self.sort_by} "
+                             f"(use {', '.join(SORT_FIELDS)})")
+        return field
+
+    def select(self, repos: Sequence[Mapping[str, Any]]) -> "TableSlice":
+        """Filter, sort and cut the requested page without copying rows outside it."""
+        rows: Sequence[Mapping[str, Any]] = repos
+        if self.language is not None:
+            language = self.language.lower()
+            rows = [repo for repo in rows if str(repo['primaryLanguage']).lower() == language]
+        if self.min_stars is not None:
+            rows = [repo for repo in rows if repo['stargazerCount'] >= self.min_stars]
+
+        total = len(rows)
+        page = max(1, self.page)
+        offset = (page - 1) * self.limit if self.limit else 0
+        end = offset + self.limit if self.limit else total
+
+        field = self.sort_field()
+        if field is not None:
+            key = lambda repo: repo[field]  # noqa: E731
+            if end < total:
+                # Only the rows up to the requested page need ordering: O(n log k)
+                pick = heapq.nsmallest if self.ascending else heapq.nlargest
+                rows = pick(end, rows, key=key)
+            else:
+                rows = sorted(rows, key=key, reverse=not self.ascending)
+        return TableSlice(list(rows[offset:end]), offset, total, page, self.limit)
+
+
+@dataclass
+class TableSlice:
+    rows: List[Mapping[str, Any]]
+    offset: int
+    total: int
+    page: int
+    limit: Optional[int]
+
+    @property
+    def pages(self) -> int:
+        if not self.limit:
+            return 1
+        return max(1, -(-self.total // self.limit))
+
 
 class RepositoryOutputFormatter:
     
     @staticmethod
     def _format_date_to_brazilian(date_str: str) -> str:
         """Convert ISO date string (YYYY-MM-DD) to Brazilian format (DD/MM/YYYY)"""
-        try:
-            date_obj = datetime.strptime(date_str[:10], "%Y-%m-%d")
-            return date_obj.strftime("%d/%m/%Y")
-        except (ValueError, TypeError):
-            return date_str
-    
+        if isinstance(date_str, str) and len(date_str) >= 10 and date_str[4] == "-" and date_str[7] == "-":
+            return f"{date_str[8:10]}/{date_str[5:7]}/{date_str[:4]}"
+        return date_str
+
     @staticmethod
-    def print_repositories(repos: List[Dict[str, Any]]) -> None:
-        console = Console()
+    def _chunks(rows: Sequence[Mapping[str, Any]], size: int) -> Iterator[Sequence[Mapping[str, Any]]]:
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+
+    @staticmethod
+    def _repository_table(show_header: bool) -> Table:
+        """Columns have fixed widths, so the tables of consecutive chunks line up as one.
+
+        The table keeps its full width on narrow terminals, which wrap the
+        lines instead of ``rich`` dropping whole columns to fit.
+        """
+        table = Table(box=box.SIMPLE_HEAD, show_header=show_header, show_edge=False, pad_edge=False,
+                      header_style="bold magenta", width=REPOSITORY_TABLE_WIDTH)
+        for column in REPOSITORY_COLUMNS:
+            table.add_column(column.title, style=column.style, width=column.width, no_wrap=True,
+                             overflow="ellipsis", justify="right" if column.right else "left")
+        return table
+
+    @staticmethod
+    def print_repositories(repos: Sequence[Mapping[str, Any]], view: Optional[TableView] = None) -> None:
+        """Print the selected rows as ``rich`` tables of ``RENDER_CHUNK_SIZE`` rows each.
+
+        Each chunk is printed as soon as it is built, so the first rows appear
+        at once even when the page holds the whole collection.
+        """
+        view = view or TableView()
+        selected = view.select(repos)
         
         console.print(f"\n🎯 REPOSITÓRIOS COLETADOS - TOTAL: {len(repos)}", 
                      style="bold cyan")
-        
-        table = Table(title="Detalhes dos Repositórios", box=box.ROUNDED, 
-                     show_lines=True, header_style="bold magenta")
-        
-        table.add_column("Nº", justify="center", style="dim")
-        table.add_column("Nome", style="cyan", no_wrap=False, overflow="fold")
-        table.add_column("URL", style="blue", no_wrap=False, overflow="fold")
-        table.add_column("Stars", justify="right", style="yellow")
-        table.add_column("Linguagem", justify="center", style="green")
-        table.add_column("Criado", justify="center", style="dim")
-        table.add_column("Atualizado", justify="center", style="dim")
-        table.add_column("Releases", justify="right", style="magenta")
-        table.add_column("PRs", justify="right", style="magenta")
-        table.add_column("Issues Abertas", justify="right", style="red")
-        table.add_column("Issues Fechadas", justify="right", style="green")
-        
-        for i, repo in enumerate(repos, 1):
-            table.add_row(
-                str(i),
-                repo['name'],
-                repo['url'],
-                f"{repo['stargazerCount']:,}",
-                repo['primaryLanguage'],
-                RepositoryOutputFormatter._format_date_to_brazilian(repo['createdAt']),
-                RepositoryOutputFormatter._format_date_to_brazilian(repo['updatedAt']),
-                f"{repo['releases_count']:,}",
-                f"{repo['pullRequests_count']:,}",
-                f"{repo['open_issues']:,}",
-                f"{repo['closed_issues']:,}"
-            )
-        
-        console.print(table)
+
+        fmt_date = RepositoryOutputFormatter._format_date_to_brazilian
+        number = selected.offset
+        for index, chunk in enumerate(RepositoryOutputFormatter._chunks(selected.rows, RENDER_CHUNK_SIZE)):
+            table = RepositoryOutputFormatter._repository_table(show_header=index == 0)
+            for repo in chunk:
+                number += 1
+                table.add_row(
+                    str(number),
+                    str(repo['name']),
+                    str(repo['url']),
+                    f"{repo['stargazerCount']:,}",
+                    str(repo['primaryLanguage']),
+                    fmt_date(repo['createdAt']),
+                    fmt_date(repo['updatedAt']),
+                    f"{repo['releases_count']:,}",
+                    f"{repo['pullRequests_count']:,}",
+                    f"{repo['open_issues']:,}",
+                    f"{repo['closed_issues']:,}",
+                )
+            console.print(table, crop=False)
+
+        if not selected.rows:
+            console.print("Nenhum repositório corresponde aos filtros.", style="yellow")
+        elif view.limit or selected.total != len(repos):
+            console.print(f"📄 Página {selected.page}/{selected.pages} — linhas {selected.offset + 1}–{number} "
+                         f"de {selected.total:,} (use --page N e --limit N para navegar)", style="cyan")
     
     @staticmethod
     def print_summary(repos: List[Dict[str, Any]]) -> None:
-        console = Console()
-        
-        languages = {}
-        for repo in repos:
-            lang = repo['primaryLanguage']
-            languages[lang] = languages.get(lang, 0) + 1
+        cube = MetricCube.from_repositories(repos)
         
         lang_table = Table(title="🔤 Top 10 Linguagens", box=box.ROUNDED,
                           header_style="bold cyan")
         lang_table.add_column("Linguagem", style="green")
         lang_table.add_column("Repositórios", justify="right", style="magenta")
         
-        for lang, count in sorted(languages.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for lang, count in cube.counts("primaryLanguage").head(10).items():
             lang_table.add_row(lang, str(count))
         
         console.print(lang_table)
         
-        total_releases = sum(repo['releases_count'] for repo in repos)
-        total_prs = sum(repo['pullRequests_count'] for repo in repos)
-        total_open_issues = sum(repo['open_issues'] for repo in repos)
-        total_closed_issues = sum(repo['closed_issues'] for repo in repos)
+        totals = cube.sums(["releases_count", "pullRequests_count", "open_issues", "closed_issues"])
+        total_releases = int(totals["releases_count"])
+        total_prs = int(totals["pullRequests_count"])
+        total_open_issues = int(totals["open_issues"])
+        total_closed_issues = int(totals["closed_issues"])
         
         stats_table = Table(title="📊 Totais Gerais", box=box.ROUNDED,
                            header_style="bold cyan")
@@ -89,48 +211,86 @@ class RepositoryOutputFormatter:
         stats_table.add_row("Issues abertas", f"{total_open_issues:,}")
         stats_table.add_row("Issues fechadas", f"{total_closed_issues:,}")
         stats_table.add_row("Total de issues", f"{total_open_issues + total_closed_issues:,}")
+        stats_table.add_row("Mediana de estrelas", f"≈ {cube.median('stargazerCount'):,.0f}")
         
         console.print(stats_table)
     
     @staticmethod
-    def print_page_progress(page: int, total_pages: int, repos_this_page: int, 
-                           total_repos: int) -> None:
-        console = Console()
-        console.print(f"📄 Coletando página {page}/{total_pages}...", style="bold blue")
-        console.print(f"✅ Coletados {repos_this_page} repositórios desta página", 
-                     style="green")
-        console.print(f"📊 Total acumulado: {total_repos} repositórios", 
+    def print_gap_fill(page: int, duplicates: int, band: str, recovered: int) -> None:
+        console.print(f"🩹 Página {page}: ranking mudou durante a coleta ({duplicates} duplicados descartados); "
+                     f"faixa stars:{band} reconsultada, {recovered} recuperados", style="yellow")
+
+    @staticmethod
+    def print_gap_fill_truncated(band: str, max_pages: int) -> None:
+        console.print(f"⚠️ Faixa stars:{band} ainda tinha resultados após {max_pages} páginas de reconsulta; "
+                     f"repositórios dessa faixa podem ter ficado de fora", style="bold yellow")
+
+    @staticmethod
+    def print_refresh_start(known: int) -> None:
+        console.print(f"🔄 Atualizando {known} repositórios conhecidos por ID (nodes)...", style="bold yellow")
+
+    @staticmethod
+    def print_refresh_progress(done: int, total: int) -> None:
+        console.print(f"📄 Atualizados {done}/{total} repositórios", style="bold blue")
+
+    @staticmethod
+    def print_refresh_summary(refreshed: int, newcomers: int, total: int) -> None:
+        console.print(f"📊 {refreshed} atualizados, {newcomers} novos próximos ao corte — total: {total}",
                      style="cyan")
+
+    @staticmethod
+    def print_enrichment_start(total: int) -> None:
+        console.print(f"🧬 Enriquecendo {total} repositórios com consultas agrupadas...", style="bold yellow")
+
+    @staticmethod
+    def print_enrichment_progress(done: int, total: int) -> None:
+        console.print(f"📄 Enriquecidos {done}/{total} repositórios", style="bold blue")
+
+    @staticmethod
+    def print_enrichment_summary(enriched: int, requests_made: int) -> None:
+        console.print(f"📊 {enriched} repositórios enriquecidos em {requests_made} requisições", style="cyan")
+
+    @staticmethod
+    def print_resume(page: int, total_repos: int) -> None:
+        console.print(f"♻️  Retomando do checkpoint: {page} páginas e {total_repos} repositórios já coletados",
+                     style="bold yellow")
+
+    @staticmethod
+    def print_shard_progress(shard: str, page: int, repos_this_page: int, shard_total: int) -> None:
+        console.print(f"📄 Shard {shard} — página {page}: {repos_this_page} repositórios "
+                     f"(acumulado no shard: {shard_total})", style="bold blue")
+
+    @staticmethod
+    def print_shard_plan(shards: List[str], concurrency: int, target: int) -> None:
+        console.print(f"🧩 Coleta de {target} repositórios em {len(shards)} shards de estrelas "
+                     f"(até {concurrency} requisições simultâneas)", style="bold yellow")
+        for shard in shards:
+            console.print(f"   • stars:{shard}", style="cyan")
     
     @staticmethod
-    def print_fetch_start(method: str, pages: int = 10) -> None:
-        console = Console()
-        console.print(f"🚀 Iniciando coleta de {pages * 10} repositórios (10 por página, {pages} páginas)...", 
+    def print_fetch_start(method: str, total_repos: int = 100, page_size: int = 10) -> None:
+        console.print(f"🚀 Iniciando coleta de {total_repos} repositórios "
+                     f"({page_size} por página inicialmente, ajustado durante a coleta)...", 
                      style="bold yellow")
         console.print(f"📡 Método: {method}", style="cyan")
     
     @staticmethod
     def print_no_repos() -> None:
-        console = Console()
         console.print("❌ Nenhum repositório foi coletado!", style="bold red")
     
     @staticmethod
     def print_save_success(filepath: str) -> None:
-        console = Console()
         console.print(f"\n✅ Dados salvos em {filepath}", style="bold green")
     
     @staticmethod
     def print_json_hint() -> None:
-        console = Console()
         console.print("\nℹ️  Use --json para salvar os dados em JSON", style="cyan")
     
     @staticmethod
     def print_error(error: str) -> None:
-        console = Console()
         console.print(f"❌ {error}", style="bold red")
     
     @staticmethod
     def print_completion(count: int) -> None:
-        console = Console()
         console.print(f"\n🎉 Processo concluído! {count} repositórios processados.", 
                      style="bold green")
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""AIMD controller for the `first:` argument of the search query."""
+from collections import deque
+import threading
+
+
+class PageSizeController:
+    """
+    Tunes how many repositories are requested per page.
+
+    Additive increase, multiplicative decrease: the size grows by
+    ``increase`` after each healthy page (latency under ``latency_target``
+    and recent error rate under ``max_error_rate``) and is cut by
+    ``decrease_factor`` whenever the server fails because the page was too
+    expensive (HTTP 502/503/504, timeouts), so the retry goes out smaller
+    instead of repeating the same failing size.
+    """
+
+    def __init__(self, initial: int = 10, minimum: int = 5, maximum: int = 40, increase: int = 5,
+                 decrease_factor: float = 0.5, latency_target: float = 10.0,
+                 max_error_rate: float = 0.1, window: int = 20):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.max_error_rate = max_error_rate
+
+        self._size = max(minimum, min(initial, maximum))
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def set_maximum(self, maximum: int) -> None:
+        with self._lock:
+            self.maximum = max(maximum, self.minimum)
+            self._size = min(self._size, self.maximum)
+
+    def on_success(self, latency: float) -> None:
+        with self._lock:
+            self._outcomes.append(True)
+            if latency <= self.latency_target and self.error_rate <= self.max_error_rate:
+                self._size = min(self._size + self.increase, self.maximum)
+
+    def on_overload(self) -> None:
+        with self._lock:
+            self._outcomes.append(False)
+            self._size = max(int(self._size * self.decrease_factor), self.minimum)
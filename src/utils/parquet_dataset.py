@@ -0,0 +1,104 @@
+"""Typed Parquet representation of the collected repositories."""
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.utils.repository_sinks import RepositorySink
+
+TIMESTAMP = pa.timestamp("s", tz="UTC")
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+REPOSITORY_SCHEMA = pa.schema([
+    pa.field("id", pa.string()),
+    pa.field("name", pa.string()),
+    pa.field("url", pa.string()),
+    pa.field("stargazerCount", pa.int32()),
+    pa.field("createdAt", TIMESTAMP),
+    pa.field("updatedAt", TIMESTAMP),
+    pa.field("primaryLanguage", pa.dictionary(pa.int16(), pa.string())),
+    pa.field("releases_count", pa.int32()),
+    pa.field("pullRequests_count", pa.int32()),
+    pa.field("open_issues", pa.int32()),
+    pa.field("closed_issues", pa.int32()),
+    pa.field("mentionable_users_count", pa.int32()),
+    pa.field("collectedAt", TIMESTAMP),
+])
+
+# Columns added by the optional enrichment stage
+ENRICHMENT_FIELDS = [
+    pa.field("last_release_at", TIMESTAMP),
+    pa.field("release_interval_days", pa.float32()),
+    pa.field("default_branch_commits", pa.int32()),
+]
+
+
+def schema_for(columns: List[str]) -> pa.Schema:
+    """Schema restricted to ``columns``, in the repository schema's order."""
+    fields = [field for field in list(REPOSITORY_SCHEMA) + ENRICHMENT_FIELDS if field.name in columns]
+    return pa.schema(fields)
+
+
+def repositories_to_table(repos: List[Dict[str, Any]], schema: Optional[pa.Schema] = None) -> pa.Table:
+    """Convert standardized repository dicts into a typed Arrow table.
+
+    ISO timestamp strings are parsed by Arrow; empty strings become nulls,
+    both there and in the language column, matching how CSV reads them back.
+    """
+    schema = schema or schema_for(list(repos[0].keys()) if repos else REPOSITORY_SCHEMA.names)
+    arrays = []
+    for field in schema:
+        values = [repo.get(field.name) for repo in repos]
+        if pa.types.is_timestamp(field.type):
+            raw = pa.array([value or None for value in values], pa.string())
+            parsed = pc.strptime(raw, format=ISO_FORMAT, unit="s", error_is_null=True)
+            arrays.append(parsed.cast(field.type))
+        elif pa.types.is_dictionary(field.type):
+            raw = pa.array([value or None for value in values], pa.string())
+            arrays.append(raw.dictionary_encode().cast(field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_repositories_parquet(repos: List[Dict[str, Any]], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(repositories_to_table(repos), path, compression="zstd")
+
+
+class ParquetSink(RepositorySink):
+    """
+    Streaming Parquet writer for ``--stream`` runs.
+
+    Pages are buffered until ``row_group_size`` rows are pending, so the
+    file is made of reasonably sized row groups instead of one per page.
+    """
+
+    def __init__(self, path: Path, row_group_size: int = 10_000):
+        super().__init__(path)
+        self.row_group_size = row_group_size
+        self._pending: List[Dict[str, Any]] = []
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._schema: Optional[pa.Schema] = None
+
+    def write_page(self, repos: List[Dict[str, Any]]) -> None:
+        self._pending.extend(repos)
+        if len(self._pending) >= self.row_group_size:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        if self._writer is None:
+            self._schema = schema_for(list(self._pending[0].keys()))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+        self._writer.write_table(repositories_to_table(self._pending, self._schema))
+        self._pending = []
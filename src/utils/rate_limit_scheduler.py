@@ -0,0 +1,134 @@
+"""Request pacing driven by GitHub's rate-limit signals."""
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+import random
+import threading
+import time
+
+# Cooldown GitHub recommends when a secondary limit is hit without Retry-After
+SECONDARY_LIMIT_COOLDOWN = 60.0
+
+
+class RateLimitScheduler:
+    """
+    Decides how long to wait before the next request.
+
+    Signals come from the ``rateLimit { cost remaining resetAt }`` block of
+    GraphQL responses, the ``X-RateLimit-*`` and ``Retry-After`` headers and
+    rate-limit error messages. While more than ``slowdown_threshold`` of the
+    budget is left requests go out immediately; below that the delay grows
+    smoothly towards an even spread of the remaining budget until the reset,
+    and once throttled the scheduler sleeps exactly until the reset time.
+    """
+
+    def __init__(self, slowdown_threshold: float = 0.2, max_backoff: float = 30.0):
+        self.slowdown_threshold = slowdown_threshold
+        self.max_backoff = max_backoff
+
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.cost: float = 1.0
+        self.throttled_until: float = 0.0
+        self._lock = threading.Lock()
+
+    def next_delay(self) -> float:
+        """Seconds to wait before sending the next request."""
+        with self._lock:
+            now = time.time()
+            if self.throttled_until > now:
+                return self.throttled_until - now
+
+            if self.remaining is None or not self.limit or self.reset_at is None:
+                return 0.0
+
+            time_to_reset = max(self.reset_at - now, 0.0)
+            if self.remaining < self.cost:
+                return time_to_reset
+
+            budget_fraction = self.remaining / self.limit
+            if budget_fraction >= self.slowdown_threshold:
+                return 0.0
+
+            requests_left = max(self.remaining / self.cost, 1.0)
+            even_spread = time_to_reset / requests_left
+            return even_spread * (1 - budget_fraction / self.slowdown_threshold)
+
+    def wait(self) -> None:
+        delay = self.next_delay()
+        if delay > 0:
+            time.sleep(delay)
+
+    def retry_delay(self, attempt: int) -> float:
+        """Backoff after a failed attempt.
+
+        When the failure carried a rate-limit signal the next ``wait`` already
+        sleeps for the exact time, so no extra backoff is added.
+        """
+        if self.throttled_until > time.time():
+            return 0.0
+        return min(2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+
+    def observe_headers(self, status: int, headers: Mapping[str, str]) -> None:
+        """Record ``X-RateLimit-*``/``Retry-After`` headers of an HTTP response."""
+        headers = {key.lower(): value for key, value in headers.items()}
+        with self._lock:
+            if "x-ratelimit-limit" in headers:
+                self.limit = int(headers["x-ratelimit-limit"])
+            if "x-ratelimit-remaining" in headers:
+                self.remaining = int(headers["x-ratelimit-remaining"])
+            if "x-ratelimit-reset" in headers:
+                self.reset_at = float(headers["x-ratelimit-reset"])
+
+            retry_after = _parse_retry_after(headers.get("retry-after"))
+            if retry_after is not None:
+                self._throttle_for(retry_after)
+            elif status in (403, 429) and self.remaining == 0 and self.reset_at:
+                self.throttled_until = max(self.throttled_until, self.reset_at)
+
+    def observe_response(self, data: Optional[Dict[str, Any]]) -> None:
+        """Record the ``rateLimit`` block and rate-limit errors of a response body."""
+        if not data:
+            return
+
+        rate_limit = (data.get("data") or {}).get("rateLimit")
+        if rate_limit:
+            with self._lock:
+                self.cost = max(float(rate_limit.get("cost") or 1), 1.0)
+                self.remaining = rate_limit.get("remaining", self.remaining)
+                self.limit = rate_limit.get("limit", self.limit)
+                if rate_limit.get("resetAt"):
+                    self.reset_at = _parse_iso_timestamp(rate_limit["resetAt"])
+
+        message = f"{data.get('errors') or ''} {data.get('message') or ''}".lower()
+        if "secondary rate limit" in message:
+            with self._lock:
+                if self.throttled_until <= time.time():
+                    self._throttle_for(SECONDARY_LIMIT_COOLDOWN)
+        elif "rate limit" in message or "rate_limited" in message:
+            with self._lock:
+                if self.reset_at and self.reset_at > time.time():
+                    self.throttled_until = max(self.throttled_until, self.reset_at)
+                else:
+                    self._throttle_for(SECONDARY_LIMIT_COOLDOWN)
+
+    def _throttle_for(self, seconds: float) -> None:
+        self.throttled_until = max(self.throttled_until, time.time() + seconds)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either a number of seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+def _parse_iso_timestamp(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
@@ -0,0 +1,94 @@
+"""Compact in-memory representation of a collected repository."""
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator
+import sys
+
+
+def collection_timestamp() -> str:
+    """``collectedAt`` value for a run; computed once and shared by all its records."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _total(node: Dict[str, Any], connection: str) -> int:
+    return (node.get(connection) or {}).get("totalCount", 0)
+
+
+@dataclass(slots=True)
+class RepositoryRecord(Mapping):
+    """
+    One standardized repository, without a per-instance ``__dict__``.
+
+    Reads like the dictionaries the fetchers used to return
+    (``repo["stargazerCount"]``, ``repo.get(...)``, ``keys()``), so CSV,
+    Parquet, SQLite and the terminal output take it as is. ``to_dict``
+    gives the plain dict for JSON and for code that adds keys.
+    Language names are interned, and ``collectedAt`` is the run's shared
+    string, so repeated values are stored once.
+    """
+
+    id: str
+    name: str
+    url: str
+    stargazerCount: int
+    createdAt: str
+    updatedAt: str
+    primaryLanguage: str
+    releases_count: int
+    pullRequests_count: int
+    open_issues: int
+    closed_issues: int
+    mentionable_users_count: int
+    collectedAt: str
+
+    @classmethod
+    def from_node(cls, node: Dict[str, Any], collected_at: str) -> "RepositoryRecord":
+        """Parse a GraphQL repository node, handling possible nulls."""
+        return cls(
+            node.get("id", ""),
+            node.get("name", "N/A"),
+            node.get("url", ""),
+            node.get("stargazerCount", 0),
+            node.get("createdAt", ""),
+            node.get("updatedAt", ""),
+            sys.intern((node.get("primaryLanguage") or {}).get("name", "Unknown")),
+            _total(node, "releases"),
+            _total(node, "pullRequests"),
+            _total(node, "openIssues"),
+            _total(node, "closedIssues"),
+            _total(node, "mentionableUsers"),
+            collected_at,
+        )
+
+    @classmethod
+    def from_dict(cls, repo: Dict[str, Any]) -> "RepositoryRecord":
+        """Rebuild a record from its dict shape (checkpoint journal, saved files)."""
+        values = {field.name: repo.get(field.name) for field in fields(cls)}
+        values["primaryLanguage"] = sys.intern(values["primaryLanguage"] or "Unknown")
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in FIELD_NAMES}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELD_NAMES)
+
+    def __len__(self) -> int:
+        return len(FIELD_NAMES)
+
+
+FIELD_NAMES = tuple(field.name for field in fields(RepositoryRecord))
+_FIELD_SET = frozenset(FIELD_NAMES)
+
+
+def as_dict(repo: Mapping) -> Dict[str, Any]:
+    """Plain dict for either a record or an already enriched dict."""
+    if isinstance(repo, RepositoryRecord):
+        return repo.to_dict()
+    return dict(repo)
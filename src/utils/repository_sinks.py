@@ -0,0 +1,142 @@
+"""Incremental writers for streamed collection pages."""
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import csv
+import queue
+import threading
+
+from src.utils.jsonl_io import JsonLinesWriter, encode, open_binary
+
+
+class RepositorySink(ABC):
+    """Destination that receives repositories one page at a time."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @abstractmethod
+    def write_page(self, repos: List[Dict[str, Any]]) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class CsvSink(RepositorySink):
+    """Appends CSV rows; the header comes from the first record written."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._file = None
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write_page(self, repos: List[Dict[str, Any]]) -> None:
+        if not repos:
+            return
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open('w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=list(repos[0].keys()))
+            self._writer.writeheader()
+        self._writer.writerows(repos)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class JsonLinesSink(RepositorySink):
+    """Appends one JSON object per line; a ``.gz``/``.zst`` suffix compresses the file."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._writer = JsonLinesWriter(path)
+
+    def write_page(self, repos: List[Dict[str, Any]]) -> None:
+        self._writer.write_many(repos)
+        self._writer.flush()
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class JsonArraySink(RepositorySink):
+    """Writes the same JSON array as ``write_json_array``, one element at a time."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open_binary(path, "wb")
+        self._file.write(b"[")
+        self._written = 0
+
+    def write_page(self, repos: List[Dict[str, Any]]) -> None:
+        for repo in repos:
+            self._file.write(b",\n  " if self._written else b"\n  ")
+            self._file.write(encode(repo))
+            self._written += 1
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.write(b"\n]\n")
+        self._file.close()
+
+
+class BackgroundWriter:
+    """
+    Feeds pages to the sinks from a dedicated thread.
+
+    The fetch loop only enqueues pages, so disk writes overlap with network
+    waits. The queue is bounded: if the disk falls behind, ``write`` blocks
+    instead of letting pending pages pile up in memory. A failure in the
+    writer thread is re-raised in the producer.
+    """
+
+    _STOP = object()
+
+    def __init__(self, sinks: Sequence[RepositorySink], max_pending_pages: int = 8):
+        self.sinks = list(sinks)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending_pages)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="repository-writer", daemon=True)
+
+    def __enter__(self) -> "BackgroundWriter":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write(self, repos: List[Dict[str, Any]]) -> None:
+        self._raise_if_failed()
+        self._queue.put(repos)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        self._raise_if_failed()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                page = self._queue.get()
+                if page is self._STOP:
+                    break
+                for sink in self.sinks:
+                    sink.write_page(page)
+        except BaseException as e:
+            self._error = e
+            # Keep draining so a blocked producer can reach close()
+            while self._queue.get() is not self._STOP:
+                pass
+        finally:
+            for sink in self.sinks:
+                sink.close()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"Falha ao gravar dados: {self._error}") from self._error
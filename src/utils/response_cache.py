@@ -0,0 +1,95 @@
+"""On-disk cache of GraphQL responses with TTL and LRU eviction."""
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    Stores successful GraphQL responses as one JSON file per request.
+
+    The key is a hash of the query text plus its variables. Entries older
+    than ``ttl`` seconds are ignored and removed. Each hit refreshes the
+    file's mtime, which doubles as the LRU clock: once the directory grows
+    past ``max_bytes`` the least recently used entries are deleted.
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float = 3600.0, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._index: Optional[Dict[Path, Tuple[float, int]]] = None  # path -> (last use, size)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query: str, variables: Dict[str, Any]) -> str:
+        payload = json.dumps({"query": query, "variables": variables}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        with self._lock:
+            index = self._load_index()
+            if path not in index:
+                return None
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                self._remove(path)
+                return None
+
+            now = time.time()
+            if now - entry["storedAt"] > self.ttl:
+                self._remove(path)
+                return None
+
+            os.utime(path, (now, now))
+            index[path] = (now, index[path][1])
+            return entry["response"]
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        path = self._path(key)
+        content = json.dumps({"storedAt": time.time(), "response": response})
+        with self._lock:
+            index = self._load_index()
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so a crash never leaves a half-written entry
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(content, encoding="utf-8")
+            os.replace(tmp_path, path)
+            index[path] = (time.time(), path.stat().st_size)
+            self._evict(index)
+
+    def _evict(self, index: Dict[Path, Tuple[float, int]]) -> None:
+        total = sum(size for _, size in index.values())
+        if total <= self.max_bytes:
+            return
+        for path, (_, size) in sorted(index.items(), key=lambda item: item[1][0]):
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _remove(self, path: Path) -> None:
+        self._load_index().pop(path, None)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _load_index(self) -> Dict[Path, Tuple[float, int]]:
+        """Scan the cache directory once; afterwards the index is kept in memory."""
+        if self._index is None:
+            self._index = {}
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob("*.json"):
+                    stat = path.stat()
+                    self._index[path] = (stat.st_mtime, stat.st_size)
+        return self._index
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
@@ -0,0 +1,145 @@
+"""End-of-run export of ``CrawlMetrics``: a metrics JSON file and a Prometheus textfile."""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+import json
+import os
+
+from src.utils.crawl_metrics import CrawlMetrics, nearest_rank_percentiles
+
+METRICS_FILE = "metrics.json"
+HISTORY_FILE = "metrics_history.jsonl"
+PROMETHEUS_FILE = "metrics.prom"
+SPANS_FILE = "spans.jsonl"
+
+# Seconds; wide enough for both a parse of one page and a slow search request
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROMETHEUS_PREFIX = "github_collector"
+
+
+def histogram(samples: Sequence[float], buckets: Sequence[float] = DURATION_BUCKETS) -> List[Tuple[float, int]]:
+    """Cumulative ``(upper bound, count)`` pairs, Prometheus style; the last bound is ``inf``."""
+    ordered = sorted(samples)
+    counts, index = [], 0
+    for bound in list(buckets) + [float("inf")]:
+        while index < len(ordered) and ordered[index] <= bound:
+            index += 1
+        counts.append((bound, index))
+    return counts
+
+
+def _distribution(samples: Sequence[float]) -> Dict[str, Any]:
+    percentiles = nearest_rank_percentiles(samples, (50, 95, 99))
+    return {
+        "count": len(samples),
+        "total_seconds": sum(samples),
+        "p50": percentiles[50],
+        "p95": percentiles[95],
+        "p99": percentiles[99],
+        "max": max(samples) if samples else None,
+        "histogram": {("+Inf" if bound == float("inf") else str(bound)): count
+                      for bound, count in histogram(samples)},
+    }
+
+
+def run_summary(metrics: CrawlMetrics, fetcher: str, collected_at: str) -> Dict[str, Any]:
+    """Everything the run recorded, as plain JSON-ready values."""
+    costs = [page["cost"] for page in metrics.pages if page["cost"] is not None]
+    return {
+        "fetcher": fetcher,
+        "collected_at": collected_at,
+        "finished_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "elapsed_seconds": metrics.elapsed(),
+        "repos": metrics.repos,
+        "repos_per_second": metrics.repos_per_second(),
+        "requests": {
+            "total": metrics.requests,
+            "failures": metrics.failures,
+            "retries": metrics.retries,
+            "cache_hits": metrics.cache_hits,
+            "bytes_received": metrics.bytes_received,
+            "wait_seconds": metrics.wait_seconds,
+            "latency": _distribution(metrics.latencies),
+        },
+        "stages": {name: _distribution(samples) for name, samples in sorted(metrics.stage_seconds.items())},
+        "rate_limit_cost": sum(costs),
+        "pages": metrics.pages,
+    }
+
+
+def _history_entry(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """The summary without per-page rows and histograms, for comparing runs."""
+    requests = {key: value for key, value in summary["requests"].items() if key != "latency"}
+    latency = {key: value for key, value in summary["requests"]["latency"].items() if key != "histogram"}
+    stages = {name: {key: value for key, value in stage.items() if key != "histogram"}
+              for name, stage in summary["stages"].items()}
+    entry = {key: value for key, value in summary.items() if key not in ("requests", "stages", "pages")}
+    return {**entry, "requests": {**requests, "latency": latency}, "stages": stages, "pages": len(summary["pages"])}
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(summary: Dict[str, Any], metrics: CrawlMetrics) -> str:
+    """Prometheus exposition format for node_exporter's textfile collector."""
+    fetcher = f'fetcher="{_escape_label(summary["fetcher"])}"'
+    lines: List[str] = []
+
+    def sample(name: str, kind: str, help_text: str, value: float) -> None:
+        lines.extend([f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}",
+                      f"# TYPE {PROMETHEUS_PREFIX}_{name} {kind}",
+                      f"{PROMETHEUS_PREFIX}_{name}{{{fetcher}}} {value}"])
+
+    def histogram_family(name: str, help_text: str, series: Dict[str, Sequence[float]], label: str = "") -> None:
+        lines.extend([f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}",
+                      f"# TYPE {PROMETHEUS_PREFIX}_{name} histogram"])
+        for label_value, samples in series.items():
+            labels = fetcher + (f',{label}="{_escape_label(label_value)}"' if label else "")
+            for bound, count in histogram(samples):
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{PROMETHEUS_PREFIX}_{name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{PROMETHEUS_PREFIX}_{name}_sum{{{labels}}} {sum(samples)}")
+            lines.append(f"{PROMETHEUS_PREFIX}_{name}_count{{{labels}}} {len(samples)}")
+
+    requests = summary["requests"]
+    sample("requests_total", "counter", "Requests sent to the GitHub API.", requests["total"])
+    sample("request_failures_total", "counter", "Requests without a usable response.", requests["failures"])
+    sample("retries_total", "counter", "Requests repeated after a failure.", requests["retries"])
+    sample("cache_hits_total", "counter", "Pages answered by the response cache.", requests["cache_hits"])
+    sample("received_bytes_total", "counter", "Response bytes received.", requests["bytes_received"])
+    sample("rate_limit_wait_seconds_total", "counter",
+           "Time spent waiting on the rate-limit scheduler, retry backoff included.", requests["wait_seconds"])
+    sample("rate_limit_cost_total", "counter", "Rate-limit points spent on search pages.",
+           summary["rate_limit_cost"])
+    sample("repositories_total", "counter", "Repositories collected.", summary["repos"])
+    sample("run_duration_seconds", "gauge", "Wall time of the run.", summary["elapsed_seconds"])
+    sample("last_run_timestamp_seconds", "gauge", "Unix time the run finished.",
+           datetime.now(timezone.utc).timestamp())
+    histogram_family("request_duration_seconds", "Latency of each API request.", {"": metrics.latencies})
+    histogram_family("stage_duration_seconds", "Duration of each run of a pipeline stage.",
+                     dict(sorted(metrics.stage_seconds.items())), label="stage")
+    histogram_family("page_duration_seconds", "Wall time per search page, including waits and retries.",
+                     {"": [page["seconds"] for page in metrics.pages]})
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # The textfile collector may read at any moment; never let it see a partial file
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def write_run_telemetry(metrics: CrawlMetrics, data_dir: Path, fetcher: str,
+                        collected_at: str) -> Tuple[Path, Path]:
+    """Write ``metrics.json`` and ``metrics.prom``, and append the run to ``metrics_history.jsonl``."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    summary = run_summary(metrics, fetcher, collected_at)
+    json_path = data_dir / METRICS_FILE
+    prometheus_path = data_dir / PROMETHEUS_FILE
+    _write_atomic(json_path, json.dumps(summary, indent=2, ensure_ascii=False) + "\n")
+    _write_atomic(prometheus_path, prometheus_text(summary, metrics))
+    with (data_dir / HISTORY_FILE).open("a", encoding="utf-8") as history:
+        history.write(json.dumps(_history_entry(summary), ensure_ascii=False) + "\n")
+    return json_path, prometheus_path
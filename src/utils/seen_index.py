@@ -0,0 +1,84 @@
+"""Duplicate suppression and gap detection for cursor pagination over ``sort:stars-desc``.
+
+The search cursor is an offset into a ranking that changes while the crawl
+runs. When a repository crosses the page boundary in either direction,
+every result after it shifts by one: the repository at the edge of the
+previous page comes back on the next one, and another is pushed behind the
+cursor and never returned.
+"""
+from collections import deque
+from typing import Any, Deque, Iterable, List, Mapping, Optional, Sequence, Set, TypeVar
+
+from src.utils.star_shards import StarShard
+
+RepoT = TypeVar("RepoT", bound=Mapping[str, Any])
+
+
+class SeenIndex:
+    """Hash set of the node IDs a crawl has already emitted."""
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self._ids: Set[str] = set(ids)
+        self.duplicates = 0
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def admit(self, repos: Iterable[RepoT]) -> List[RepoT]:
+        """Repositories not seen before, in order; repeats are dropped and counted.
+
+        Records without an ID cannot be compared and are always kept.
+        """
+        fresh: List[RepoT] = []
+        for repo in repos:
+            node_id = repo.get('id')
+            if not node_id:
+                fresh.append(repo)
+                continue
+            if node_id in self._ids:
+                self.duplicates += 1
+                continue
+            self._ids.add(node_id)
+            fresh.append(repo)
+        return fresh
+
+
+class StarFrontier:
+    """
+    Star range the crawl has already walked.
+
+    ``floor`` is the lowest star count confirmed so far across every page;
+    the highest counts of the last ``lookback`` pages bound the band where
+    a repository pushed behind the cursor can still be, even when the shift
+    only shows up one page after it happened.
+    """
+
+    def __init__(self, lookback: int = 2):
+        self.floor: Optional[int] = None
+        self._recent_tops: Deque[int] = deque(maxlen=lookback)
+
+    def advance(self, page: Sequence[Mapping[str, Any]]) -> None:
+        if not page:
+            return
+        stars = [repo['stargazerCount'] for repo in page]
+        self.floor = min(stars) if self.floor is None else min(self.floor, min(stars))
+        self._recent_tops.append(max(stars))
+
+    def gap(self, page: Sequence[Mapping[str, Any]], duplicates: int) -> Optional[StarShard]:
+        """Star band to re-query when the ranking shifted before ``page``; ``None`` when it continues cleanly.
+
+        A shift shows up as repeats on the new page or as a page that
+        reaches above the confirmed floor. Stars move a little at a time, so
+        a repository that jumped behind the cursor now sits between this
+        page's first count and the tops of the recent pages.
+        """
+        if self.floor is None or not page:
+            return None
+        highest = max(repo['stargazerCount'] for repo in page)
+        if duplicates == 0 and highest <= self.floor:
+            return None
+        lowest = min(page[0]['stargazerCount'], self.floor)
+        return StarShard(lowest, max(highest, *self._recent_tops))
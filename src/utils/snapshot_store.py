@@ -0,0 +1,158 @@
+"""SQLite history of collected repositories, one snapshot per run."""
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import sqlite3
+
+from src.utils.repository_sinks import RepositorySink
+
+COLUMNS = [
+    "url",
+    "collectedAt",
+    "id",
+    "name",
+    "stargazerCount",
+    "createdAt",
+    "updatedAt",
+    "primaryLanguage",
+    "releases_count",
+    "pullRequests_count",
+    "open_issues",
+    "closed_issues",
+    "mentionable_users_count",
+    "last_release_at",
+    "release_interval_days",
+    "default_branch_commits",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repositories (
+    url TEXT NOT NULL,
+    collectedAt TEXT NOT NULL,
+    id TEXT,
+    name TEXT,
+    stargazerCount INTEGER,
+    createdAt TEXT,
+    updatedAt TEXT,
+    primaryLanguage TEXT,
+    releases_count INTEGER,
+    pullRequests_count INTEGER,
+    open_issues INTEGER,
+    closed_issues INTEGER,
+    mentionable_users_count INTEGER,
+    last_release_at TEXT,
+    release_interval_days REAL,
+    default_branch_commits INTEGER,
+    PRIMARY KEY (url, collectedAt)
+);
+CREATE INDEX IF NOT EXISTS idx_repositories_language ON repositories (collectedAt, primaryLanguage);
+CREATE INDEX IF NOT EXISTS idx_repositories_stars ON repositories (collectedAt, stargazerCount DESC);
+"""
+
+_UPSERT = (
+    f"INSERT INTO repositories ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join(':' + column for column in COLUMNS)}) "
+    f"ON CONFLICT (url, collectedAt) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[2:])
+)
+
+
+class SnapshotStore:
+    """
+    Embedded database with every run kept as a snapshot.
+
+    Rows are keyed by ``(url, collectedAt)``: all repositories of a run share
+    the snapshot's ``collectedAt``, so re-saving a run upserts it in place
+    while earlier runs stay untouched. Inserts go in batches of
+    ``batch_size`` rows inside a single transaction. The language and
+    stars indexes lead with ``collectedAt``, so they also serve as the
+    snapshot index: selecting a snapshot, or filtering and ranking within
+    one, is a single index range scan.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 1000):
+        self.path = path
+        self.batch_size = batch_size
+
+    def connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    @staticmethod
+    def snapshot_key(repos: Sequence[Dict[str, Any]]) -> str:
+        """The run's ``collectedAt``: the earliest timestamp among its repositories."""
+        return min(repo["collectedAt"] for repo in repos)
+
+    def save_snapshot(self, repos: Sequence[Dict[str, Any]], collected_at: Optional[str] = None) -> str:
+        """Store ``repos`` as one snapshot and return its ``collectedAt``."""
+        collected_at = collected_at or self.snapshot_key(repos)
+        connection = self.connect()
+        try:
+            self.upsert(connection, repos, collected_at)
+        finally:
+            connection.close()
+        return collected_at
+
+    def upsert(self, connection: sqlite3.Connection, repos: Sequence[Dict[str, Any]], collected_at: str) -> None:
+        with connection:
+            for start in range(0, len(repos), self.batch_size):
+                batch = repos[start:start + self.batch_size]
+                connection.executemany(_UPSERT, [self._row(repo, collected_at) for repo in batch])
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                "SELECT collectedAt, COUNT(*) FROM repositories GROUP BY collectedAt ORDER BY collectedAt"
+            ).fetchall()
+        finally:
+            connection.close()
+        return [{"collectedAt": collected_at, "repositories": count} for collected_at, count in rows]
+
+    @staticmethod
+    def snapshot_query(snapshot: str = "latest", columns: Optional[Sequence[str]] = None) -> Tuple[str, Tuple[str, ...]]:
+        """SQL selecting one snapshot; ``latest`` resolves to the newest inside the same query."""
+        selected = ", ".join(column for column in (columns or COLUMNS) if column in COLUMNS)
+        if snapshot == "latest":
+            return (
+                f"SELECT {selected} FROM repositories "
+                f"WHERE collectedAt = (SELECT MAX(collectedAt) FROM repositories)",
+                (),
+            )
+        return f"SELECT {selected} FROM repositories WHERE collectedAt = ?", (snapshot,)
+
+    @staticmethod
+    def _row(repo: Dict[str, Any], collected_at: str) -> Dict[str, Any]:
+        row = {column: repo.get(column) for column in COLUMNS}
+        row["collectedAt"] = collected_at
+        for column in ("primaryLanguage", "last_release_at"):
+            row[column] = row[column] or None
+        return row
+
+
+class SqliteSink(RepositorySink):
+    """Streams pages into one snapshot; the key comes from the first page."""
+
+    def __init__(self, store: SnapshotStore):
+        super().__init__(store.path)
+        self.store = store
+        self._connection: Optional[sqlite3.Connection] = None
+        self._collected_at: Optional[str] = None
+
+    def write_page(self, repos: List[Dict[str, Any]]) -> None:
+        if not repos:
+            return
+        # Opened lazily so the connection belongs to the writer thread
+        if self._connection is None:
+            self._connection = self.store.connect()
+            self._collected_at = self.store.snapshot_key(repos)
+        self.store.upsert(self._connection, repos, self._collected_at)
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
@@ -0,0 +1,135 @@
+"""Star-range sharding of the repository search.
+
+GitHub's ``search`` connection never returns more than 1000 results per
+query and can only be walked one cursor at a time. Splitting the star range
+into disjoint ``stars:A..B`` queries gives independent cursors that can be
+walked concurrently and merged back in star order.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import math
+
+DEFAULT_MIN_STARS = 1000
+DEFAULT_MAX_STARS = 2_000_000
+# Hard cap imposed by GitHub on the number of results of a single search query
+SEARCH_RESULT_LIMIT = 1000
+
+
+@dataclass(frozen=True)
+class StarShard:
+    """Inclusive star range; ``max_stars=None`` means unbounded."""
+    min_stars: int
+    max_stars: Optional[int] = None
+
+    @property
+    def search_query(self) -> str:
+        if self.max_stars is None:
+            return f"stars:>={self.min_stars} sort:stars-desc"
+        return f"stars:{self.min_stars}..{self.max_stars} sort:stars-desc"
+
+    @property
+    def label(self) -> str:
+        if self.max_stars is None:
+            return f"≥{self.min_stars:,}"
+        return f"{self.min_stars:,}..{self.max_stars:,}"
+
+
+def star_thresholds(min_stars: int = DEFAULT_MIN_STARS, max_stars: int = DEFAULT_MAX_STARS,
+                    ratio: float = 1.15) -> List[int]:
+    """Geometric grid of star thresholds used to sample the star distribution."""
+    thresholds = []
+    value = float(min_stars)
+    while value <= max_stars:
+        threshold = int(round(value))
+        if not thresholds or threshold != thresholds[-1]:
+            thresholds.append(threshold)
+        value *= ratio
+    return thresholds
+
+
+def build_star_histogram_query(thresholds: List[int]) -> str:
+    """Build one GraphQL document counting repositories at or above each threshold.
+
+    Each threshold gets its own ``s<i>`` alias, so the whole grid costs a
+    single round trip.
+    """
+    aliases = "\n".join(
+        f'  s{i}: search(query: "stars:>={threshold}", type: REPOSITORY, first: 1) {{ repositoryCount }}'
+        for i, threshold in enumerate(thresholds)
+    )
+    return "query {\n" + aliases + "\n}"
+
+
+def plan_star_shards(counts: Dict[int, int], target: int, shards: int) -> List[StarShard]:
+    """Split the top ``target`` repositories into disjoint star ranges.
+
+    Args:
+        counts: repositories with at least ``threshold`` stars, per threshold
+        target: number of repositories the collection should cover
+        shards: requested number of shards (raised when a shard would exceed
+            the search result limit)
+
+    Returns:
+        Shards ordered from the most to the least starred range.
+
+    Raises:
+        ValueError: a shard still holds more than ``SEARCH_RESULT_LIMIT``
+            repositories and the sampled thresholds leave no cut inside it
+    """
+    if not counts:
+        return [StarShard(DEFAULT_MIN_STARS)]
+
+    thresholds = sorted(counts)
+    # Highest threshold that still covers the target, so the lowest shard
+    # does not walk far past the repositories we actually need.
+    eligible = [t for t in thresholds if counts[t] >= target]
+    floor = max(eligible) if eligible else thresholds[0]
+    total = counts[floor]
+
+    shards = max(1, shards, math.ceil(target / SEARCH_RESULT_LIMIT))
+    candidates = [t for t in thresholds if t > floor and counts[t] > 0]
+
+    cuts = set()
+    for k in range(1, shards):
+        if not candidates:
+            break
+        # Cut whose "repos above it" count is closest to an even split
+        wanted = total * k / shards
+        cuts.add(min(candidates, key=lambda t: abs(counts[t] - wanted)))
+
+    bounds = [floor] + sorted(cuts)
+    # Even splits of a skewed distribution can still leave a range above the cap
+    while (oversized := _oversized_shard(bounds, counts, target)) is not None:
+        low = bounds[oversized]
+        high = bounds[oversized + 1] if oversized + 1 < len(bounds) else None
+        inside = [t for t in candidates if t > low and (high is None or t < high)]
+        if not inside:
+            label = StarShard(low, high - 1 if high is not None else None).label
+            raise ValueError(
+                f"A faixa de estrelas {label} tem mais de {SEARCH_RESULT_LIMIT} repositórios e a "
+                f"amostragem da distribuição não permite dividi-la."
+            )
+        halfway = (_shard_size(bounds, oversized, counts, target) / 2
+                   + (counts[high] if high is not None else 0))
+        bounds = sorted(bounds + [min(inside, key=lambda t: abs(counts[t] - halfway))])
+
+    plan = [
+        StarShard(low, bounds[i + 1] - 1 if i + 1 < len(bounds) else None)
+        for i, low in enumerate(bounds)
+    ]
+    return list(reversed(plan))
+
+
+def _shard_size(bounds: List[int], index: int, counts: Dict[int, int], target: int) -> int:
+    """Repositories the shard starting at ``bounds[index]`` has to return."""
+    above = counts[bounds[index + 1]] if index + 1 < len(bounds) else 0
+    # Only the top of the lowest shard is needed to reach the target
+    covered = min(counts[bounds[index]], target) if index == 0 else counts[bounds[index]]
+    return covered - above
+
+
+def _oversized_shard(bounds: List[int], counts: Dict[int, int], target: int) -> Optional[int]:
+    for index in range(len(bounds)):
+        if _shard_size(bounds, index, counts, target) > SEARCH_RESULT_LIMIT:
+            return index
+    return None